@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""Labels per second of the label backends against the plain minidom parse.
+
+Usage:
+    python benchmarks/label_backends.py [LABEL] [REPEAT]
+"""
+import sys
+from pathlib import Path
+from time import perf_counter
+from xml.dom.minidom import parse
+
+from SimbioReader.label import BACKENDS, read_label
+
+LABEL = Path(
+    "test/data/sim_cal_stc_cruise_ico11_2024-04-08_001/"
+    "sim_cal_sc_stc_cruise_ico11_2024-04-08_001__0_1.lblx"
+)
+
+
+def rate(func, repeat: int) -> float:
+    start = perf_counter()
+    for _ in range(repeat):
+        func()
+    return repeat / (perf_counter() - start)
+
+
+def main(label: Path, repeat: int) -> None:
+    print(f"{'minidom.parse (DOM only)':>26}: {rate(lambda: parse(label.as_posix()), repeat):8.1f} labels/s")
+    for name in BACKENDS:
+        value = rate(lambda: read_label(label, backend=name), repeat)
+        print(f"{name:>26}: {value:8.1f} labels/s")
+
+
+if __name__ == "__main__":
+    label = Path(sys.argv[1]) if len(sys.argv) > 1 else LABEL
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    main(label, repeat)
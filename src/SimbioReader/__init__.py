@@ -1,2 +1,11 @@
-from SimbioReader.sr import SimbioReader, DataStructure, Data, Detector, HK
-from SimbioReader.sr import __version__
\ No newline at end of file
+# the reader is imported on first use, so that the command line tools that do
+# not need it (e.g. simbioInfo) start fast
+_EXPORTS = ("SimbioReader", "DataStructure", "Data", "Detector", "HK", "__version__")
+
+
+def __getattr__(name: str):
+    if name in _EXPORTS:
+        from SimbioReader import sr
+
+        return getattr(sr, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,173 @@
+"""Compiled PDS4 browse label templates.
+
+The template is parsed once: the values that change from product to product
+(LID, dates, versions, description, LIDVID reference) are replaced by slots,
+the ``File_Area_Browse`` sections are removed and a slot for them is placed at
+the end of ``Product_Browse``. The pretty-printed document is then split in
+literal strings and slots, so each label is written by joining strings, with
+no further XML parsing or serialization.
+"""
+import re
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import TextIO
+from xml.dom.minidom import Element, parse
+from xml.sax.saxutils import escape
+
+from SimbioReader.tools import (
+    gen_filename,
+    getElement,
+    getFromXml,
+    lidGenerator,
+    new_lvid,
+    pretty_print,
+    updateXML,
+)
+
+# NUL can not appear in an XML document, so the markers can not clash with the template text
+_SLOT = "\x00{}\x00"
+_SLOT_RE = re.compile("\x00(\\w+)\x00")
+FILE_AREAS = "file_areas"
+
+# (tag, index) of the text slots
+SLOTS = {
+    "logical_identifier": [("logical_identifier", 0)],
+    "modification_date": [("modification_date", 0)],
+    "version_id": [("version_id", 0), ("version_id", 1)],
+    "description": [("description", 0)],
+    "lidvid_reference": [("lidvid_reference", 0)],
+}
+
+
+class BrowseTemplate:
+    """A browse label template compiled for repeated rendering.
+
+    Args:
+        template (Path | str): The PDS4 browse label template.
+
+    Raises:
+        FileNotFoundError: If the template does not exist.
+    """
+
+    def __init__(self, template: Path | str) -> None:
+        template = Path(template)
+        if not template.exists():
+            raise FileNotFoundError(f"The template {template.name} was not found")
+        self.path = template
+        tree = parse(template.as_posix())
+        self.lid = getFromXml(tree, "logical_identifier")
+        self.lidvid_reference = getFromXml(tree, "lidvid_reference")
+        for item in tree.getElementsByTagName("File_Area_Browse"):
+            item.parentNode.removeChild(item)
+        for name, places in SLOTS.items():
+            for tag, idx in places:
+                updateXML(tree, tag, _SLOT.format(name), idx=idx)
+        getElement(tree, "Product_Browse").appendChild(
+            tree.createComment(_SLOT.format(FILE_AREAS))
+        )
+        lines = pretty_print(tree).split("\n")[1:]
+        marker = f"<!--{_SLOT.format(FILE_AREAS)}-->"
+        self.indent = ""
+        for i, line in enumerate(lines):
+            if line.strip() == marker:
+                self.indent = line[: len(line) - len(line.lstrip())]
+                lines[i] = _SLOT.format(FILE_AREAS)
+        text = '<?xml version="1.0" encoding="utf-8"?>\n' + "\n".join(lines) + "\n"
+        # the file areas are rendered with their own line ends
+        text = text.replace(_SLOT.format(FILE_AREAS) + "\n", _SLOT.format(FILE_AREAS))
+        # literals at the even positions, slot names at the odd ones
+        self.parts = _SLOT_RE.split(text)
+
+    def values(self, label_name: Path, description: str, modified: datetime | None = None) -> dict:
+        """Computes the slot values for a browse label.
+
+        Args:
+            label_name (Path): The browse label file name.
+            description (str): The product description.
+            modified (datetime | None, optional): The modification date.
+                Defaults to now.
+
+        Returns:
+            dict: The value of each slot.
+        """
+        label_name = Path(label_name)
+        file_version = label_name.stem.split("__")[1].replace("_", ".")
+        modified = datetime.now() if modified is None else modified
+        return {
+            "logical_identifier": lidGenerator(self.lid, label_name, calib="cal" in label_name.stem),
+            "modification_date": modified.strftime("%Y-%m-%d"),
+            "version_id": file_version,
+            "description": description,
+            "lidvid_reference": new_lvid(self.lidvid_reference, label_name, file_version),
+        }
+
+    def render(self, stream: TextIO, values: dict, file_areas: list[Element] = ()) -> None:
+        """Writes a label to a text stream.
+
+        Args:
+            stream (TextIO): The output stream.
+            values (dict): The value of each slot (see ``values``).
+            file_areas (list[Element], optional): The ``File_Area_Browse``
+                elements. Defaults to none.
+        """
+        for i, part in enumerate(self.parts):
+            if i % 2 == 0:
+                stream.write(part)
+            elif part == FILE_AREAS:
+                for item in file_areas:
+                    for line in item.toprettyxml(indent=" " * 4).split("\n"):
+                        if line.strip():
+                            stream.write(f"{self.indent}{line}\n")
+            else:
+                stream.write(escape(values[part]))
+
+    def write(
+        self,
+        source_label: Path,
+        dest: Path,
+        file_areas: list[Element] = (),
+        description: str = "This is the first version.",
+    ) -> str:
+        """Writes the browse label of a product.
+
+        Args:
+            source_label (Path): The label of the product.
+            dest (Path): The output folder.
+            file_areas (list[Element], optional): The ``File_Area_Browse``
+                elements. Defaults to none.
+            description (str, optional): The product description.
+                Defaults to 'This is the first version.'.
+
+        Returns:
+            str: The LIDVID of the browse product.
+        """
+        new_label = Path(dest).joinpath(gen_filename(Path(source_label))).with_suffix(".lblx")
+        values = self.values(new_label, description)
+        with open(new_label, "w", encoding="utf-8") as xmlFile:
+            self.render(xmlFile, values, file_areas)
+        return f"{values['logical_identifier']}::{values['version_id']}"
+
+
+@lru_cache(maxsize=16)
+def _load(path: Path, mtime_ns: int) -> BrowseTemplate:
+    return BrowseTemplate(path)
+
+
+def load_template(template: Path | str) -> BrowseTemplate:
+    """Returns the compiled template, compiling it only if the file changed.
+
+    Args:
+        template (Path | str): The PDS4 browse label template.
+
+    Returns:
+        BrowseTemplate: The compiled template.
+
+    Raises:
+        FileNotFoundError: If the template does not exist.
+    """
+    template = Path(template)
+    if not template.exists():
+        raise FileNotFoundError(f"The template {template.name} was not found")
+    template = template.resolve()
+    return _load(template, template.stat().st_mtime_ns)
@@ -0,0 +1,192 @@
+"""Persistent on-disk cache of parsed labels.
+
+The cache is a SQLite database holding the label model (see
+``SimbioReader.label``) of every label read through it. An entry is keyed on
+the label path and is valid as long as the file size and modification time
+(and, optionally, its MD5 checksum) are unchanged. When the stored models
+exceed the configured size the least recently used entries are evicted; the
+entry just stored is always kept.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import zlib
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+DEFAULT_CACHE_DIR = Path(
+    os.environ.get("SIMBIOREADER_CACHE_DIR", Path.home() / ".cache" / "SimbioReader")
+)
+
+DEFAULT_MAX_SIZE = 256 * 1024**2
+
+
+def file_md5(file_name: Path, chunk_size: int = 1024**2) -> str:
+    """Computes the MD5 checksum of a file reading it in chunks.
+
+    Args:
+        file_name (Path): The file to hash.
+        chunk_size (int, optional): Bytes read at a time. Defaults to 1 MiB.
+
+    Returns:
+        str: The hexadecimal digest.
+    """
+    md5 = hashlib.md5()
+    with open(file_name, "rb") as fl:
+        while chunk := fl.read(chunk_size):
+            md5.update(chunk)
+    return md5.hexdigest()
+
+
+class LabelCache:
+    """
+    A size-bounded LRU cache of label models stored in SQLite.
+
+    Args:
+        directory (Path | str, optional): The cache folder. Defaults to
+            ``$SIMBIOREADER_CACHE_DIR`` or ``~/.cache/SimbioReader``.
+        max_size (int, optional): Maximum size in bytes of the stored models.
+            Defaults to 256 MiB.
+        checksum (bool, optional): Validate the entries also with the MD5 of
+            the label. Defaults to False.
+
+    Attributes:
+        path (Path): The SQLite database file.
+        hits (int): Number of lookups served by the cache.
+        misses (int): Number of lookups not found or stale.
+    """
+
+    file_name = "labels.sqlite"
+
+    def __init__(
+        self,
+        directory: Path | str | None = None,
+        max_size: int = DEFAULT_MAX_SIZE,
+        checksum: bool = False,
+    ) -> None:
+        self.directory = Path(directory) if directory else DEFAULT_CACHE_DIR
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.path = self.directory / self.file_name
+        self.max_size = max_size
+        self.checksum = checksum
+        self.hits = 0
+        self.misses = 0
+        with self._connect() as db:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS labels ("
+                "path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, "
+                "md5 TEXT, model BLOB, nbytes INTEGER, last_access REAL)"
+            )
+
+    @contextmanager
+    def _connect(self):
+        db = sqlite3.connect(self.path, timeout=30)
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def _key(self, label: Path) -> tuple[str, int, int, str | None]:
+        label = Path(label).resolve()
+        st = label.stat()
+        md5 = file_md5(label) if self.checksum else None
+        return label.as_posix(), st.st_size, st.st_mtime_ns, md5
+
+    def get(self, label: Path | str) -> dict | None:
+        """Returns the cached model of a label, or None if missing or stale.
+
+        Args:
+            label (Path | str): The label file.
+
+        Returns:
+            dict | None: The label model.
+        """
+        path, size, mtime, md5 = self._key(label)
+        with self._connect() as db:
+            row = db.execute(
+                "SELECT size, mtime_ns, md5, model FROM labels WHERE path = ?",
+                (path,),
+            ).fetchone()
+            if (
+                row is None
+                or row[0] != size
+                or row[1] != mtime
+                or (md5 is not None and row[2] != md5)
+            ):
+                self.misses += 1
+                return None
+            db.execute(
+                "UPDATE labels SET last_access = ? WHERE path = ?",
+                (datetime.now().timestamp(), path),
+            )
+        self.hits += 1
+        return json.loads(zlib.decompress(row[3]))
+
+    def put(self, label: Path | str, model: dict) -> None:
+        """Stores the model of a label, evicting old entries if needed.
+
+        Args:
+            label (Path | str): The label file.
+            model (dict): Its label model.
+        """
+        path, size, mtime, md5 = self._key(label)
+        blob = zlib.compress(json.dumps(model).encode())
+        with self._connect() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO labels VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (path, size, mtime, md5, blob, len(blob), datetime.now().timestamp()),
+            )
+            self._evict(db, keep=path)
+
+    def _evict(self, db: sqlite3.Connection, keep: str) -> None:
+        total = db.execute("SELECT COALESCE(SUM(nbytes), 0) FROM labels").fetchone()[0]
+        if total <= self.max_size:
+            return
+        for path, nbytes in db.execute(
+            "SELECT path, nbytes FROM labels WHERE path != ? ORDER BY last_access",
+            (keep,),
+        ).fetchall():
+            db.execute("DELETE FROM labels WHERE path = ?", (path,))
+            total -= nbytes
+            if total <= self.max_size:
+                break
+
+    def stats(self) -> dict:
+        """Returns the number of entries and the size of the cache.
+
+        Returns:
+            dict: ``path``, ``entries``, ``size``, ``max_size``, ``hits`` and ``misses``.
+        """
+        with self._connect() as db:
+            entries, size = db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(nbytes), 0) FROM labels"
+            ).fetchone()
+        return {
+            "path": self.path,
+            "entries": entries,
+            "size": size,
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def clear(self) -> int:
+        """Removes every entry.
+
+        Returns:
+            int: The number of removed entries.
+        """
+        with self._connect() as db:
+            removed = db.execute("DELETE FROM labels").rowcount
+        with self._connect() as db:
+            db.execute("VACUUM")
+        return removed
+
+    def __str__(self) -> str:
+        return f"LabelCache(path={self.path})"
+
+    def __repr__(self) -> str:
+        return self.__str__()
@@ -0,0 +1,142 @@
+"""Catalogue of the products of an archive tree.
+
+Every ``.lblx`` found under the root folder is opened in header-only mode, so
+only the labels and the housekeeping tables are read. The products can be
+processed in a pool of processes. A product that can not be read gives a
+single row with the error message in the ``error`` column.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+COLUMNS = [
+    "label",
+    "lid",
+    "version",
+    "channel",
+    "level",
+    "phase",
+    "start_time",
+    "stop_time",
+    "start_scet",
+    "stop_scet",
+    "target",
+    "item",
+    "file_name",
+    "lines",
+    "samples",
+    "bands",
+    "data_type",
+    "file_size",
+    "md5",
+    "error",
+]
+
+# nullable, so the rows of the products that can not be read do not turn them into floats
+INTEGER_COLUMNS = ["lines", "samples", "bands", "file_size"]
+
+
+def find_labels(root: Path | str) -> list[Path]:
+    """Returns, sorted, all the labels under a folder.
+
+    Args:
+        root (Path | str): The archive root.
+
+    Returns:
+        list[Path]: The ``.lblx`` files.
+    """
+    return sorted(Path(root).rglob("*.lblx"))
+
+
+def product_rows(label: Path) -> list[dict]:
+    """Returns the catalogue rows of a product, one for each filter or segment.
+
+    Args:
+        label (Path): The product label.
+
+    Returns:
+        list[dict]: The rows, or a single row with the error if the product can
+        not be read.
+    """
+    from rich.console import Console
+
+    from SimbioReader.sr import SimbioReader
+
+    try:
+        reader = SimbioReader.open_header(label, console=Console(quiet=True))
+        items = (
+            reader.data.segments if reader.channel == "vihi" else
+            [f"filter_{item}" for item in reader.data.filters]
+        )
+        rows = []
+        for item in items:
+            obj = getattr(reader.data, item)
+            ds = obj.data_structure
+            rows.append(
+                {
+                    "label": str(label),
+                    "lid": reader.lid,
+                    "version": reader.version,
+                    "channel": reader.channel,
+                    "level": reader.level,
+                    "phase": reader.phaseName,
+                    "start_time": reader.startTime,
+                    "stop_time": reader.stopTime,
+                    "start_scet": reader.start_scet,
+                    "stop_scet": reader.stop_scet,
+                    "target": reader.target.name,
+                    "item": obj.filter_name if obj.filter_name else item,
+                    "file_name": obj.file_name.name,
+                    "lines": obj.lines,
+                    "samples": obj.samples,
+                    "bands": obj.bands,
+                    "data_type": ds.data_type,
+                    "file_size": ds.file_size,
+                    "md5": ds.md5,
+                    "error": None,
+                }
+            )
+        return rows
+    except Exception as e:
+        return [{"label": str(label), "error": f"{type(e).__name__}: {e}"}]
+
+
+def build_catalog(root: Path | str, workers: int = 1):
+    """Builds the catalogue of all the products under a folder.
+
+    Args:
+        root (Path | str): The archive root.
+        workers (int, optional): Number of processes. Defaults to 1.
+
+    Returns:
+        pd.DataFrame: One row for each filter or segment of each product. The
+        integer columns have the nullable ``Int64`` type.
+    """
+    import pandas as pd
+
+    labels = find_labels(root)
+    if workers > 1 and len(labels) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(product_rows, labels, chunksize=8))
+    else:
+        results = [product_rows(label) for label in labels]
+    rows = [row for result in results for row in result]
+    return pd.DataFrame(rows, columns=COLUMNS).astype(dict.fromkeys(INTEGER_COLUMNS, "Int64"))
+
+
+def save_catalog(catalog, output: Path | str) -> None:
+    """Writes the catalogue, in Parquet or CSV according to the file extension.
+
+    Args:
+        catalog (pd.DataFrame): The catalogue.
+        output (Path | str): The output file (``.parquet`` or ``.csv``).
+
+    Raises:
+        ValueError: If the extension is not supported.
+    """
+    output = Path(output)
+    if output.suffix.lower() == ".parquet":
+        catalog.to_parquet(output, index=False)
+    elif output.suffix.lower() == ".csv":
+        catalog.to_csv(output, index=False)
+    else:
+        raise ValueError(f"Unsupported catalog format '{output.suffix}'. Use .parquet or .csv")
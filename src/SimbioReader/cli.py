@@ -1,7 +1,7 @@
 from rich.console import Console
 from SimbioReader.sr import SimbioReader,version
 import rich_click as click
-from SimbioReader.constants import CONTEXT_SETTINGS,datamodel, progEpilog
+from SimbioReader.constants import CONTEXT_SETTINGS,datamodel, progEpilog, MSG
 from rich_click import rich_config
 from pathlib import Path
 # from semantic_version_tools import Vers
@@ -22,8 +22,27 @@ def sh_version(ctx, self, value):
     ctx.exit()
 
 
-@click.command(context_settings=CONTEXT_SETTINGS)
+class DefaultGroup(click.RichGroup):
+    """Command group that runs the ``show`` command when no subcommand is given,
+    so that ``simbioReader FILE`` keeps working next to the subcommands."""
+
+    default_command = "show"
+    group_class = click.RichGroup
+
+    def parse_args(self, ctx, args):
+        if args and args[0] not in self.commands and args[0] not in CONTEXT_SETTINGS['help_option_names']:
+            args.insert(0, self.default_command)
+        return super().parse_args(ctx, args)
+
+
+@click.group(cls=DefaultGroup, context_settings=CONTEXT_SETTINGS)
 @rich_config(help_config={'header_text': f"SIMBIO-SYS Data Reader, version [blue]{version.short()}[/blue]"})
+def cli():
+    """SIMBIO-SYS Data Reader. Run [bold]simbioReader FILE[/bold] to display a product."""
+    pass
+
+
+@cli.command(context_settings=CONTEXT_SETTINGS)
 @click.argument('file', type=click.Path(exists=True,path_type=Path), required=True)
 @click.option('--hk', is_flag=True, help='Show the HouseKeeping', default=False)
 @click.option('--detector', is_flag=True, help='Show the Detector', default=False)
@@ -35,8 +54,9 @@ def sh_version(ctx, self, value):
 @click.option('-s','--summarize', is_flag=True, help='Show only the summary', default=False)
 @click.option('--version', is_flag=True, help='Show the version and exit', default=False,)
 @click.pass_context
-def cli(ctx, file:Path, hk: bool = False, detector: bool=False, data_structure: bool = False, all_info: bool = False, 
+def show(ctx, file:Path, hk: bool = False, detector: bool=False, data_structure: bool = False, all_info: bool = False,
         filter_flag : bool =False, debug: bool = False, verbose: bool = False, version:bool=False, summarize: bool = False):
+    """Display the information of a product (default command)"""
     console = Console()
     if version:
         sh_version(ctx, cli, version)
@@ -45,4 +65,139 @@ def cli(ctx, file:Path, hk: bool = False, detector: bool=False, data_structure:
         console.print(dat.summary())
     else:
         console.print(dat.show(hk=hk, detector=detector,
-                    data_structure=data_structure, filters=filter_flag, all_info=all_info))
\ No newline at end of file
+                    data_structure=data_structure, filters=filter_flag, all_info=all_info))
+
+
+@cli.group(context_settings=CONTEXT_SETTINGS)
+@click.option('--dir', 'directory', type=click.Path(file_okay=False, path_type=Path), help='The cache folder', default=None)
+@click.pass_context
+def cache(ctx, directory: Path):
+    """Manage the label cache"""
+    from SimbioReader.cache import LabelCache
+    ctx.obj = LabelCache(directory)
+
+
+@cache.command('stats')
+@click.pass_obj
+def cache_stats(label_cache):
+    """Show the label cache statistics"""
+    console = Console()
+    stats = label_cache.stats()
+    console.print(f"{MSG.INFO}Cache file: {stats['path']}")
+    console.print(f"{MSG.INFO}Entries: {stats['entries']}")
+    console.print(f"{MSG.INFO}Size: {stats['size']} / {stats['max_size']} bytes")
+
+
+@cache.command('clear')
+@click.pass_obj
+def cache_clear(label_cache):
+    """Remove all the entries of the label cache"""
+    console = Console()
+    removed = label_cache.clear()
+    console.print(f"{MSG.INFO}Removed {removed} entries from {label_cache.path}")
+
+
+@cli.command(context_settings=CONTEXT_SETTINGS)
+@click.argument('root', type=click.Path(exists=True, file_okay=False, path_type=Path), required=True)
+@click.option('-o', '--output', type=click.Path(dir_okay=False, path_type=Path), help='The catalog file (.parquet or .csv)', required=True)
+@click.option('-w', '--workers', type=int, help='Number of processes', default=1, show_default=True)
+@click.pass_context
+def catalog(ctx, root: Path, output: Path, workers: int):
+    """Build the catalog of all the products in an archive tree"""
+    from SimbioReader.catalog import save_catalog
+    console = Console()
+    cat = SimbioReader.catalog(root, workers=workers)
+    try:
+        save_catalog(cat, output)
+    except (ValueError, ImportError) as e:
+        ctx.fail(str(e))
+    errors = int(cat['error'].notna().sum())
+    console.print(f"{MSG.INFO}{len(cat)} rows written in {output}")
+    if errors:
+        console.print(f"{MSG.WARNING}{errors} product(s) could not be read, see the 'error' column")
+
+
+@cli.command('hk-export', context_settings=CONTEXT_SETTINGS)
+@click.argument('root', type=click.Path(exists=True, file_okay=False, path_type=Path), required=True)
+@click.option('-o', '--output', type=click.Path(file_okay=False, path_type=Path), help='The folder of the Parquet dataset', required=True)
+@click.option('-w', '--workers', type=int, help='Number of processes', default=1, show_default=True)
+@click.pass_context
+def hk_export(ctx, root: Path, output: Path, workers: int):
+    """Add the housekeeping of all the products in an archive tree to a Parquet dataset"""
+    console = Console()
+    try:
+        result = SimbioReader.hk_export(root, output, workers=workers)
+    except ImportError as e:
+        ctx.fail(str(e))
+    console.print(f"{MSG.INFO}{result['added']} product(s) added, {result['skipped']} unchanged, {result['removed']} removed, in {output}")
+    for label, error in result['errors'].items():
+        console.print(f"{MSG.WARNING}{label}: {error}")
+
+
+@cli.command(context_settings=CONTEXT_SETTINGS)
+@click.argument('root', type=click.Path(exists=True, file_okay=False, path_type=Path), required=True)
+@click.option('-o', '--out', type=click.Path(file_okay=False, path_type=Path), help='The output folder', required=True)
+@click.option('-w', '--workers', type=int, help='Number of processes', default=1, show_default=True)
+@click.option('-t', '--type', 'img_type', type=click.Choice(['png', 'tif', 'jpg']), help='The image format', default='png', show_default=True)
+@click.option('-q', '--quality', type=int, help='The image quality', default=100, show_default=True)
+@click.option('-f', '--force', is_flag=True, help='Write also the previews that are up to date', default=False)
+@click.option('-s', '--stretch', type=click.Choice(['linear', 'percentile', 'equalize', 'none']), help='The contrast stretch', default='percentile', show_default=True)
+def previews(root: Path, out: Path, workers: int, img_type: str, quality: int, force: bool, stretch: str):
+    """Write the previews of all the products in an archive tree"""
+    from SimbioReader.previews import ERROR, SKIPPED, WRITTEN, build_previews
+    console = Console()
+    result = build_previews(root, out, workers=workers, img_type=img_type, quality=quality, force=force,
+                            stretch=None if stretch == 'none' else stretch)
+    status = [item[1] for item in result]
+    console.print(f"{MSG.INFO}{status.count(WRITTEN)} product(s) written, {status.count(SKIPPED)} up to date, in {out}")
+    for label, state, error in result:
+        if state == ERROR:
+            console.print(f"{MSG.WARNING}{label}: {error}")
+
+
+@cli.command(context_settings=CONTEXT_SETTINGS)
+@click.argument('root', type=click.Path(exists=True, file_okay=False, path_type=Path), required=True)
+@click.option('-o', '--out', type=click.Path(file_okay=False, path_type=Path), help='The output folder', required=True)
+@click.option('-w', '--workers', type=int, help='Number of processes', default=1, show_default=True)
+@click.option('-l', '--levels', type=int, help='Number of levels (default: down to a single tile)', default=None)
+@click.option('--tile', type=int, help='The tile size', default=256, show_default=True)
+@click.option('--mbtiles', is_flag=True, help='Write a MBTiles file for each image', default=False)
+@click.option('-s', '--stretch', type=click.Choice(['linear', 'percentile', 'equalize']), help='The contrast stretch', default='percentile', show_default=True)
+def pyramids(root: Path, out: Path, workers: int, levels: int, tile: int, mbtiles: bool, stretch: str):
+    """Write the tiled multi-resolution previews of all the products in an archive tree"""
+    from SimbioReader.pyramid import build_pyramids
+    console = Console()
+    result = build_pyramids(root, out, workers=workers, levels=levels, tile=tile, mbtiles=mbtiles, stretch=stretch)
+    errors = [(label, error) for label, error in result if error]
+    console.print(f"{MSG.INFO}{len(result) - len(errors)} product(s) written in {out}")
+    for label, error in errors:
+        console.print(f"{MSG.WARNING}{label}: {error}")
+
+
+@cli.command(context_settings=CONTEXT_SETTINGS)
+@click.argument('root', type=click.Path(exists=True, path_type=Path), required=True)
+@click.option('-w', '--workers', type=int, help='Number of processes', default=1, show_default=True)
+@click.option('--no-cache', is_flag=True, help='Hash again also the files already verified', default=False)
+@click.option('--cache-dir', type=click.Path(file_okay=False, path_type=Path), help='The cache folder', default=None)
+@click.pass_context
+def verify(ctx, root: Path, workers: int, no_cache: bool, cache_dir: Path):
+    """Check size and MD5 checksum of the files referenced by the labels"""
+    from rich.table import Table
+    from SimbioReader.integrity import OK, VerifiedCache, verify_tree
+    console = Console()
+    cache = None if no_cache else VerifiedCache(cache_dir)
+    result = verify_tree(root, workers=workers, cache=cache)
+    failed = result[result['status'] != OK]
+    if len(failed):
+        tb = Table(title="Failed files")
+        tb.add_column("File", style="cyan")
+        tb.add_column("Status", style="red")
+        tb.add_column("Detail")
+        for row in failed.itertuples():
+            name = Path(row.file_name).name if isinstance(row.file_name, str) else Path(row.label).name
+            detail = row.error if isinstance(row.error, str) else f"expected {row.expected_size} bytes, md5 {row.expected_md5}"
+            tb.add_row(name, row.status, detail)
+        console.print(tb)
+    console.print(f"{MSG.INFO}{len(result) - len(failed)}/{len(result)} files verified ({int(result['cached'].sum())} from the cache)")
+    if len(failed):
+        ctx.exit(1)
@@ -24,7 +24,46 @@ progEpilog = "- For any information or suggestion please contact " \
 
 datamodel='1.22.0.0'
 
+# PDS4 array data types: ENVI data type code (None if ENVI has no equivalent),
+# size in bits and NumPy dtype with explicit byte order
 data_types = {
-    "UnsignedLSB2": {'envi':2,'bits':16},
-    "IEEE754LSBSingle":{'envi':4,'bits':32},
+    "SignedByte": {'envi': None, 'bits': 8, 'dtype': 'i1'},
+    "UnsignedByte": {'envi': 1, 'bits': 8, 'dtype': 'u1'},
+    "SignedLSB2": {'envi': 2, 'bits': 16, 'dtype': '<i2'},
+    "SignedLSB4": {'envi': 3, 'bits': 32, 'dtype': '<i4'},
+    "SignedLSB8": {'envi': 14, 'bits': 64, 'dtype': '<i8'},
+    "UnsignedLSB2": {'envi': 12, 'bits': 16, 'dtype': '<u2'},
+    "UnsignedLSB4": {'envi': 13, 'bits': 32, 'dtype': '<u4'},
+    "UnsignedLSB8": {'envi': 15, 'bits': 64, 'dtype': '<u8'},
+    "SignedMSB2": {'envi': 2, 'bits': 16, 'dtype': '>i2'},
+    "SignedMSB4": {'envi': 3, 'bits': 32, 'dtype': '>i4'},
+    "SignedMSB8": {'envi': 14, 'bits': 64, 'dtype': '>i8'},
+    "UnsignedMSB2": {'envi': 12, 'bits': 16, 'dtype': '>u2'},
+    "UnsignedMSB4": {'envi': 13, 'bits': 32, 'dtype': '>u4'},
+    "UnsignedMSB8": {'envi': 15, 'bits': 64, 'dtype': '>u8'},
+    "IEEE754LSBSingle": {'envi': 4, 'bits': 32, 'dtype': '<f4'},
+    "IEEE754LSBDouble": {'envi': 5, 'bits': 64, 'dtype': '<f8'},
+    "IEEE754MSBSingle": {'envi': 4, 'bits': 32, 'dtype': '>f4'},
+    "IEEE754MSBDouble": {'envi': 5, 'bits': 64, 'dtype': '>f8'},
+    "ComplexLSB8": {'envi': 6, 'bits': 64, 'dtype': '<c8'},
+    "ComplexLSB16": {'envi': 9, 'bits': 128, 'dtype': '<c16'},
+    "ComplexMSB8": {'envi': 6, 'bits': 64, 'dtype': '>c8'},
+    "ComplexMSB16": {'envi': 9, 'bits': 128, 'dtype': '>c16'},
+}
+
+# PDS4 character table field types: pandas dtype used to read the column
+# (None for the date/time fields, parsed as UTC timestamps)
+field_types = {
+    "ASCII_Integer": "int64",
+    "ASCII_NonNegative_Integer": "int64",
+    "ASCII_Real": "float64",
+    "ASCII_Boolean": "bool",
+    "ASCII_String": "str",
+    "ASCII_Short_String_Collapsed": "str",
+    "ASCII_Short_String_Preserved": "str",
+    "ASCII_Text_Preserved": "str",
+    "ASCII_Date_Time_YMD_UTC": None,
+    "ASCII_Date_Time_YMD": None,
+    "ASCII_Date_Time_DOY_UTC": None,
+    "ASCII_Date_Time_DOY": None,
 }
@@ -0,0 +1,130 @@
+"""xarray view of a product.
+
+The images are exposed with the axes in ``(line, sample[, band])`` order and
+the detector coordinates of the lines and samples. In lazy mode every variable
+wraps a read-only memmap of its data file, split in Dask chunks of lines when
+Dask is installed, so no pixel is copied until it is computed.
+"""
+import numpy as np
+
+
+def _import_xarray():
+    try:
+        import xarray as xr
+    except ImportError as e:
+        raise ImportError(
+            "to_xarray requires the optional dependency xarray (pip install xarray dask)"
+        ) from e
+    return xr
+
+
+def _as_chunks(array: np.ndarray, lines_per_chunk: int):
+    """Wraps an array in Dask chunks of lines, if Dask is installed."""
+    try:
+        import dask.array as da
+    except ImportError:
+        return array
+    return da.from_array(array, chunks=(lines_per_chunk,) + array.shape[1:])
+
+
+def _pixels(obj, lazy: bool, lines_per_chunk: int):
+    """The image of an object in ``(line, sample[, band])`` order."""
+    from SimbioReader.sr import _line_first
+
+    axis_names = obj.data_structure.axis_names
+    if lazy:
+        return _as_chunks(_line_first(obj._disk_view(), axis_names), lines_per_chunk)
+    return _line_first(obj.read_window(), axis_names)
+
+
+def object_attrs(obj) -> dict:
+    """Detector and data structure attributes of an object, as scalars."""
+    ds = obj.data_structure
+    det = obj.detector
+    return {
+        "file_name": obj.file_name.name,
+        "exposure_time": float(obj.exposure_time),
+        "first_line": det.first_line,
+        "first_sample": det.first_sample,
+        "line_fov": det.line_fov,
+        "sample_fov": det.sample_fov,
+        "creation_time": ds.creation_time.isoformat(),
+        "file_size": ds.file_size,
+        "md5": ds.md5,
+        "offset": ds.offset,
+        "data_type": ds.data_type,
+        "interleave": ds.interleave or "",
+    }
+
+
+def to_dataset(reader, lazy: bool = True, lines_per_chunk: int = 256):
+    """Builds the ``xarray.Dataset`` of a product.
+
+    STC and HRIC products give one variable for each filter, named after the
+    filter, with its own ``<filter>_line`` and ``<filter>_sample`` dimensions.
+    The VIHI segments are joined along the lines in a single ``cube``
+    variable.
+
+    Args:
+        reader (SimbioReader): The product.
+        lazy (bool, optional): Back the variables with memmaps (and Dask
+            chunks) instead of loading the images. Defaults to True.
+        lines_per_chunk (int, optional): Lines in each Dask chunk. Defaults to 256.
+
+    Returns:
+        xarray.Dataset: The dataset.
+
+    Raises:
+        ImportError: If xarray is not installed.
+        ValueError: If the VIHI segments have different samples or bands.
+    """
+    xr = _import_xarray()
+    data = reader.data
+    attrs = {
+        "lid": reader.lid,
+        "version": reader.version,
+        "channel": reader.channel,
+        "level": reader.level,
+        "phase": reader.phaseName,
+        "start_time": reader.startTime.isoformat(),
+        "stop_time": reader.stopTime.isoformat(),
+        "target": reader.target.name,
+    }
+    variables = {}
+    if reader.channel == "vihi":
+        segments = [getattr(data, item) for item in data.segments]
+        if len({(obj.samples, obj.bands) for obj in segments}) > 1:
+            raise ValueError("The VIHI segments have different samples or bands")
+        arrays = [_pixels(obj, lazy, lines_per_chunk) for obj in segments]
+        if len(arrays) == 1:
+            cube = arrays[0]
+        elif lazy and not isinstance(arrays[0], np.ndarray):
+            import dask.array as da
+
+            cube = da.concatenate(arrays, axis=0)
+        else:
+            cube = np.concatenate(arrays, axis=0)
+        first = segments[0].detector
+        lines = np.concatenate(
+            [obj.detector.first_line + np.arange(obj.data_structure.line) for obj in segments]
+        )
+        variables["cube"] = xr.Variable(
+            ("line", "sample", "band"), cube, attrs=object_attrs(segments[0])
+        )
+        coords = {
+            "line": lines,
+            "sample": first.first_sample + np.arange(segments[0].data_structure.sample),
+            "band": np.arange(segments[0].data_structure.band),
+        }
+        attrs["segments"] = [obj.file_name.name for obj in segments]
+    else:
+        coords = {}
+        for item in data.filters:
+            obj = getattr(data, f"filter_{item}")
+            dims = (f"{item}_line", f"{item}_sample")
+            variables[item] = xr.Variable(
+                dims, _pixels(obj, lazy, lines_per_chunk), attrs=object_attrs(obj)
+            )
+            coords[dims[0]] = obj.detector.first_line + np.arange(obj.data_structure.line)
+            coords[dims[1]] = obj.detector.first_sample + np.arange(obj.data_structure.sample)
+    return xr.Dataset(variables, coords=coords, attrs=attrs)
@@ -1,5 +1,9 @@
-from rich.table import Table
-from rich.panel import Panel
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from rich.table import Table
 
 
 class Filter:
@@ -36,6 +40,9 @@ class Filter:
     
     def show(self):
         """Show the filter data in a table"""
+        from rich.panel import Panel
+        from rich.table import Table
+
         tb = Table.grid()
         tb.add_column(style='yellow')
         sep= ' = '
@@ -48,6 +55,8 @@ class Filter:
 
 
 def show_filters(channel:str)->Table:
+    from rich.table import Table
+
     if channel.lower() == "hric":
         from SimbioReader.filters import hricFilters
         flt=hricFilters
@@ -0,0 +1,158 @@
+"""Columnar store of the housekeeping of an archive.
+
+The housekeeping records of every product, together with the
+``img:Device_Temperature`` values of its label, are written in a Parquet
+dataset partitioned by channel, mission phase and month
+(``channel=stc/phase=cruise/month=2024-04/<lid>.parquet``). Each product has
+its own file, named after its LIDVID. A manifest (``_manifest.json``, ignored
+by the Parquet readers) records the labels already exported with their
+modification time and the file written for them: a new run only reads the new
+or changed labels, and the file of a product processed again, or no longer in
+the archive, is removed, so each product keeps a single set of rows.
+
+The dataset is read with ``pd.read_parquet(output)``.
+"""
+import json
+import re
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+MANIFEST = "_manifest.json"
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError as e:
+        raise ImportError(
+            "The housekeeping store requires the optional dependency pyarrow (pip install pyarrow)"
+        ) from e
+
+
+def _safe(value: str) -> str:
+    """Makes a value usable as a file or partition name."""
+    return re.sub(r"[^\w.-]+", "_", value.strip())
+
+
+def product_hk(label: Path):
+    """Returns the housekeeping records of a product with its device temperatures.
+
+    Args:
+        label (Path): The product label.
+
+    Returns:
+        tuple[dict, pd.DataFrame | None, str | None]: The partition keys
+        (``channel``, ``phase``, ``month``) and the product LIDVID, the records
+        and the error message if the product can not be read.
+    """
+    from rich.console import Console
+
+    from SimbioReader.sr import SimbioReader
+    from SimbioReader.tools import getElements, getValue
+
+    try:
+        reader = SimbioReader.open_header(label, console=Console(quiet=True))
+        df = reader.data.hk.df.reset_index()
+        for name in df.columns:
+            if df[name].dtype == "category":
+                df[name] = df[name].astype(str)
+        items = reader.data.segments if reader.channel == "vihi" else [
+            f"filter_{item}" for item in reader.data.filters
+        ]
+        if items:
+            imaging = getattr(reader.data, items[0]).imaging
+            for device in getElements(imaging, "img:Device_Temperature"):
+                name = _safe(getValue(device, "img:device_name")).upper()
+                df[f"DEVICE_{name}"] = float(getValue(device, "img:temperature_value"))
+        df.insert(0, "LIDVID", reader.lvid)
+        keys = {
+            "channel": reader.channel,
+            "phase": _safe(reader.phaseName).lower(),
+            "month": reader.startTime.strftime("%Y-%m"),
+            "lidvid": reader.lvid,
+        }
+        return keys, df, None
+    except Exception as e:
+        return {}, None, f"{type(e).__name__}: {e}"
+
+
+def _load_manifest(output: Path) -> dict:
+    manifest = output / MANIFEST
+    if manifest.exists():
+        return json.loads(manifest.read_text())
+    return {}
+
+
+def _remove(output: Path, entry: dict) -> None:
+    """Deletes the file recorded in a manifest entry, if any."""
+    if entry.get("file"):
+        output.joinpath(entry["file"]).unlink(missing_ok=True)
+
+
+def export_hk(root: Path | str, output: Path | str, workers: int = 1) -> dict:
+    """Adds the housekeeping of the products under a folder to the store.
+
+    Args:
+        root (Path | str): The archive root.
+        output (Path | str): The folder of the Parquet dataset.
+        workers (int, optional): Number of processes. Defaults to 1.
+
+    Returns:
+        dict: The number of ``added``, ``skipped`` and ``removed`` products and
+        the ``errors``, a dict label: message.
+
+    Raises:
+        ImportError: If pyarrow is not installed.
+    """
+    from SimbioReader.catalog import find_labels
+
+    _require_pyarrow()
+    output = Path(output)
+    output.mkdir(parents=True, exist_ok=True)
+    manifest = _load_manifest(output)
+    labels = find_labels(root)
+    # the products exported from this root whose label has been deleted
+    present = {label.resolve().as_posix() for label in labels}
+    base = Path(root).resolve()
+    removed = 0
+    for key in list(manifest):
+        if key not in present and Path(key).is_relative_to(base):
+            _remove(output, manifest.pop(key))
+            removed += 1
+    todo = []
+    for label in labels:
+        key = label.resolve().as_posix()
+        if manifest.get(key, {}).get("mtime_ns") != label.stat().st_mtime_ns:
+            todo.append(label)
+    if workers > 1 and len(todo) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(product_hk, todo))
+    else:
+        results = [product_hk(label) for label in todo]
+    errors = {}
+    for label, (keys, df, error) in zip(todo, results):
+        if error is not None:
+            errors[str(label)] = error
+            continue
+        folder = output.joinpath(
+            f"channel={keys['channel']}", f"phase={keys['phase']}", f"month={keys['month']}"
+        )
+        folder.mkdir(parents=True, exist_ok=True)
+        key = label.resolve().as_posix()
+        # the LIDVID or the partition may have changed since the last export
+        _remove(output, manifest.get(key, {}))
+        file_name = folder / f"{_safe(keys['lidvid'])}.parquet"
+        df.to_parquet(file_name, index=False)
+        manifest[key] = {
+            "mtime_ns": label.stat().st_mtime_ns,
+            "lidvid": keys["lidvid"],
+            "file": file_name.relative_to(output).as_posix(),
+        }
+    (output / MANIFEST).write_text(json.dumps(manifest, indent=1))
+    added = len(todo) - len(errors)
+    return {
+        "added": added,
+        "skipped": len(labels) - len(todo),
+        "removed": removed,
+        "errors": errors,
+    }
@@ -122,13 +122,54 @@ def tests(ctx,all: bool = None, date: str = None, name: str = None, phase: str =
                 console.print(f"{MSG.WARNING}Test {name.title()} not found. Please try to specific a subphase.")
                 ctx.exit()
             console.print(f"{MSG.WARNING}Test {name.title()} for subphase {subphase.upper()} not found.")
-            console.print(Test.show_all(key=name))
+            console.print(Test.show_all(key=name, rank=True))
     elif phase:
         console.print(Test.show_all(phase=phase))
     elif subphase:
         console.print(Test.show_all(subphase=subphase))
 
 
+def _tag_chunks(chunks, stream):
+    """Tags each chunk of time strings and writes it as CSV."""
+    import pandas as pd
+    from SimbioReader.simbioInfo import tag_times
+    header = True
+    for chunk in chunks:
+        chunk = pd.Series(chunk, dtype=str).str.strip()
+        times = pd.to_datetime(chunk, utc=True, format="ISO8601", errors="coerce")
+        result = tag_times(times)
+        result.insert(0, "time", chunk.values)
+        result.to_csv(stream, header=header, index=False)
+        header = False
+
+
+@cli.command()
+@click.argument('file', type=click.Path(exists=True, dir_okay=False), required=False)
+@click.option('-c', '--column', type=str, help='The column of FILE with the times', default=None)
+@click.option('--chunk-size', type=int, help='Times tagged at a time', default=100000, show_default=True)
+@click.pass_context
+def tag(ctx, file: str, column: str, chunk_size: int):
+    """Tag times with phase, subphase and test
+
+    The ISO 8601 times are read one per line from the standard input or from
+    the COLUMN of the CSV FILE, and the result is written as CSV on the
+    standard output, one block at a time."""
+    from itertools import islice
+    stream = click.get_text_stream('stdout')
+    if file:
+        import pandas as pd
+        if not column:
+            ctx.fail("The --column option is required with a CSV file.")
+        try:
+            chunks = (chunk[column] for chunk in pd.read_csv(file, usecols=[column], dtype=str, chunksize=chunk_size))
+            _tag_chunks(chunks, stream)
+        except ValueError as e:
+            ctx.fail(str(e))
+    else:
+        lines = (line for line in click.get_text_stream('stdin') if line.strip())
+        _tag_chunks(iter(lambda: list(islice(lines, chunk_size)), []), stream)
+
+
 @cli.command("filters")
 @click.argument('channel', required=True)
 @click.option('-n', '--name', type=str, help='Show the filter for the given name', default=None)
@@ -0,0 +1,243 @@
+"""Integrity check of the files referenced by the labels.
+
+Every ``File`` of a label declares its ``file_size`` and ``md5_checksum``. The
+files are checked for existence and size, then hashed in chunks, optionally in
+a pool of processes. The files found valid are recorded in a SQLite database
+together with their size and modification time, so an unchanged file is not
+hashed again by the next run.
+"""
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+from SimbioReader.cache import DEFAULT_CACHE_DIR, file_md5
+
+COLUMNS = [
+    "label",
+    "file_name",
+    "status",
+    "expected_size",
+    "size",
+    "expected_md5",
+    "md5",
+    "cached",
+    "error",
+]
+
+OK = "ok"
+MISSING = "missing"
+SIZE_MISMATCH = "size mismatch"
+MD5_MISMATCH = "md5 mismatch"
+LABEL_ERROR = "label error"
+
+
+class VerifiedCache:
+    """
+    The record of the files already found valid, stored in SQLite.
+
+    An entry is valid while the size and the modification time of the file
+    are unchanged and the expected checksum is the same.
+
+    Args:
+        directory (Path | str, optional): The cache folder. Defaults to
+            ``$SIMBIOREADER_CACHE_DIR`` or ``~/.cache/SimbioReader``.
+
+    Attributes:
+        path (Path): The SQLite database file.
+    """
+
+    file_name = "verified.sqlite"
+
+    def __init__(self, directory: Path | str | None = None) -> None:
+        self.directory = Path(directory) if directory else DEFAULT_CACHE_DIR
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.path = self.directory / self.file_name
+        with self._connect() as db:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS verified ("
+                "path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, "
+                "md5 TEXT, verified REAL)"
+            )
+
+    @contextmanager
+    def _connect(self):
+        db = sqlite3.connect(self.path, timeout=30)
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def is_verified(self, file_name: Path, md5: str) -> bool:
+        """Tells if a file was already found valid and is unchanged.
+
+        Args:
+            file_name (Path): The file.
+            md5 (str): The expected checksum.
+
+        Returns:
+            bool: True if the file does not need to be hashed again.
+        """
+        file_name = Path(file_name).resolve()
+        try:
+            st = file_name.stat()
+        except FileNotFoundError:
+            return False
+        with self._connect() as db:
+            row = db.execute(
+                "SELECT size, mtime_ns, md5 FROM verified WHERE path = ?",
+                (file_name.as_posix(),),
+            ).fetchone()
+        return row == (st.st_size, st.st_mtime_ns, md5)
+
+    def add(self, file_name: Path, md5: str) -> None:
+        """Records a file found valid.
+
+        Args:
+            file_name (Path): The file.
+            md5 (str): Its checksum.
+        """
+        file_name = Path(file_name).resolve()
+        st = file_name.stat()
+        with self._connect() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO verified VALUES (?, ?, ?, ?, ?)",
+                (file_name.as_posix(), st.st_size, st.st_mtime_ns, md5,
+                 datetime.now().timestamp()),
+            )
+
+    def clear(self) -> int:
+        """Removes every entry.
+
+        Returns:
+            int: The number of removed entries.
+        """
+        with self._connect() as db:
+            return db.execute("DELETE FROM verified").rowcount
+
+    def __str__(self) -> str:
+        return f"VerifiedCache(path={self.path})"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+
+def label_files(label: Path | str) -> list[dict]:
+    """Returns the files declared by a label, with their size and checksum.
+
+    Args:
+        label (Path | str): The ``.lblx`` file.
+
+    Returns:
+        list[dict]: The ``label``, ``file_name``, ``expected_size`` and
+        ``expected_md5`` of each file.
+    """
+    from SimbioReader.label import read_label
+    from SimbioReader.tools import LabelIndex, getElement, getElements, getValue
+
+    label = Path(label)
+    index = LabelIndex(read_label(label))
+    entries = []
+    for area in getElements(index, "File_Area_Observational"):
+        fl = getElement(area, "File")
+        entries.append(
+            {
+                "label": str(label),
+                "file_name": str(label.parent / getValue(fl, "file_name")),
+                "expected_size": int(getValue(fl, "file_size")),
+                "expected_md5": getValue(fl, "md5_checksum"),
+            }
+        )
+    return entries
+
+
+def check_file(entry: dict) -> dict:
+    """Checks existence, size and checksum of a file.
+
+    Args:
+        entry (dict): An item returned by ``label_files``.
+
+    Returns:
+        dict: The entry completed with ``status``, ``size`` and ``md5``.
+    """
+    row = dict(entry, status=OK, size=None, md5=None, cached=False, error=None)
+    file_name = Path(entry["file_name"])
+    if not file_name.exists():
+        row["status"] = MISSING
+        return row
+    row["size"] = file_name.stat().st_size
+    if row["size"] != entry["expected_size"]:
+        row["status"] = SIZE_MISMATCH
+        return row
+    row["md5"] = file_md5(file_name)
+    if row["md5"] != entry["expected_md5"]:
+        row["status"] = MD5_MISMATCH
+    return row
+
+
+def verify_files(entries: list[dict], workers: int = 1, cache: VerifiedCache | None = None):
+    """Checks a list of files, skipping those already verified.
+
+    Args:
+        entries (list[dict]): Items returned by ``label_files``.
+        workers (int, optional): Number of processes. Defaults to 1.
+        cache (VerifiedCache | None, optional): The record of the verified
+            files. Defaults to None.
+
+    Returns:
+        pd.DataFrame: One row for each file, in the order of ``entries``.
+    """
+    import pandas as pd
+
+    rows = [None] * len(entries)
+    todo = []
+    for i, entry in enumerate(entries):
+        if entry.get("status") == LABEL_ERROR:
+            rows[i] = dict(entry, cached=False)
+        elif cache is not None and cache.is_verified(entry["file_name"], entry["expected_md5"]):
+            rows[i] = dict(entry, status=OK, size=entry["expected_size"],
+                           md5=entry["expected_md5"], cached=True, error=None)
+        else:
+            todo.append(i)
+    if workers > 1 and len(todo) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            checked = list(executor.map(check_file, [entries[i] for i in todo]))
+    else:
+        checked = [check_file(entries[i]) for i in todo]
+    for i, row in zip(todo, checked):
+        rows[i] = row
+        if cache is not None and row["status"] == OK:
+            cache.add(row["file_name"], row["md5"])
+    return pd.DataFrame(rows, columns=COLUMNS)
+
+
+def verify_tree(root: Path | str, workers: int = 1, cache: VerifiedCache | None = None):
+    """Checks the files of all the labels under a folder (or of a single label).
+
+    Args:
+        root (Path | str): The archive root, or a label.
+        workers (int, optional): Number of processes. Defaults to 1.
+        cache (VerifiedCache | None, optional): The record of the verified
+            files. Defaults to None.
+
+    Returns:
+        pd.DataFrame: One row for each file; a label that can not be read
+        gives a single row with status ``label error`` and the message in
+        ``error``.
+    """
+    from SimbioReader.catalog import find_labels
+
+    root = Path(root)
+    labels = [root] if root.is_file() else find_labels(root)
+    entries = []
+    for label in labels:
+        try:
+            entries.extend(label_files(label))
+        except Exception as e:
+            entries.append(
+                {"label": str(label), "status": LABEL_ERROR,
+                 "error": f"{type(e).__name__}: {e}"}
+            )
+    return verify_files(entries, workers=workers, cache=cache)
@@ -0,0 +1,167 @@
+"""PDS4 label parsing backends.
+
+A label is read in a single pass into a plain nested ``dict`` model. Every
+element without child elements becomes a key (its tag name, with the
+namespace prefix used in the label, e.g. ``img:first_line``) holding its text.
+The elements listed in ``LIST_SCOPES`` and ``DICT_SCOPES`` open a nested
+scope, so that repeated blocks (one ``File_Area_Observational`` per file,
+one ``img:Imaging`` per filter, ...) are kept apart. Inside a scope only the
+first occurrence of a tag is retained, which is the same value returned by
+``getValue`` on the DOM.
+
+The model can be queried with ``getValue`` and ``getElement`` exactly like a
+``xml.dom.minidom`` node.
+"""
+import xml.dom.minidom as md
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+try:
+    from lxml import etree as lxml_etree
+except ImportError:  # pragma: no cover - optional dependency
+    lxml_etree = None
+
+LIST_SCOPES = (
+    "File_Area_Observational",
+    "img:Imaging",
+    "geom:Geometry",
+    "Axis_Array",
+    "Field_Character",
+    "img:Device_Temperature",
+)
+
+DICT_SCOPES = (
+    "Observation_Area",
+    "File",
+    "Array_2D_Image",
+    "Array_3D_Spectrum",
+    "Table_Character",
+    "Target_Identification",
+    "Time_Coordinates",
+    "psa:Mission_Phase",
+    "img:Subframe",
+    "img:Optical_Filter",
+)
+
+
+class _ModelBuilder:
+    """Builds the label model from a stream of start/end element events."""
+
+    def __init__(self) -> None:
+        self.model = {}
+        self._scopes = [self.model]
+        # one entry per open element: [opened a scope, has child elements]
+        self._open = []
+
+    def start(self, tag: str) -> None:
+        if self._open:
+            self._open[-1][1] = True
+        parent = self._scopes[-1]
+        if tag in LIST_SCOPES:
+            node = {}
+            parent.setdefault(tag, []).append(node)
+        elif tag in DICT_SCOPES:
+            node = parent.setdefault(tag, {})
+        else:
+            self._open.append([False, False])
+            return
+        self._scopes.append(node)
+        self._open.append([True, False])
+
+    def end(self, tag: str, text: str | None) -> None:
+        scope, has_children = self._open.pop()
+        if scope:
+            self._scopes.pop()
+        elif not has_children:
+            self._scopes[-1].setdefault(tag, text)
+
+
+def _read_etree(label: Path) -> dict:
+    """Streams the label with ``iterparse`` (lxml when it is installed)."""
+    builder = _ModelBuilder()
+    prefixes = {}
+    if lxml_etree is not None:
+        events = lxml_etree.iterparse(
+            str(label), events=("start", "end", "start-ns"), remove_comments=True
+        )
+    else:
+        events = ET.iterparse(str(label), events=("start", "end", "start-ns"))
+    for event, elem in events:
+        if event == "start-ns":
+            prefix, uri = elem
+            prefixes.setdefault(uri, prefix)
+            continue
+        tag = elem.tag
+        if tag[0] == "{":
+            uri, local = tag[1:].split("}", 1)
+            prefix = prefixes.get(uri)
+            tag = f"{prefix}:{local}" if prefix else local
+        if event == "start":
+            builder.start(tag)
+        else:
+            builder.end(tag, elem.text)
+            elem.clear()
+    return builder.model
+
+
+def _walk_dom(node: md.Element, builder: _ModelBuilder) -> None:
+    for child in node.childNodes:
+        if child.nodeType != child.ELEMENT_NODE:
+            continue
+        builder.start(child.tagName)
+        _walk_dom(child, builder)
+        text = [
+            item.data
+            for item in child.childNodes
+            if item.nodeType in (item.TEXT_NODE, item.CDATA_SECTION_NODE)
+        ]
+        builder.end(child.tagName, "".join(text) if text else None)
+
+
+def _read_minidom(label: Path) -> dict:
+    """Parses the whole label with ``xml.dom.minidom`` and walks the DOM."""
+    builder = _ModelBuilder()
+    _walk_dom(md.parse(label.as_posix()), builder)
+    return builder.model
+
+
+def element_to_model(element: md.Document | md.Element) -> dict:
+    """Converts an already parsed DOM node to the label model.
+
+    Args:
+        element (md.Document | md.Element): The node to convert.
+
+    Returns:
+        dict: The label model of the node content.
+    """
+    builder = _ModelBuilder()
+    _walk_dom(element, builder)
+    return builder.model
+
+
+BACKENDS = {
+    "etree": _read_etree,
+    "minidom": _read_minidom,
+}
+
+
+def read_label(label: Path | str, backend: str = "etree") -> dict:
+    """Reads a PDS4 label into the label model.
+
+    Args:
+        label (Path | str): The ``.lblx`` file.
+        backend (str, optional): One of the keys of ``BACKENDS``. Defaults to
+            ``'etree'``, the streaming parser.
+
+    Returns:
+        dict: The label model.
+
+    Raises:
+        ValueError: If the backend is unknown.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(
+            f"Unknown label backend '{backend}'. Available: {', '.join(BACKENDS)}"
+        )
+    return BACKENDS[backend](Path(label))
+
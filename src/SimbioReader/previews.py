@@ -0,0 +1,100 @@
+"""Batch generation of the preview images of an archive.
+
+The products found under the root folder are processed in a pool of
+processes. A product is skipped when the previews of all its data files exist
+and are newer than the data files, unless ``force`` is given.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+
+WRITTEN = "written"
+SKIPPED = "skipped"
+ERROR = "error"
+
+
+def preview_product(
+    label: Path,
+    out: Path,
+    img_type: str = "png",
+    quality: int = 100,
+    force: bool = False,
+    stretch: str | None = "percentile",
+) -> tuple[str, str, str | None]:
+    """Writes the previews of a product if they are missing or older than the data.
+
+    Args:
+        label (Path): The product label.
+        out (Path): The output folder.
+        img_type (str, optional): The image format. Defaults to 'png'.
+        quality (int, optional): The quality of the image. Defaults to 100.
+        force (bool, optional): Write the previews anyway. Defaults to False.
+        stretch (str | None, optional): The contrast stretch to 8 bit.
+            Defaults to 'percentile'.
+
+    Returns:
+        tuple[str, str, str | None]: The label, the status (``written``,
+        ``skipped`` or ``error``) and the error message.
+    """
+    from rich.console import Console
+
+    from SimbioReader.sr import SimbioReader
+    from SimbioReader.tools import gen_filename
+
+    try:
+        reader = SimbioReader.open_header(label, console=Console(quiet=True))
+        data = reader.data
+        items = data.segments if reader.channel == "vihi" else [
+            f"filter_{item}" for item in data.filters
+        ]
+        sources = [getattr(data, item).file_name for item in items]
+        previews = [out / f"{gen_filename(source)}.{img_type}" for source in sources]
+        if not force and all(
+            preview.exists() and preview.stat().st_mtime >= source.stat().st_mtime
+            for source, preview in zip(sources, previews)
+        ):
+            return str(label), SKIPPED, None
+        reader.savePreview(img_type=img_type, quality=quality, outFolder=out, stretch=stretch)
+        return str(label), WRITTEN, None
+    except Exception as e:
+        return str(label), ERROR, f"{type(e).__name__}: {e}"
+
+
+def build_previews(
+    root: Path | str,
+    out: Path | str,
+    workers: int = 1,
+    img_type: str = "png",
+    quality: int = 100,
+    force: bool = False,
+    stretch: str | None = "percentile",
+) -> list[tuple[str, str, str | None]]:
+    """Writes the previews of all the products under a folder.
+
+    Args:
+        root (Path | str): The archive root.
+        out (Path | str): The output folder.
+        workers (int, optional): Number of processes. Defaults to 1.
+        img_type (str, optional): The image format. Defaults to 'png'.
+        quality (int, optional): The quality of the image. Defaults to 100.
+        force (bool, optional): Write also the previews that are up to date.
+            Defaults to False.
+        stretch (str | None, optional): The contrast stretch to 8 bit.
+            Defaults to 'percentile'.
+
+    Returns:
+        list[tuple[str, str, str | None]]: Label, status and error message of
+        each product.
+    """
+    from SimbioReader.catalog import find_labels
+
+    out = Path(out)
+    out.mkdir(parents=True, exist_ok=True)
+    labels = find_labels(root)
+    task = partial(
+        preview_product, out=out, img_type=img_type, quality=quality, force=force, stretch=stretch
+    )
+    if workers > 1 and len(labels) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(task, labels))
+    return [task(label) for label in labels]
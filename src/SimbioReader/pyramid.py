@@ -0,0 +1,258 @@
+"""Multi-resolution tiled previews.
+
+The image is converted to 8 bit once (see ``SimbioReader.stretch``); each
+level of the pyramid is the 2x2 block mean of the previous one, so the data
+file is read only once. The reduced levels are kept in float32 and rounded to 8
+bit only when their tiles are written, so the rounding errors do not add up
+from level to level. The levels are cut in square tiles, padded with zeros
+at the right and bottom edges, and written either in a folder
+(``<zoom>/<column>/<row>.png``) or in a single MBTiles SQLite file (``.mbtiles``,
+with the TMS row order of the format). As in the web maps, zoom 0 is the
+coarsest level.
+"""
+import io
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+
+import numpy as np
+
+
+def downsample(img: np.ndarray) -> np.ndarray:
+    """Halves an image with the mean of 2x2 blocks.
+
+    An odd last line or sample is averaged with itself.
+
+    Args:
+        img (np.ndarray): The uint8 or float32 image.
+
+    Returns:
+        np.ndarray: The float32 image of half size (rounded up), not rounded.
+    """
+    lines, samples = img.shape
+    if lines % 2 or samples % 2:
+        img = np.pad(img, ((0, lines % 2), (0, samples % 2)), mode="edge")
+    blocks = img.reshape(img.shape[0] // 2, 2, img.shape[1] // 2, 2)
+    return blocks.mean(axis=(1, 3), dtype=np.float32)
+
+
+def quantize(level: np.ndarray) -> np.ndarray:
+    """Rounds a level to 8 bit.
+
+    Args:
+        level (np.ndarray): The uint8 or float32 level.
+
+    Returns:
+        np.ndarray: The uint8 level.
+    """
+    if level.dtype == np.uint8:
+        return level
+    return np.clip(np.rint(level), 0, 255).astype(np.uint8)
+
+
+def pyramid_levels(img: np.ndarray, levels: int | None = None, tile: int = 256) -> list[np.ndarray]:
+    """Computes the levels of the pyramid, from the full resolution down.
+
+    Args:
+        img (np.ndarray): The uint8 image.
+        levels (int | None, optional): Number of levels, full resolution
+            included. Defaults to the levels needed to fit the image in one tile.
+        tile (int, optional): The tile size. Defaults to 256.
+
+    Returns:
+        list[np.ndarray]: The levels, the first is ``img``; the others are
+        float32, to be rounded with ``quantize``.
+    """
+    if levels is None:
+        levels = 1 + max(0, int(np.ceil(np.log2(max(img.shape) / tile))))
+    result = [img]
+    for _ in range(levels - 1):
+        result.append(downsample(result[-1]))
+    return result
+
+
+def iter_tiles(level: np.ndarray, tile: int = 256):
+    """Cuts a level in tiles.
+
+    Yields:
+        tuple[int, int, np.ndarray]: Column, row and the ``tile`` x ``tile`` image.
+    """
+    lines, samples = level.shape
+    for row in range(0, lines, tile):
+        for col in range(0, samples, tile):
+            block = level[row : row + tile, col : col + tile]
+            if block.shape != (tile, tile):
+                padded = np.zeros((tile, tile), dtype=np.uint8)
+                padded[: block.shape[0], : block.shape[1]] = block
+                block = padded
+            yield col // tile, row // tile, block
+
+
+def _encode(block: np.ndarray, fmt: str) -> bytes:
+    from PIL import Image
+
+    buffer = io.BytesIO()
+    Image.fromarray(block).save(buffer, format=fmt)
+    return buffer.getvalue()
+
+
+class DirectoryTileWriter:
+    """Writes the tiles as ``<zoom>/<column>/<row>.<ext>`` in a folder.
+
+    Args:
+        path (Path): The folder.
+        fmt (str, optional): The PIL format of the tiles. Defaults to 'PNG'.
+    """
+
+    def __init__(self, path: Path, fmt: str = "PNG") -> None:
+        self.path = Path(path)
+        self.fmt = fmt
+        self.path.mkdir(parents=True, exist_ok=True)
+
+    def write(self, zoom: int, col: int, row: int, rows: int, block: np.ndarray) -> None:
+        folder = self.path / str(zoom) / str(col)
+        folder.mkdir(parents=True, exist_ok=True)
+        (folder / f"{row}.{self.fmt.lower()}").write_bytes(_encode(block, self.fmt))
+
+    def close(self, metadata: dict) -> None:
+        pass
+
+
+class MBTilesWriter:
+    """Writes the tiles in a MBTiles SQLite file.
+
+    Args:
+        path (Path): The ``.mbtiles`` file, replaced if it exists.
+        fmt (str, optional): The PIL format of the tiles. Defaults to 'PNG'.
+    """
+
+    def __init__(self, path: Path, fmt: str = "PNG") -> None:
+        self.path = Path(path)
+        self.fmt = fmt
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.unlink(missing_ok=True)
+        self.db = sqlite3.connect(self.path)
+        self.db.execute("CREATE TABLE metadata (name TEXT, value TEXT)")
+        self.db.execute(
+            "CREATE TABLE tiles (zoom_level INTEGER, tile_column INTEGER, "
+            "tile_row INTEGER, tile_data BLOB)"
+        )
+        self.db.execute(
+            "CREATE UNIQUE INDEX tile_index ON tiles (zoom_level, tile_column, tile_row)"
+        )
+
+    def write(self, zoom: int, col: int, row: int, rows: int, block: np.ndarray) -> None:
+        # MBTiles counts the rows from the bottom (TMS)
+        self.db.execute(
+            "INSERT INTO tiles VALUES (?, ?, ?, ?)",
+            (zoom, col, rows - 1 - row, _encode(block, self.fmt)),
+        )
+
+    def close(self, metadata: dict) -> None:
+        metadata = dict(metadata, format=self.fmt.lower())
+        self.db.executemany(
+            "INSERT INTO metadata VALUES (?, ?)",
+            [(name, str(value)) for name, value in metadata.items()],
+        )
+        self.db.commit()
+        self.db.close()
+
+
+def write_pyramid(
+    img: np.ndarray,
+    out: Path | str,
+    levels: int | None = None,
+    tile: int = 256,
+    name: str = "",
+) -> list[tuple[int, int]]:
+    """Writes the tiles of all the levels of an 8 bit image.
+
+    Args:
+        img (np.ndarray): The uint8 ``(line, sample)`` image.
+        out (Path | str): A folder, or a ``.mbtiles`` file.
+        levels (int | None, optional): Number of levels. Defaults to the levels
+            needed to fit the image in one tile.
+        tile (int, optional): The tile size. Defaults to 256.
+        name (str, optional): The name stored in the MBTiles metadata.
+            Defaults to ''.
+
+    Returns:
+        list[tuple[int, int]]: The shape of each level, from the full resolution.
+    """
+    out = Path(out)
+    writer = MBTilesWriter(out) if out.suffix == ".mbtiles" else DirectoryTileWriter(out)
+    pyramid = pyramid_levels(img, levels, tile)
+    top = len(pyramid) - 1
+    for depth, level in enumerate(pyramid):
+        rows = -(-level.shape[0] // tile)
+        for col, row, block in iter_tiles(quantize(level), tile):
+            writer.write(top - depth, col, row, rows, block)
+    writer.close(
+        {"name": name, "type": "overlay", "version": "1.0", "minzoom": 0,
+         "maxzoom": top, "tile_size": tile}
+    )
+    return [level.shape for level in pyramid]
+
+
+def pyramid_product(
+    label: Path,
+    out: Path,
+    levels: int | None = None,
+    tile: int = 256,
+    mbtiles: bool = False,
+    stretch: str = "percentile",
+) -> tuple[str, str | None]:
+    """Writes the pyramids of all the filters or segments of a product.
+
+    Returns:
+        tuple[str, str | None]: The label and the error message, if any.
+    """
+    from rich.console import Console
+
+    from SimbioReader.sr import SimbioReader
+
+    try:
+        reader = SimbioReader.open_header(label, console=Console(quiet=True))
+        reader.data.build_pyramids(out, levels=levels, tile=tile, mbtiles=mbtiles, stretch=stretch)
+        return str(label), None
+    except Exception as e:
+        return str(label), f"{type(e).__name__}: {e}"
+
+
+def build_pyramids(
+    root: Path | str,
+    out: Path | str,
+    workers: int = 1,
+    levels: int | None = None,
+    tile: int = 256,
+    mbtiles: bool = False,
+    stretch: str = "percentile",
+) -> list[tuple[str, str | None]]:
+    """Writes the pyramids of all the products under a folder.
+
+    Args:
+        root (Path | str): The archive root.
+        out (Path | str): The output folder.
+        workers (int, optional): Number of processes. Defaults to 1.
+        levels (int | None, optional): Number of levels. Defaults to None.
+        tile (int, optional): The tile size. Defaults to 256.
+        mbtiles (bool, optional): Write MBTiles files instead of folders.
+            Defaults to False.
+        stretch (str, optional): The contrast stretch. Defaults to 'percentile'.
+
+    Returns:
+        list[tuple[str, str | None]]: Label and error message of each product.
+    """
+    from SimbioReader.catalog import find_labels
+
+    out = Path(out)
+    out.mkdir(parents=True, exist_ok=True)
+    labels = find_labels(root)
+    task = partial(
+        pyramid_product, out=out, levels=levels, tile=tile, mbtiles=mbtiles, stretch=stretch
+    )
+    if workers > 1 and len(labels) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(task, labels))
+    return [task(label) for label in labels]
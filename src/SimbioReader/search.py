@@ -0,0 +1,96 @@
+"""Inverted index for the search of the tests by name.
+
+A query matches a name when each of its words is contained, ignoring the
+case, in the name (see ``simbioInfo.compare_str``). As the words of the query
+have no spaces, a word is contained in a name if and only if it is contained in
+one of its words, so the index maps every substring of every word of the names
+to the entries using it. A query is answered by intersecting the sets of its
+words, without scanning the table.
+"""
+import re
+
+_SPLIT = re.compile(r"\s+")
+
+
+def tokens(text: str) -> list[str]:
+    """Splits a text in lower case words."""
+    return [token for token in _SPLIT.split(text.lower()) if token]
+
+
+class TokenIndex:
+    """
+    An inverted index of the substrings of the words of a table field.
+
+    Args:
+        table (dict): The entries.
+        field (str, optional): The field to index. Defaults to 'name'.
+        group (str | None, optional): A field to restrict the searches to
+            (e.g. ``'subphase'``). Defaults to None.
+
+    Attributes:
+        postings (dict): The keys of the entries for each substring.
+        groups (dict): The keys of the entries for each group (lower case).
+    """
+
+    def __init__(self, table: dict, field: str = "name", group: str | None = None) -> None:
+        self.table = table
+        self.field = field
+        self.position = {key: i for i, key in enumerate(table)}
+        self.postings: dict[str, set[str]] = {}
+        self.groups: dict[str, set[str]] = {}
+        for key, item in table.items():
+            for token in set(tokens(item[field])):
+                for start in range(len(token)):
+                    for stop in range(start + 1, len(token) + 1):
+                        self.postings.setdefault(token[start:stop], set()).add(key)
+            if group is not None:
+                self.groups.setdefault(item[group].lower(), set()).add(key)
+
+    def candidates(self, query: str, group: str | None = None) -> set[str]:
+        """Returns the keys of the entries matching a query.
+
+        Args:
+            query (str): The words to search.
+            group (str | None, optional): Restrict to a group. Defaults to None.
+
+        Returns:
+            set[str]: The matching keys.
+        """
+        sets = [self.postings.get(word, set()) for word in tokens(query)]
+        if group is not None:
+            sets.append(self.groups.get(group.lower(), set()))
+        if not sets:
+            return set(self.table)
+        sets.sort(key=len)
+        result = set(sets[0])
+        for item in sets[1:]:
+            result &= item
+            if not result:
+                break
+        return result
+
+    def score(self, query: str, key: str) -> tuple:
+        """Ranks a match: words of the query equal to a word of the name, then
+        prefixes of a word, then the shorter names first."""
+        words = set(tokens(self.table[key][self.field]))
+        query = tokens(query)
+        exact = sum(word in words for word in query)
+        prefix = sum(any(item.startswith(word) for item in words) for word in query)
+        return (-exact, -prefix, len(self.table[key][self.field]), self.position[key])
+
+    def search(self, query: str, group: str | None = None, rank: bool = False) -> list[str]:
+        """Returns the keys of the entries matching a query.
+
+        Args:
+            query (str): The words to search.
+            group (str | None, optional): Restrict to a group. Defaults to None.
+            rank (bool, optional): Sort by relevance (see ``score``) instead of
+                table order. Defaults to False.
+
+        Returns:
+            list[str]: The matching keys.
+        """
+        result = self.candidates(query, group)
+        if rank:
+            return sorted(result, key=lambda key: self.score(query, key))
+        return sorted(result, key=self.position.__getitem__)
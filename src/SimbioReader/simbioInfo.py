@@ -9,9 +9,13 @@ from rich.table import Table
 from SimbioReader.phases import phases
 from SimbioReader.subphases import subphases
 from SimbioReader.tests import tests
+from SimbioReader.search import TokenIndex
+from SimbioReader.timeline import PHASES, SUBPHASES, TESTS, to_datetime
 
 dateFormat = "%Y-%m-%d %H:%M:%S"
 console = Console()
+# words of the test names, for the searches by name
+TEST_INDEX = TokenIndex(tests, field="name", group="subphase")
 
 
 class Phase:
@@ -49,8 +53,8 @@ class Phase:
             raise ValueError("You must provide a phase name or a date.")
         
         self.name = phase_data["name"]
-        self.start = parse(phase_data["start"],ignoretz=True)
-        self.end = parse(phase_data["end"],ignoretz=True)
+        self.start = to_datetime(phase_data["start"])
+        self.end = to_datetime(phase_data["end"])
         self.extended_name = phase_data["LPName"]
 
     def _find_phase_by_date(self, dt):
@@ -63,12 +67,8 @@ class Phase:
         Returns:
             dict | None: The phase data if found, otherwise None.
         """
-        for phase_name, phase_data in phases.items():
-            start = parse(phase_data["start"],ignoretz=True)
-            end = parse(phase_data["end"],ignoretz=True)
-            if start <= dt <= end:
-                return phase_data
-        return None
+        phase_name = PHASES.find(dt)
+        return phases[phase_name] if phase_name else None
 
     def __str__(self)-> str:
         """
@@ -104,8 +104,8 @@ class Phase:
             if phase_name == "None":
                 continue
             tb.add_row(f"{phase_data['LPName']} ({phase_name})",
-                       parse(phase_data['start']).strftime(dateFormat),
-                       parse(phase_data['end']).strftime(dateFormat))
+                       to_datetime(phase_data['start']).strftime(dateFormat),
+                       to_datetime(phase_data['end']).strftime(dateFormat))
         return tb
     
     def show(self):
@@ -180,8 +180,8 @@ class SubPhase:
         else:
             raise ValueError("You must provide a subphase name or a date.")
         self.name = subphase_data['name']
-        self.start = parse(subphase_data['start'])
-        self.end = parse(subphase_data['end'])
+        self.start = to_datetime(subphase_data['start'])
+        self.end = to_datetime(subphase_data['end'])
         self.phase = Phase(subphase_data['phase'])
         self.extended_name = subphase_data['LPName']
 
@@ -195,12 +195,8 @@ class SubPhase:
         Returns:
             dict | None: The subphase data if found, otherwise None.
         """
-        for subphase_name, subphase_data in subphases.items():
-            start = parse(subphase_data["start"],ignoretz=True)
-            end = parse(subphase_data["end"],ignoretz=True)
-            if start <= dt <= end:
-                return subphase_data
-        return None
+        subphase_name = SUBPHASES.find(dt)
+        return subphases[subphase_name] if subphase_name else None
     
     def __str__(self) -> str:
         """
@@ -240,8 +236,8 @@ class SubPhase:
             tb.add_row(phase_name,
                        phase_data['LPName'],
                        phase_data['phase'],
-                       parse(phase_data['start']).strftime(dateFormat),
-                       parse(phase_data['end']).strftime(dateFormat))
+                       to_datetime(phase_data['start']).strftime(dateFormat),
+                       to_datetime(phase_data['end']).strftime(dateFormat))
         return tb
     
     def show(self) -> Table:
@@ -292,7 +288,7 @@ def get_subphases_by_phase(phase_name:str)->list[str]|str:
     Raises:
         ValueError: If no subphases are found for the given phase.
     """
-    elem=[subphase_name for subphase_name, subphase_data in subphases.items() if subphase_data['phase'] == phase_name]
+    elem=SUBPHASES.children.get(phase_name.lower(), [])
     if len(elem)==1:
         return elem[0]
     elif len(elem)==0:
@@ -349,8 +345,7 @@ class Test:
                 if not sub_list:
                     raise ValueError(f"Test {name} not found.")
                 else:
-                    
-                    itm=[tests[testname] for testname in sub_list if compare_str(name, tests[testname]['name'])]
+                    itm=[tests[testname] for testname in TEST_INDEX.search(name, group=subphase)]
                     if len(itm)>1:
                         raise ValueError(f"Multiple tests found for the subphase {subphase}. Please provide detaile the test name.")
                     elif len(itm)==1:
@@ -367,8 +362,8 @@ class Test:
         else:
             raise ValueError("You must provide a test name or a date.")
         self.name = test_data['name']
-        self.start = parse(test_data['start'])
-        self.end = parse(test_data['end'])
+        self.start = to_datetime(test_data['start'])
+        self.end = to_datetime(test_data['end'])
         self.subphase = test_data['subphase']
         
     def _find_test_by_date(self, dt):
@@ -381,13 +376,8 @@ class Test:
         Returns:
             dict | None: The test data if found, otherwise None.
         """
-        for test_name, test_data in tests.items():
-            start = parse(test_data["start"], ignoretz=True)
-            end = parse(test_data["end"], ignoretz=True)
-            # console.print(f"Start: {start}, End: {end}, Date: {dt}")
-            if start <= dt <= end:
-                return test_data
-        return None
+        test_name = TESTS.find(dt)
+        return tests[test_name] if test_name else None
     
     def __str__(self) -> str:
         """
@@ -423,7 +413,7 @@ class Test:
         return tb
     
     @staticmethod
-    def show_all(phase:str=None,subphase:str=None,key:str=None,date:datetime|str=None) -> Table:
+    def show_all(phase:str=None,subphase:str=None,key:str=None,date:datetime|str=None,rank:bool=False) -> Table:
         """
         Displays a table showing all tests that match the provided filters.
 
@@ -432,6 +422,7 @@ class Test:
             subphase (str, optional): The subphase to filter tests by. Defaults to None.
             key (str, optional): A keyword to search within test names. Defaults to None.
             date (datetime | str, optional): A date to filter tests by. Defaults to None.
+            rank (bool, optional): Sort the tests found by ``key`` by relevance instead of table order. Defaults to False.
 
         Returns:
             rich.table.Table: A table displaying the filtered tests.
@@ -445,26 +436,29 @@ class Test:
         if date:
             if isinstance(date, str):
                 date = parse(date, ignoretz=True)
-        for test_name, test_data in tests.items():
+            names = TESTS.at(date)
+        elif key:
+            names = TEST_INDEX.search(key, group=subphase, rank=rank)
+        elif subphase:
+            names = TESTS.children.get(subphase.lower(), [])
+        else:
+            names = list(tests)
+        if phase:
+            phase_subphases = get_subphases_by_phase(phase)
+            if isinstance(phase_subphases, str):
+                phase_subphases = [phase_subphases]
+            phase_subphases = {item.lower() for item in phase_subphases}
+        for test_name in names:
+            test_data = tests[test_name]
             if subphase and not test_data['subphase'].lower() == subphase.lower():
                 continue
 
-            if not date and key:
-                if not compare_str(key, test_data['name']):
-                    continue    
-
-            if date :
-                start = parse(test_data['start'], ignoretz=True)
-                end = parse(test_data['end'], ignoretz=True)
-                if not start <=date <=end:
-                    continue
-            if phase:
-                if not test_data['subphase'].lower() in get_subphases_by_phase(phase):
-                    continue
+            if phase and test_data['subphase'].lower() not in phase_subphases:
+                continue
             tb.add_row(test_data['name'],
                        test_data['subphase'],
-                       parse(test_data['start']).strftime(dateFormat),
-                       parse(test_data['end']).strftime(dateFormat))
+                       to_datetime(test_data['start']).strftime(dateFormat),
+                       to_datetime(test_data['end']).strftime(dateFormat))
         return tb
 
 def get_test_by_subphase(subphase:str)->list[str] | None:
@@ -477,7 +471,7 @@ def get_test_by_subphase(subphase:str)->list[str] | None:
     Returns:
         list[str] | None: A list of test names, or None if no tests are found.
     """
-    elem= [test_name for test_name, test_data in tests.items() if test_data['subphase'].lower() == subphase.lower()]
+    elem= TESTS.children.get(subphase.lower(), [])
     if len(elem)==0:
         return None
     elif len(elem)==1:
@@ -486,6 +480,37 @@ def get_test_by_subphase(subphase:str)->list[str] | None:
         return elem
         
 
+def tag_times(times):
+    """
+    Tags timestamps with the phase, subphase and test containing them.
+
+    The times are located with a single ``np.searchsorted`` over the
+    precomputed segment bounds of each timeline (see ``SimbioReader.timeline``),
+    so millions of timestamps are tagged at once. When intervals overlap the
+    first entry of the table is used, as in the lookups by date.
+
+    Args:
+        times (pd.Series | pd.DatetimeIndex | np.ndarray): The timestamps. Naive
+            times are taken as UTC, time-zone aware ones are converted to UTC.
+
+    Returns:
+        pd.DataFrame: The ``phase``, ``subphase`` and ``test`` columns, as
+        categoricals (missing values where no interval contains the time), with
+        the index of ``times`` if it is a Series.
+    """
+    import pandas as pd
+
+    index = times.index if isinstance(times, pd.Series) else None
+    values = pd.DatetimeIndex(pd.to_datetime(times))
+    if values.tz is not None:
+        values = values.tz_convert("UTC").tz_localize(None)
+    values = values.to_numpy(dtype="datetime64[us]")
+    columns = {}
+    for column, timeline in (("phase", PHASES), ("subphase", SUBPHASES), ("test", TESTS)):
+        columns[column] = pd.Categorical.from_codes(timeline.codes(values), categories=timeline.keys)
+    return pd.DataFrame(columns, index=index)
+
+
 class Filter:
     """
     Represents a filter for a specific channel, either 'HRIC' or 'STC'.
@@ -1,40 +1,57 @@
-import hashlib
+from __future__ import annotations
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from xml.dom.minidom import Document, Element, parse, parseString
+from typing import TYPE_CHECKING
+from xml.dom.minidom import Document, Element
 
 import numpy as np
-import pandas as pd
-from dateutil import parser
-from PIL import Image as im
-from rich.columns import Columns
-from rich.console import Console
-from rich.panel import Panel
-from rich.table import Table
-from update_checker import UpdateChecker
-from PIL import Image as im
-
-from SimbioReader.constants import MSG, data_types
+
+from SimbioReader.cache import LabelCache
+from SimbioReader.constants import MSG, data_types, field_types
 from SimbioReader.exceptions import SizeError
 from SimbioReader.filters_tools import Filter
-from mystrtools import convert_case
+from SimbioReader.label import read_label
+from SimbioReader.stretch import PreviewRenderer
 from SimbioReader.tools import (
+    LabelIndex,
     gen_filename,
     getElement,
+    getElements,
     getValue,
-    lidUpdate,
-    lvidUpdate,
-    pretty_print,
-    updateXML,
+    save_image,
 )
 
-# from SimbioReader.version import version
-from importlib.metadata import version as get_version
-from semantic_version_tools import Vers
+# pandas, PIL, rich, dateutil and update_checker are imported where they are
+# used, so importing the package stays fast
+if TYPE_CHECKING:
+    import pandas as pd
+    from PIL import Image as im
+    from rich.console import Console
+    from rich.panel import Panel
+
+    from SimbioReader.integrity import VerifiedCache
+
 
-version = Vers(get_version("SimbioReader"))
+def _version():
+    # parsed on first use, semantic_version_tools is slow to import
+    if "version" not in globals():
+        from importlib.metadata import version as get_version
 
-__version__ = version.full()
+        from semantic_version_tools import Vers
+
+        vers = Vers(get_version("SimbioReader"))
+        globals().update(version=vers, __version__=vers.full())
+    return globals()["version"]
+
+
+def __getattr__(name: str):
+    if name in ("version", "__version__"):
+        _version()
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class Detector:
@@ -45,7 +62,7 @@ class Detector:
     in a SIMBIO-SYS image, such as the first line, first sample, and number of lines.
 
     Args:
-        dat (Element): An XML Element containing the detector information.
+        dat (Element | dict | LabelIndex): An XML Element, label model or LabelIndex containing the detector information.
 
     Attributes:
         first_line (int): The first line number of the detector.
@@ -53,7 +70,7 @@ class Detector:
         lines (int): The number of lines in the detector.
     """
 
-    def __init__(self, dat: Element) -> None:
+    def __init__(self, dat: Element | dict | LabelIndex) -> None:
         detector = getElement(dat, "img:Subframe")
         self.first_line = int(getValue(detector, "img:first_line"))
         self.first_sample = int(getValue(detector, "img:first_sample"))
@@ -87,6 +104,9 @@ class Detector:
         Returns:
             Panel: A Panel object containing the formatted detector information.
         """
+        from rich.panel import Panel
+        from rich.table import Table
+
         sep = " = "
         dt = Table.grid()
         dt.add_column(style="yellow", justify="right")
@@ -110,7 +130,7 @@ class DataStructure:
     configuration, based on an XML Element.
 
     Args:
-        dat (Element): An XML Element containing the data structure information.
+        dat (Element | dict | LabelIndex): An XML Element, label model or LabelIndex containing the data structure information.
         channel (str): The channel identifier (e.g., 'HRIC', 'STC', 'VIHI').
 
     Attributes:
@@ -120,34 +140,60 @@ class DataStructure:
         axes (int): The number of axes in the data structure.
         band (int): The band information (default is 1).
         data_type (str): The type of data (e.g., 'UnsignedLSB2', 'IEEE754LSBSingle').
+        axis_names (list[str]): The axis names in storage order, from the slowest
+            to the fastest varying (e.g. ``['line', 'sample']``).
+        scaling_factor (float): The scaling factor of the stored values (1 if not given).
+        value_offset (float): The offset of the stored values (0 if not given).
 
     """
 
-    def __init__(self, dat: Element, channel: str):
+    def __init__(self, dat: Element | dict | LabelIndex, channel: str):
         # fao=getElement(dat,'File_Area_Observational')
+        from dateutil import parser
+
         fl = getElement(dat, "File")
         self.creation_time = parser.parse(getValue(fl, "creation_date_time"))
         self.file_size = int(getValue(fl, "file_size"))
         self.md5 = getValue(fl, "md5_checksum")
+        self.offset = int(getValue(dat, "offset"))
         self.axes = int(getValue(dat, "axes"))
         self.band = None
+        self.axis_names = []
         if self.axes == 3 and channel != "vihi":
             raise ValueError("The number of axes is wrong for the channel")
         for i in range(self.axes):
             axis = getElement(dat, "Axis_Array", i)
-            setattr(
-                self,
-                getValue(axis, "axis_name").lower(),
-                int(getValue(axis, "elements")),
-            )
+            name = getValue(axis, "axis_name").lower()
+            self.axis_names.append(name)
+            setattr(self, name, int(getValue(axis, "elements")))
         if self.axes == 3:
             dat = getElement(dat, "Array_3D_Spectrum")
         elif self.axes == 2:
             dat = getElement(dat, "Array_2D_Image")
         self.data_type = getValue(dat, "data_type")
+        try:
+            self.scaling_factor = float(getValue(dat, "scaling_factor"))
+        except IndexError:
+            self.scaling_factor = 1.0
+        try:
+            self.value_offset = float(getValue(dat, "value_offset"))
+        except IndexError:
+            self.value_offset = 0.0
         if self.band is None:
             self.band = 1
 
+    @property
+    def interleave(self) -> str | None:
+        """The band interleave of a 3D product, from the storage order of the axes.
+
+        Returns:
+            str | None: ``'BSQ'`` (band, line, sample), ``'BIL'`` (line, band,
+            sample) or ``'BIP'`` (line, sample, band); None for 2D products.
+        """
+        if "band" not in self.axis_names:
+            return None
+        return {0: "BSQ", 1: "BIL", 2: "BIP"}[self.axis_names.index("band")]
+
     def __str__(self) -> str:
         """
         Returns a string representation of the Datastructure.
@@ -173,6 +219,9 @@ class DataStructure:
         Returns:
             Panel: A rich Panel object containing the formatted table of data structure information.
         """
+        from rich.panel import Panel
+        from rich.table import Table
+
         sep = " = "
         dt = Table.grid()
         dt.add_column(style="yellow", justify="right")
@@ -192,7 +241,9 @@ class HK:
     A class representing housekeeping data for a SIMBIO-SYS image.
 
     This class initializes various attributes from a pandas DataFrame containing
-    housekeeping data and provides methods to display this information.
+    housekeeping data and provides methods to display this information. The
+    values of the first record are also available as attributes, named after
+    the columns in lower case (the index included, if named).
 
     Args:
         df (pd.DataFrame): A pandas DataFrame containing housekeeping data.
@@ -201,6 +252,8 @@ class HK:
         df (pd.DataFrame): The DataFrame containing housekeeping data.
     """
 
+    time_column = "ACQUISITION_TIME_UTC"
+
     def __init__(self, df: pd.DataFrame):
         """
         Initializes the HK object by extracting information from the DataFrame.
@@ -209,6 +262,8 @@ class HK:
             df (pd.DataFrame): A pandas DataFrame containing housekeeping data.
         """
         self.df = df
+        if df.index.name is not None:
+            setattr(self, df.index.name.strip().lower(), df.index[0])
         for i in df.columns:
             if type(df[i].values[0]) is str:
                 val = df[i].values[0].strip()
@@ -216,6 +271,65 @@ class HK:
                 val = df[i].values[0]
             setattr(self, i.strip().lower(), val)
 
+    @classmethod
+    def from_csv(cls, file_name: Path, fields: list | None = None, engine: str | None = None) -> "HK":
+        """Reads the housekeeping CSV as a typed time series.
+
+        The column types are taken from the ``Field_Character`` definitions of
+        the label, matched by ``field_number``, so the file is parsed once with
+        the final dtypes. The acquisition time becomes a UTC ``DatetimeIndex``,
+        the integers are downcast to the smallest type holding them and the
+        padded strings are stripped and stored as categoricals.
+
+        Args:
+            file_name (Path): The CSV file.
+            fields (list | None, optional): The ``Field_Character`` blocks of the
+                table. Without them the types are inferred. Defaults to None.
+            engine (str | None, optional): The ``pd.read_csv`` engine. Defaults to
+                ``'pyarrow'`` when pyarrow is installed, else ``'c'``.
+
+        Returns:
+            HK: The housekeeping object.
+        """
+        import pandas as pd
+
+        if engine is None:
+            try:
+                import pyarrow  # noqa: F401
+
+                engine = "pyarrow"
+            except ImportError:
+                engine = "c"
+        with open(file_name) as fl:
+            names = [name.strip() for name in fl.readline().split(",")]
+        dtype = {}
+        dates = []
+        for field in fields or []:
+            name = names[int(getValue(field, "field_number")) - 1]
+            kind = getValue(field, "data_type")
+            if kind in field_types and field_types[kind] is None:
+                dates.append(name)
+            elif kind in field_types:
+                dtype[name] = field_types[kind]
+        if not fields and cls.time_column in names:
+            dates.append(cls.time_column)
+        options = {} if engine == "pyarrow" else {"skipinitialspace": True}
+        df = pd.read_csv(
+            file_name, skiprows=1, names=names, dtype=dtype, engine=engine, **options
+        )
+        for name in df.columns:
+            col = df[name]
+            if name in dates:
+                # the engines infer different resolutions, the times have microseconds
+                df[name] = pd.to_datetime(col, utc=True).dt.as_unit("us")
+            elif pd.api.types.is_integer_dtype(col):
+                df[name] = pd.to_numeric(col, downcast="integer")
+            elif pd.api.types.is_string_dtype(col) or col.dtype == object:
+                df[name] = col.str.strip().astype("category")
+        if cls.time_column in dates:
+            df = df.set_index(cls.time_column)
+        return cls(df)
+
     def show(self) -> Panel:
         """
         Displays the housekeeping information in a formatted table.
@@ -223,11 +337,19 @@ class HK:
         Returns:
             Panel: A Panel object containing the formatted housekeeping information.
         """
+        from rich.panel import Panel
+        from rich.table import Table
+        from mystrtools import convert_case
+
         sep = " = "
         dt = Table.grid()
         dt.add_column(style="yellow", justify="right")
         dt.add_column()
         dt.add_column(style="cyan", justify="left")
+        if self.df.index.name is not None:
+            dt.add_row(
+                convert_case(self.df.index.name, "space").title(), sep, f"{self.df.index[0]}"
+            )
         for i in self.df.columns:
             dt.add_row(
                 convert_case(i,"space").title(), sep, f"{self.df[i].values[0]}".strip()
@@ -261,6 +383,9 @@ class Target:
         # other attributes will be added after the integration of the observation log in the PDS label
 
     def show(self):
+        from rich.panel import Panel
+        from rich.table import Table
+
         sep = " =  "
         tb = Table.grid()
         tb.add_column(style="yellow", justify="right")
@@ -277,21 +402,40 @@ class Target:
         return self.__str__()
 
 
+def _line_first(array: np.ndarray, axis_names: list[str]) -> np.ndarray:
+    """Transposes an array stored with ``axis_names`` to ``(line, sample, band)`` order."""
+    order = [
+        axis_names.index(name)
+        for name in ("line", "sample", "band")
+        if name in axis_names
+    ]
+    return array.transpose(order)
+
+
 class SimbioObject:
     def __init__(
         self,
         file_name: str,
         channel: str,
-        imaging: Element,
-        geometry: Element,
-        file_obs: Element,
+        imaging: Element | dict | LabelIndex,
+        geometry: Element | dict | LabelIndex,
+        file_obs: Element | dict | LabelIndex,
         filter_name: Path | str | None = None,
-        console: Console= Console(),
+        console: Console | None = None,
         debug: bool = False,
         verbose: bool = False,
+        lazy: bool = False,
+        load_pixels: bool = True,
+        native_byteorder: bool = False,
     ):
+        if console is None:
+            from rich.console import Console
+
+            console = Console()
         self.console = console
         self.file_name = Path(file_name)
+        self.lazy = lazy
+        self._img = None
         self.filter_name = filter_name
         self.channel = channel
         self.imaging = imaging
@@ -315,12 +459,14 @@ class SimbioObject:
                 channel=self.channel, name=getValue(flt, "img:filter_name")
             )
         self.detector = Detector(imaging)
-        if self.data_structure.data_type == "UnsignedLSB2":
-            dtype = np.int16
-        elif self.data_structure.data_type == "IEEE754LSBSingle":
-            dtype = np.float32
+        if self.data_structure.data_type not in data_types:
+            raise ValueError(
+                f"Unsupported data type '{self.data_structure.data_type}' in {self.file_name.name}"
+            )
+        self.dtype = np.dtype(data_types[self.data_structure.data_type]["dtype"])
+        self.native_byteorder = native_byteorder
 
-        if verbose:
+        if verbose and load_pixels:
             console.print(f"{MSG.INFO}Loading: {self.file_name}")
             if self.data_structure.axes == 3:
                 console.print(
@@ -344,31 +490,274 @@ class SimbioObject:
             console.print(f"{MSG.INFO}Computed File Size: {imgSize}")
             if self.file_name.stat().st_size * 8 != imgSize:
                 raise SizeError(self.file_name.stat().st_size * 8, imgSize)
-        # print(img_data['samples'],img_data['lines'],img_data['bands'])
+        if load_pixels and not lazy:
+            self._img = self._read_img()
+            if verbose:
+                self.console.print(
+                    f"{MSG.INFO}Dimension of the old image array: {self._img.ndim}"
+                )
+
+    @property
+    def shape(self) -> tuple:
+        """Shape of the image array as exposed by ``img``."""
         if self.data_structure.axes == 3:
-            self.img = np.fromfile(
+            if self.lines == 1:
+                return (self.samples, self.bands)
+            return (self.lines, self.samples, self.bands)
+        return (self.samples, self.lines)
+
+    @property
+    def img(self) -> np.ndarray:
+        """The pixel array.
+
+        In lazy mode the array is a read-only ``np.memmap`` created on first
+        access, so only the pages actually touched are read from disk. When the
+        object was created with ``load_pixels=False`` the data file is read
+        here, on first access.
+        """
+        if self._img is None:
+            self._img = self._read_img()
+        return self._img
+
+    @img.setter
+    def img(self, value: np.ndarray) -> None:
+        self._img = value
+
+    def _read_img(self) -> np.ndarray:
+        """Reads the data file, memory-mapping it when the object is lazy.
+
+        The array has the byte order of the file: it is swapped, in place, to
+        the native order only when ``native_byteorder`` is set and the object
+        is not lazy (a memmap is always in the file order).
+        """
+        if self.lazy:
+            return np.memmap(
                 self.file_name,
-                dtype=dtype,
-                count=self.samples * self.lines * self.bands,
+                dtype=self.dtype,
+                mode="r",
+                offset=self.data_structure.offset,
+                shape=self.shape,
             )
+        img = np.fromfile(
+            self.file_name,
+            dtype=self.dtype,
+            count=int(np.prod(self.shape)),
+            offset=self.data_structure.offset,
+        )
+        img.shape = self.shape
+        if self.native_byteorder and not self.dtype.isnative:
+            img = img.byteswap(inplace=True).view(self.dtype.newbyteorder("="))
+        return img
+
+    def img_physical(
+        self,
+        dtype: np.dtype = np.float32,
+        out: np.ndarray | None = None,
+        chunk_size: int = 1024**2,
+    ) -> np.ndarray:
+        """Returns the image in physical units, ``img * scaling_factor + value_offset``.
+
+        The values are converted and scaled in blocks of ``chunk_size``
+        elements directly into the output array, so no full-size temporary
+        (and no float64 array) is created. When ``img`` is not loaded the data
+        file is memory-mapped. A ``scaling_factor`` of 0, written by the
+        pipeline for the unscaled arrays, is taken as 1.
+
+        Args:
+            dtype (np.dtype, optional): The output data type. Defaults to np.float32.
+            out (np.ndarray | None, optional): The array to fill, with the shape of
+                ``img``; passing ``img`` itself (float) scales it in place.
+                Defaults to None.
+            chunk_size (int, optional): Elements processed at a time.
+                Defaults to 1 Mi.
+
+        Returns:
+            np.ndarray: The scaled image, with the shape of ``img``.
+
+        Raises:
+            ValueError: If ``out`` is not contiguous or has the wrong shape.
+        """
+        ds = self.data_structure
+        scale = ds.scaling_factor or 1.0
+        if self._img is not None:
+            raw = self._img
         else:
-            self.img = np.fromfile(
-                self.file_name, dtype=dtype, count=self.samples * self.lines
+            raw = np.memmap(
+                self.file_name, dtype=self.dtype, mode="r",
+                offset=ds.offset, shape=self.shape,
             )
-        if self.data_structure.axes == 3:
-            if self.lines == 1:
-                self.img.shape = (self.samples, self.bands)
-            else:
-                self.img.shape = (self.lines, self.samples, self.bands)
-        else:
-            self.img.shape = (self.samples, self.lines)
-        if verbose:
-            self.console.print(
-                f"{MSG.INFO}Dimension of the old image array: {self.img.ndim}"
+        if out is None:
+            out = np.empty(self.shape, dtype=dtype)
+        elif out.shape != self.shape or not out.flags.c_contiguous:
+            raise ValueError(
+                f"The output array must be C-contiguous with shape {self.shape}"
             )
-            # print(f"Size of the old image array: {self.img.size}")
+        src = raw.reshape(-1)
+        dst = out.reshape(-1)
+        for start in range(0, src.size, chunk_size):
+            block = dst[start : start + chunk_size]
+            np.multiply(
+                src[start : start + chunk_size], scale,
+                out=block, dtype=block.dtype, casting="unsafe",
+            )
+            if ds.value_offset:
+                np.add(block, ds.value_offset, out=block, dtype=block.dtype, casting="unsafe")
+        return out
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        """NumPy array protocol: ``np.asarray(obj)`` returns ``img`` without copying.
+
+        Raises:
+            ValueError: If ``copy=False`` and a different ``dtype`` is requested.
+        """
+        img = self.img
+        if dtype is not None and np.dtype(dtype) != img.dtype:
+            if copy is False:
+                raise ValueError("A copy is needed to change the data type")
+            return img.astype(dtype)
+        return img.copy() if copy else img
+
+    def _disk_view(self) -> np.memmap:
+        """Read-only memmap of the data file with the axes in storage order."""
+        ds = self.data_structure
+        return np.memmap(
+            self.file_name,
+            dtype=self.dtype,
+            mode="r",
+            offset=ds.offset,
+            shape=tuple(getattr(ds, name) for name in ds.axis_names),
+        )
+
+    def read_window(
+        self,
+        lines: slice | int | None = None,
+        samples: slice | int | None = None,
+        bands: slice | int | None = None,
+    ) -> np.ndarray:
+        """Reads a window of the data file without loading the whole image.
+
+        The file is memory-mapped with the layout described by the label, so
+        only the pages holding the requested rows are read from disk.
+
+        Args:
+            lines (slice | int | None, optional): The lines to read. Defaults to all.
+            samples (slice | int | None, optional): The samples to read. Defaults to all.
+            bands (slice | int | None, optional): The bands to read (VIHI only).
+                Defaults to all.
+
+        Returns:
+            np.ndarray: A copy of the window, with the axes in the label order
+            (e.g. ``(line, sample)`` for STC and HRIC).
+
+        Raises:
+            ValueError: If ``bands`` is given for a 2D product.
+        """
+        selection = {"line": lines, "sample": samples, "band": bands}
+        axis_names = self.data_structure.axis_names
+        if bands is not None and "band" not in axis_names:
+            raise ValueError("The product has no band axis")
+        index = tuple(
+            slice(None) if selection[name] is None else selection[name]
+            for name in axis_names
+        )
+        return np.array(self._disk_view()[index])
+
+    def get_bands(self, bands: int | slice | list[int]) -> np.ndarray:
+        """Reads a subset of the bands of a VIHI cube.
+
+        Only the requested bands are read: with a BSQ file they are contiguous
+        planes, with BIL and BIP files the memmap view is strided over the
+        file, whatever the interleave declared in the label.
+
+        Args:
+            bands (int | slice | list[int]): The band, or bands, to read.
+
+        Returns:
+            np.ndarray: The ``(line, sample, band)`` array, or the
+            ``(line, sample)`` image if a single band is given as ``int``.
+
+        Raises:
+            ValueError: If the product has no band axis.
+        """
+        axis_names = self.data_structure.axis_names
+        if "band" not in axis_names:
+            raise ValueError("The product has no band axis")
+        index = tuple(
+            bands if name == "band" else slice(None) for name in axis_names
+        )
+        names = [
+            name for name in axis_names if name != "band" or not isinstance(bands, int)
+        ]
+        return np.array(_line_first(self._disk_view()[index], names))
+
+    def get_spectrum(self, line: int, sample: int) -> np.ndarray:
+        """Reads the full spectrum of a pixel of a VIHI cube.
+
+        Args:
+            line (int): The line of the pixel.
+            sample (int): The sample of the pixel.
+
+        Returns:
+            np.ndarray: The 1D array of the values of all the bands.
+
+        Raises:
+            ValueError: If the product has no band axis.
+        """
+        if self.data_structure.interleave is None:
+            raise ValueError("The product has no band axis")
+        return self.read_window(lines=line, samples=sample)
+
+    def _read_lines(self, start: int, stop: int) -> np.ndarray:
+        """Reads the lines ``[start, stop)`` in ``(line, sample[, band])`` order."""
+        axis_names = self.data_structure.axis_names
+        index = tuple(
+            slice(start, stop) if name == "line" else slice(None) for name in axis_names
+        )
+        return np.array(_line_first(self._disk_view()[index], axis_names))
+
+    def iter_chunks(self, lines_per_chunk: int = 64, prefetch: bool = True):
+        """Iterates over the image in blocks of lines.
+
+        Only one block (two with ``prefetch``) is held in memory at a time, so
+        a segment of any size is processed with a fixed memory ceiling. With
+        ``prefetch`` the next block is read in a background thread while the
+        current one is being processed.
+
+        Args:
+            lines_per_chunk (int, optional): Lines in each block. Defaults to 64.
+            prefetch (bool, optional): Read ahead the next block. Defaults to True.
+
+        Yields:
+            tuple[int, np.ndarray]: The first line of the block and the block,
+            in ``(line, sample[, band])`` order.
+
+        Raises:
+            ValueError: If ``lines_per_chunk`` is not positive.
+        """
+        if lines_per_chunk < 1:
+            raise ValueError("lines_per_chunk must be a positive number")
+        starts = range(0, self.data_structure.line, lines_per_chunk)
+
+        def read(start):
+            return self._read_lines(start, start + lines_per_chunk)
+
+        if not prefetch:
+            for start in starts:
+                yield start, read(start)
+            return
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            pending = executor.submit(read, starts[0]) if starts else None
+            for i, start in enumerate(starts):
+                chunk = pending.result()
+                if i + 1 < len(starts):
+                    pending = executor.submit(read, starts[i + 1])
+                yield start, chunk
 
     def show(self) -> Panel:
+        from rich.columns import Columns
+        from rich.panel import Panel
+        from rich.table import Table
+
         sep = " =  "
         tb = Table.grid()
         tb.add_column(style="yellow", justify="right")
@@ -401,25 +790,90 @@ class SimbioObject:
     def __repr__(self):
         return self.__str__()
 
+    def build_pyramid(
+        self,
+        out: Path | str,
+        levels: int | None = None,
+        tile: int = 256,
+        stretch: str = "percentile",
+        band: int = 0,
+        renderer: PreviewRenderer | None = None,
+    ) -> list[tuple[int, int]]:
+        """Writes the multi-resolution tiled preview of the image.
+
+        The image, in ``(line, sample)`` order, is read once and converted to
+        8 bit; each level is the 2x2 block mean of the previous one, rounded to
+        8 bit only when written. See ``SimbioReader.pyramid``.
+
+        Args:
+            out (Path | str): A folder (``<zoom>/<column>/<row>.png``) or a
+                ``.mbtiles`` file.
+            levels (int | None, optional): Number of levels, full resolution
+                included. Defaults to the levels needed to fit in one tile.
+            tile (int, optional): The tile size. Defaults to 256.
+            stretch (str, optional): The contrast stretch. Defaults to 'percentile'.
+            band (int, optional): The band of a VIHI cube. Defaults to 0.
+            renderer (PreviewRenderer | None, optional): The renderer to use in
+                place of a new one for ``stretch``. Defaults to None.
+
+        Returns:
+            list[tuple[int, int]]: The shape of each level, from the full resolution.
+        """
+        from SimbioReader.pyramid import write_pyramid
+
+        if renderer is None:
+            renderer = PreviewRenderer(stretch)
+        if self.data_structure.interleave is not None:
+            image = self.get_bands(band)
+        else:
+            image = self.read_window()
+        return write_pyramid(
+            renderer(image).copy(), out, levels=levels, tile=tile,
+            name=gen_filename(self.file_name).name,
+        )
+
     def savePreview(
         self,
         img_type: str = "png",
         quality: int = 100,
         outFolder: Path = None,
         tree: Document = None,
+        stretch: str | None = None,
+        renderer: PreviewRenderer | None = None,
     ) -> str | None:
+        """Saves the preview image of the data file.
+
+        Args:
+            img_type (str, optional): 'png', 'tif' or 'jpg'. Defaults to 'png'.
+            quality (int, optional): The image quality. Defaults to 100.
+            outFolder (Path, optional): The output folder. Defaults to None.
+            tree (Document, optional): The browse label; if given the
+                ``File_Area_Browse`` of the preview is returned. Defaults to None.
+            stretch (str | None, optional): The contrast stretch to 8 bit (see
+                ``SimbioReader.stretch``); None saves the stored values.
+                Defaults to None.
+            renderer (PreviewRenderer | None, optional): The renderer to use in
+                place of a new one for ``stretch``, to reuse its buffer.
+                Defaults to None.
+        """
+        from PIL import Image as im
+
         new_filename = gen_filename(self.file_name)
+        if renderer is None and stretch is not None:
+            renderer = PreviewRenderer(stretch)
         if img_type in ["png", "tif"]:
-            data = im.fromarray(self.img)
+            if renderer is not None:
+                data = im.fromarray(renderer(self.img))
+            else:
+                data = im.fromarray(self.img)
             image_file = f"{outFolder}/{new_filename}.{img_type}"
             if self.debug:
                 self.console.print(
                     f"{MSG.DEBUG}Saving image {Path(image_file).name} with quality {quality}"
                 )
-            if "cal" in self.file_name.stem:
-                data.convert("RGB").save(image_file, quality=quality)
-            else:
-                data.save(image_file, quality=quality)
+            if renderer is None and "cal" in self.file_name.stem:
+                data = data.convert("RGB")
+            size, md5 = save_image(data, image_file, quality=quality)
             if tree:
                 fab = tree.createElement("File_Area_Browse")
                 fl = tree.createElement("File")
@@ -431,17 +885,11 @@ class SimbioObject:
                 fl_ct.appendChild(tree.createTextNode(creatTime.strftime("%Y-%m-%d")))
                 fl.appendChild(fl_ct)
                 fl_fs = tree.createElement("file_size")
-                fl_fs.appendChild(
-                    tree.createTextNode(str(Path(image_file).stat().st_size))
-                )
+                fl_fs.appendChild(tree.createTextNode(str(size)))
                 fl_fs.setAttribute("unit", "byte")
                 fl.appendChild(fl_fs)
                 fl_md5 = tree.createElement("md5_checksum")
-                fl_md5.appendChild(
-                    tree.createTextNode(
-                        hashlib.md5(open(image_file, "rb").read()).hexdigest()
-                    )
-                )
+                fl_md5.appendChild(tree.createTextNode(md5))
                 fl.appendChild(fl_md5)
                 fab.appendChild(fl)
 
@@ -457,12 +905,35 @@ class SimbioObject:
                 fab.appendChild(enc_img)
                 return fab
         elif img_type == "jpg":
-            data = im.fromarray(self.img, mode="L")
+            if renderer is not None:
+                data = im.fromarray(renderer(self.img))
+            else:
+                data = im.fromarray(self.img, mode="L")
             # print(data.getpixel((50,50)))
-            data.save(f"{outFolder}/{new_filename}.{img_type}", quality=quality)
+            save_image(data, f"{outFolder}/{new_filename}.{img_type}", quality=quality)
         # print(self.img[0,0])
 
 
+class LockedConsole:
+    """
+    A proxy of a rich Console that serializes the output of concurrent threads.
+
+    Args:
+        console (Console): The console to protect.
+    """
+
+    def __init__(self, console: Console) -> None:
+        self.console = console
+        self._lock = threading.RLock()
+
+    def print(self, *args, **kwargs) -> None:
+        with self._lock:
+            self.console.print(*args, **kwargs)
+
+    def __getattr__(self, name: str):
+        return getattr(self.console, name)
+
+
 class Data:
     def __init__(
         self,
@@ -475,12 +946,21 @@ class Data:
         debug: bool = False,
         verbose: bool = False,
         console=None,
+        lazy: bool = False,
+        load_pixels: bool = True,
+        workers: int = 1,
+        native_byteorder: bool = False,
     ):
+        from rich.console import Console
+
         if console is None:
             self.console = Console()
         else:
             self.console = console
+        if workers > 1 and not isinstance(self.console, LockedConsole):
+            self.console = LockedConsole(self.console)
         self.channel = channel
+        self.source_path = source_path
         if self.channel == "vihi":
             self.segments = []
             self.seg_number = 0
@@ -490,6 +970,8 @@ class Data:
         self.items_number = len(file_obs)
 
         self.level = level
+        # attribute name and arguments of each SimbioObject, in label order
+        items = []
         for i, fo in enumerate(file_obs):
             file_name = source_path.joinpath(getValue(fo, "file_name"))
             if verbose or debug:
@@ -502,49 +984,177 @@ class Data:
                 # read CSV file
                 if verbose or debug:
                     self.console.print(f"{MSG.INFO}Reading CSV file: {file_name}")
-                df = pd.read_csv(file_name, sep=",", header=0)
-                self.hk = HK(df)
+                self.hk = HK.from_csv(
+                    file_name, fields=getElements(fo, "Field_Character")
+                )
             elif file_name.suffix.lower() in [".qub", ".dat"]:
+                kwargs = dict(
+                    file_name=file_name,
+                    channel=channel,
+                    imaging=imaging[i],
+                    geometry=geometry[i],
+                    file_obs=file_obs[i],
+                    console=self.console,
+                    debug=debug,
+                    verbose=verbose,
+                    lazy=lazy,
+                    load_pixels=load_pixels,
+                    native_byteorder=native_byteorder,
+                )
                 if channel in ["stc", "hric"]:
                     filter = getValue(imaging[i], "img:filter_name")
                     self.filters.append(filter.lower())
-                    setattr(
-                        self,
-                        f"filter_{filter.lower()}",
-                        SimbioObject(
-                            file_name,
-                            filter_name=filter,
-                            channel=channel,
-                            imaging=imaging[i],
-                            geometry=geometry[i],
-                            file_obs=file_obs[i],
-                            console=self.console,
-                            debug=debug,
-                            verbose=verbose,
-                        ),
-                    )
+                    items.append((f"filter_{filter.lower()}", dict(kwargs, filter_name=filter)))
 
                     if debug:
                         self.console.print(f"{MSG.DEBUG}Found filter: {filter}")
-                    pass
                 else:
                     self.seg_number += 1
                     self.segments.append(f"segment_{self.seg_number:03}")
-                    setattr(
-                        self,
-                        f"segment_{self.seg_number:03}",
-                        SimbioObject(
-                            file_name,
-                            channel=channel,
-                            imaging=imaging[i],
-                            geometry=geometry[i],
-                            file_obs=file_obs[i],
-                            console=self.console,
-                            debug=debug,
-                            verbose=verbose,
-                        ),
-                    )
-                    pass
+                    items.append((f"segment_{self.seg_number:03}", kwargs))
+
+        if workers > 1 and len(items) > 1:
+            # np.fromfile releases the GIL, so the reads overlap; map keeps the order
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                objects = list(
+                    executor.map(lambda item: SimbioObject(**item[1]), items)
+                )
+        else:
+            objects = [SimbioObject(**kwargs) for _, kwargs in items]
+        for (name, _), obj in zip(items, objects):
+            setattr(self, name, obj)
+
+    def _first_line(self) -> int:
+        """Returns the lowest ``first_line`` of the VIHI segments.
+
+        Raises:
+            ValueError: If the product has no image segments.
+        """
+        if not self.segments:
+            raise ValueError(f"The product {self.source_path.name} has no image segments")
+        return min(getattr(self, item).detector.first_line for item in self.segments)
+
+    def iter_chunks(self, lines_per_chunk: int = 64, prefetch: bool = True):
+        """Iterates over all the segments (VIHI) or filters, in label order, in
+        blocks of lines.
+
+        Args:
+            lines_per_chunk (int, optional): Lines in each block. Defaults to 64.
+            prefetch (bool, optional): Read ahead the next block of each item in
+                a background thread. Defaults to True.
+
+        Yields:
+            tuple[str, int, np.ndarray]: The segment or filter attribute name,
+            the first line of the block and the block. The lines of the VIHI
+            segments are placed by the ``first_line`` of their ``Detector`` and
+            counted from the lowest one, as in ``assemble_cube``; the lines of
+            a filter from the start of its image.
+
+        Raises:
+            ValueError: If a VIHI product has no image segments.
+        """
+        if self.channel == "vihi":
+            items = self.segments
+            first = self._first_line()
+        else:
+            items = [f"filter_{item}" for item in self.filters]
+        for item in items:
+            obj = getattr(self, item)
+            offset = obj.detector.first_line - first if self.channel == "vihi" else 0
+            for start, chunk in obj.iter_chunks(lines_per_chunk, prefetch=prefetch):
+                yield item, offset + start, chunk
+
+    def assemble_cube(
+        self,
+        out: np.ndarray | None = None,
+        memmap_path: Path | str | None = None,
+        lines_per_chunk: int = 256,
+    ) -> np.ndarray:
+        """Mosaics the VIHI segments in a single ``(line, sample, band)`` cube.
+
+        The extent of the cube is computed from the ``first_line`` of the
+        ``Detector`` of each segment; the cube is allocated once and each
+        segment is streamed into its lines in blocks, so no segment is ever
+        fully loaded. Lines not covered by any segment are zero in a newly
+        allocated cube and left untouched in ``out``.
+
+        Args:
+            out (np.ndarray | None, optional): The array to fill. It must have the
+                shape of the cube. Defaults to None.
+            memmap_path (Path | str | None, optional): Allocate the cube as an
+                ``.npy`` memmap on disk, for cubes larger than the memory.
+                Defaults to None.
+            lines_per_chunk (int, optional): Lines copied at a time. Defaults to 256.
+
+        Returns:
+            np.ndarray: The cube; its first line is the lowest ``first_line``.
+
+        Raises:
+            ValueError: If the channel is not VIHI, if the product has no image
+                segments, if the segments have different samples or bands, or if
+                ``out`` has the wrong shape.
+        """
+        if self.channel != "vihi":
+            raise ValueError("Only the VIHI segments can be assembled in a cube")
+        first = self._first_line()
+        segments = [getattr(self, item) for item in self.segments]
+        if len({(obj.data_structure.sample, obj.data_structure.band) for obj in segments}) > 1:
+            raise ValueError("The VIHI segments have different samples or bands")
+        last = max(obj.detector.first_line + obj.data_structure.line for obj in segments)
+        ds = segments[0].data_structure
+        shape = (last - first, ds.sample, ds.band)
+        if out is None:
+            if memmap_path is not None:
+                out = np.lib.format.open_memmap(
+                    memmap_path, mode="w+", dtype=segments[0].dtype, shape=shape
+                )
+            else:
+                out = np.zeros(shape, dtype=segments[0].dtype)
+        elif out.shape != shape:
+            raise ValueError(f"The output array must have shape {shape}, not {out.shape}")
+        for obj in segments:
+            base = obj.detector.first_line - first
+            for start, chunk in obj.iter_chunks(lines_per_chunk):
+                out[base + start : base + start + chunk.shape[0]] = chunk
+        if isinstance(out, np.memmap):
+            out.flush()
+        return out
+
+    def build_pyramids(
+        self,
+        out: Path | str,
+        levels: int | None = None,
+        tile: int = 256,
+        mbtiles: bool = False,
+        stretch: str = "percentile",
+    ) -> dict:
+        """Writes the tiled preview of each segment or filter, in label order.
+
+        Args:
+            out (Path | str): The output folder; each item gets a folder, or a
+                ``.mbtiles`` file, named after its browse file name.
+            levels (int | None, optional): Number of levels. Defaults to None.
+            tile (int, optional): The tile size. Defaults to 256.
+            mbtiles (bool, optional): Write MBTiles files. Defaults to False.
+            stretch (str, optional): The contrast stretch. Defaults to 'percentile'.
+
+        Returns:
+            dict: The output path of each item.
+        """
+        renderer = PreviewRenderer(stretch)
+        if self.channel == "vihi":
+            items = self.segments
+        else:
+            items = [f"filter_{item}" for item in self.filters]
+        paths = {}
+        for item in items:
+            obj = getattr(self, item)
+            path = Path(out) / gen_filename(obj.file_name)
+            if mbtiles:
+                path = path.with_name(f"{path.name}.mbtiles")
+            obj.build_pyramid(path, levels=levels, tile=tile, renderer=renderer)
+            paths[item] = path
+        return paths
 
     def savePreview(
         self,
@@ -552,7 +1162,10 @@ class Data:
         quality: int = 100,
         outFolder: Path = None,
         tree: Document = None,
+        stretch: str | None = None,
     ) -> str | None:
+        # one renderer for all the items, so its output buffer is reused
+        renderer = PreviewRenderer(stretch) if stretch is not None else None
         if self.channel == "vihi":
             seg_prevs = []
             for item in self.segments:
@@ -563,6 +1176,8 @@ class Data:
                         quality=quality,
                         outFolder=outFolder,
                         tree=tree,
+                        stretch=stretch,
+                        renderer=renderer,
                     )
                 )
             return seg_prevs
@@ -576,6 +1191,8 @@ class Data:
                         quality=quality,
                         outFolder=outFolder,
                         tree=tree,
+                        stretch=stretch,
+                        renderer=renderer,
                     )
                 )
             return filter_prevs
@@ -595,8 +1212,17 @@ class SimbioReader:
         verbose: bool = False,
         console=None,
         updateCheck: bool = True,
+        lazy: bool = False,
+        load_pixels: bool = True,
+        backend: str = "etree",
+        cache: LabelCache | bool = False,
+        workers: int = 1,
+        native_byteorder: bool = False,
     ):
         # Initialize the SimbioReader with a file path and optional console for output
+        from dateutil import parser
+        from rich.console import Console
+
         self.pdsLabel: Path | None = None
         self.debug = debug
         if console is None:
@@ -604,11 +1230,10 @@ class SimbioReader:
         else:
             self.console = console
         if updateCheck:
-            checker = UpdateChecker()
-            result = checker.check("SimbioReader", version.short())
-            if result:
-                # TODO: Check this part after the delivery on pypi.org
-                self.console.print(result)
+            from SimbioReader.update import check_in_background
+
+            # once per process, in a daemon thread, answer cached on disk
+            check_in_background(self.console, _version().short())
 
         if debug:
             self.console.print(
@@ -629,7 +1254,16 @@ class SimbioReader:
 
         if verbose or debug:
             self.console.print(f"{MSG.INFO}Reading PDS label file: {self.pdsLabel}")
-        label = parse(self.pdsLabel.as_posix())
+        if cache is True:
+            cache = LabelCache()
+        model = cache.get(self.pdsLabel) if cache else None
+        if model is None:
+            model = read_label(self.pdsLabel, backend=backend)
+            if cache:
+                cache.put(self.pdsLabel, model)
+        elif debug:
+            self.console.print(f"{MSG.DEBUG}Label read from the cache {cache.path}")
+        label = LabelIndex(model)
         self.channel = getValue(label, "psa:identifier").lower()
         if self.channel not in ["stc", "hric", "vihi"]:
             raise ValueError(f"Unknown channel '{self.channel}' found in label.")
@@ -680,14 +1314,114 @@ class SimbioReader:
             channel=self.channel,
             level=self.level,
             source_path=self.pdsLabel.parent,
-            file_obs=label.getElementsByTagName("File_Area_Observational"),
-            imaging=label.getElementsByTagName("img:Imaging"),
-            geometry=label.getElementsByTagName("geom:Geometry"),
+            file_obs=getElements(label, "File_Area_Observational"),
+            imaging=getElements(label, "img:Imaging"),
+            geometry=getElements(label, "geom:Geometry"),
             debug=debug,
             verbose=verbose,
             console=self.console,
+            lazy=lazy,
+            load_pixels=load_pixels,
+            workers=workers,
+            native_byteorder=native_byteorder,
         )
 
+    @classmethod
+    def open_header(cls, file_path: Path, **kwargs) -> "SimbioReader":
+        """Opens a product reading only its label and housekeeping.
+
+        The ``.qub``/``.dat`` files are never read: the pixel arrays are loaded
+        only if ``img`` is accessed later. The update check is disabled unless
+        explicitly requested.
+
+        Args:
+            file_path (Path): The label, data file or product folder.
+            **kwargs: Any other keyword accepted by ``SimbioReader``.
+
+        Returns:
+            SimbioReader: The reader with metadata only.
+        """
+        kwargs.setdefault("updateCheck", False)
+        return cls(file_path, load_pixels=False, **kwargs)
+
+    @staticmethod
+    def catalog(root: Path, workers: int = 1) -> pd.DataFrame:
+        """Builds the catalogue of all the products under a folder.
+
+        Each label is opened in header-only mode; with ``workers`` > 1 the
+        products are processed in a pool of processes. Products that can not
+        be read are reported in the ``error`` column.
+
+        Args:
+            root (Path): The archive root.
+            workers (int, optional): Number of processes. Defaults to 1.
+
+        Returns:
+            pd.DataFrame: One row for each filter or segment of each product.
+        """
+        from SimbioReader.catalog import build_catalog
+
+        return build_catalog(root, workers=workers)
+
+    @staticmethod
+    def hk_export(root: Path, output: Path, workers: int = 1) -> dict:
+        """Adds the housekeeping and the device temperatures of all the products
+        under a folder to a Parquet dataset partitioned by channel, phase and
+        month. Only the new or changed labels are read.
+
+        See ``SimbioReader.hkstore``; requires pyarrow.
+
+        Args:
+            root (Path): The archive root.
+            output (Path): The folder of the dataset.
+            workers (int, optional): Number of processes. Defaults to 1.
+
+        Returns:
+            dict: The number of ``added``, ``skipped`` and ``removed`` products and
+            the ``errors``.
+        """
+        from SimbioReader.hkstore import export_hk
+
+        return export_hk(root, output, workers=workers)
+
+    def verify(self, workers: int = 1, cache: "VerifiedCache | bool" = False) -> pd.DataFrame:
+        """Checks existence, size and MD5 checksum of the files of the product
+        against the values declared in the label.
+
+        Args:
+            workers (int, optional): Number of processes. Defaults to 1.
+            cache (VerifiedCache | bool, optional): The record of the files
+                already verified, which are not hashed again while unchanged;
+                True uses the default one. Defaults to False.
+
+        Returns:
+            pd.DataFrame: One row for each file, with its ``status``.
+        """
+        from SimbioReader.integrity import VerifiedCache, label_files, verify_files
+
+        if cache is True:
+            cache = VerifiedCache()
+        return verify_files(
+            label_files(self.pdsLabel), workers=workers, cache=cache or None
+        )
+
+    def to_xarray(self, lazy: bool = True, lines_per_chunk: int = 256):
+        """Returns the product as an ``xarray.Dataset``.
+
+        See ``SimbioReader.dataset.to_dataset``. Requires xarray; with ``lazy``
+        the variables are memmap backed and, if Dask is installed, chunked.
+
+        Args:
+            lazy (bool, optional): Do not load the images. Defaults to True.
+            lines_per_chunk (int, optional): Lines in each Dask chunk. Defaults to 256.
+
+        Returns:
+            xarray.Dataset: One variable for each filter, or the VIHI cube.
+        """
+        from SimbioReader.dataset import to_dataset
+
+        return to_dataset(self, lazy=lazy, lines_per_chunk=lines_per_chunk)
+
     @property
     def lvid(self) -> str:
         """Returns the LIDVID of the SIMBIO-SYS file.
@@ -698,6 +1432,29 @@ class SimbioReader:
 
         return f"{self.lid}::{self.version}"
 
+    @property
+    def subphase(self) -> str | None:
+        """Returns the mission subphase containing the observation start time.
+
+        Returns:
+            str | None: The subphase name (see ``SimbioReader.timeline``), or None.
+        """
+        from SimbioReader.timeline import SUBPHASES
+
+        return SUBPHASES.find(self.startTime)
+
+    @property
+    def tests(self) -> list[str]:
+        """Returns the tests overlapping the observation.
+
+        Returns:
+            list[str]: The keys of the tests in ``SimbioReader.tests``, sorted
+            by start time.
+        """
+        from SimbioReader.timeline import TESTS
+
+        return TESTS.between(self.startTime, self.stopTime)
+
     def label_name(self, file_path: Path) -> None:
         if file_path.is_dir():
             lst = list(file_path.glob("*.lblx"))
@@ -738,6 +1495,9 @@ class SimbioReader:
 
     
     def show(self, hk:bool=False, detector:bool=False, data_structure:bool=False, filters:bool=False, all_info:bool=False) -> Panel:
+        from rich.columns import Columns
+        from rich.panel import Panel
+
         columns=[self.info(), self.target.show()]
         if hk or all_info:
             columns.append(self.data.hk.show())
@@ -767,6 +1527,9 @@ class SimbioReader:
         )
 
     def info(self) -> Panel:
+        from rich.panel import Panel
+        from rich.table import Table
+
         dt = Table.grid()
         dt.add_column(style="yellow", justify="right")
         dt.add_column()
@@ -776,6 +1539,11 @@ class SimbioReader:
         dt.add_row("Channel", sep, self.channel.upper())
         dt.add_row("Processing Level", sep, self.level)
         dt.add_row("Mission Phase", sep, self.phaseName)
+        if self.subphase is not None:
+            dt.add_row("Mission SubPhase", sep, self.subphase)
+        tests = self.tests
+        if tests:
+            dt.add_row("Tests", sep, ", ".join(tests))
         dt.add_row("Logical Identifier", sep, self.lid)
         dt.add_row("Version", sep, self.version)
         dt.add_row("Title", sep, self.title)
@@ -788,6 +1556,9 @@ class SimbioReader:
         return Panel(dt, title="SimbioReader Info", border_style="green", expand=False)
     
     def filters_summary(self) -> Panel:
+        from rich.panel import Panel
+        from rich.table import Table
+
         tb= Table()
         tb.add_column("",style="yellow", justify="right")
         tb.add_column("Filter Names",style="yellow", justify="center")
@@ -804,6 +1575,9 @@ class SimbioReader:
         )
 
     def summary(self) -> Panel:
+        from rich.columns import Columns
+        from rich.panel import Panel
+
         filters = []
         for item in self.data.filters:
             disp = getattr(self.data, f"filter_{item.lower()}")
@@ -859,6 +1633,7 @@ class SimbioReader:
         outFolder: Path = None,
         template: Path = None,
         description: str = "This is the first version.",
+        stretch: str | None = None,
     ) -> str | None:
         """Saves a preview image of the loaded data.
 
@@ -866,8 +1641,9 @@ class SimbioReader:
             img_type: The desired image format. Supported formats are 'png', 'tif', and 'jpg'. Defaults to 'png'.
             quality: The quality of the saved image (applicable for 'png' and 'jpg' formats only). Ranges from 0 (worst) to 100 (best). Defaults to 100.
             out_folder: The output folder path where the preview image will be saved. Defaults to the same directory as the original Simbio file.
-            template: name of the PDS4 template that will be generated. If None no template will be written. If the template is not none the img_type
-                    is forced to png
+            template: name of the PDS4 template that will be generated, or a compiled ``BrowseTemplate``. If None no template will be written.
+                    If the template is not none the img_type is forced to png. The templates are compiled once and reused (see ``SimbioReader.browse``)
+            stretch: The contrast stretch to 8 bit, 'linear', 'percentile' or 'equalize'. If None the stored values are saved. Defaults to None.
 
         Raises:
             ValueError: If the provided image format is not supported.
@@ -891,45 +1667,18 @@ class SimbioReader:
         if "vihi" in self.channel:
             self.console.print("VIHI")
         if template:
-            if not isinstance(template, Path):
-                template = Path(template)
-            if not template.exists():
-                raise FileNotFoundError(f"The template {template.name} was not found")
-            new_filename = gen_filename(self.pdsLabel)
-            new_label = dest.joinpath(new_filename).with_suffix(".lblx")
-            # template.rename(new_label)
-            # from xml.dom.minidom import parse, parseString, Element
-            tree = parse(template.as_posix())
-            for item in tree.getElementsByTagName("File_Area_Browse"):
-                item.parentNode.removeChild(item)
-
-            if "cal" in Path(new_filename).stem:
-                calib = True
-            else:
-                calib = False
-            new_lid = lidUpdate(tree, new_label, calib=calib)
-            creatTime = datetime.now()
-            updateXML(tree, "modification_date", creatTime.strftime("%Y-%m-%d"), idx=0)
-            file_version = str(new_filename).split("__")[1].split(".")[0]
-            file_version = file_version.replace("_", ".")
-            updateXML(tree, "version_id", file_version, idx=0)
-            updateXML(tree, "version_id", file_version, idx=1)
-            updateXML(tree, "description", description, idx=0)
-            lvidUpdate(tree, new_label, file_version)
+            from SimbioReader.browse import BrowseTemplate, load_template
+
+            if not isinstance(template, BrowseTemplate):
+                template = load_template(template)
             ret = self.data.savePreview(
-                img_type=img_type, quality=quality, outFolder=dest, tree=tree
+                img_type=img_type, quality=quality, outFolder=dest, tree=Document(),
+                stretch=stretch,
             )
-            br = getElement(tree, "Product_Browse")
-            for item in ret:
-                br.appendChild(item)
-
-            dom2 = parseString(pretty_print(tree))
-            with open(new_label, "w") as xmlFile:
-                dom2.writexml(xmlFile, encoding="utf-8")
-            return f"{new_lid}::{file_version}"
+            return template.write(self.pdsLabel, dest, file_areas=ret, description=description)
         else:
             ret = self.data.savePreview(
-                img_type=img_type, quality=quality, outFolder=dest
+                img_type=img_type, quality=quality, outFolder=dest, stretch=stretch
             )
 
     def image(self) -> im:
@@ -946,6 +1695,8 @@ class SimbioReader:
             ValueError: If the loaded image data cannot be converted to a PIL Image
             object due to unsupported data type or shape.
         """
+        from PIL import Image as im
+
         data = im.fromarray(self.img)
         return data
 
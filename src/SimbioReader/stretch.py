@@ -0,0 +1,200 @@
+"""Contrast stretch of the images to 8 bit for the previews.
+
+Three methods are available:
+
+- ``linear``: the full range of the values is mapped to 0-255;
+- ``percentile``: the values between the ``low`` and ``high`` percentiles are
+  mapped to 0-255, the others are clipped;
+- ``equalize``: histogram equalization.
+
+The percentiles and the equalization come from the histogram of the image, so
+the data are never sorted. The 8 and 16 bit integer images use the exact
+histogram of all their codes and a look-up table from code to output value,
+applied with a single ``np.take``; the other types use a histogram of
+``bins`` bins between the minimum and the maximum. The images are processed in
+blocks, writing into the output array, so no full-size temporary is created.
+"""
+import numpy as np
+
+METHODS = ("linear", "percentile", "equalize")
+
+
+def _codes(img: np.ndarray) -> tuple[np.ndarray, np.ndarray] | None:
+    """Unsigned view of an 8/16 bit integer image and the value of each code."""
+    if img.dtype.kind not in "iu" or img.dtype.itemsize > 2:
+        return None
+    unsigned = img.dtype.newbyteorder("=").str.replace("i", "u")
+    values = np.arange(2 ** (8 * img.dtype.itemsize), dtype=unsigned)
+    if img.dtype.kind == "i":
+        values = values.view(unsigned.replace("u", "i"))
+    return img.view(img.dtype.str.replace("i", "u")), values.astype(np.float64)
+
+
+def _limits(values: np.ndarray, counts: np.ndarray, low: float, high: float) -> tuple[float, float]:
+    """Values at the ``low`` and ``high`` percentiles of a histogram sorted by value."""
+    cdf = np.cumsum(counts)
+    total = cdf[-1]
+    lo = values[min(np.searchsorted(cdf, total * low / 100.0, side="right"), len(values) - 1)]
+    hi = values[min(np.searchsorted(cdf, total * high / 100.0, side="left"), len(values) - 1)]
+    return float(lo), float(hi)
+
+
+def _linear_lut(values: np.ndarray, lo: float, hi: float) -> np.ndarray:
+    scale = 255.0 / (hi - lo) if hi > lo else 0.0
+    return np.clip(np.rint((values - lo) * scale), 0, 255).astype(np.uint8)
+
+
+def _equalize_lut(counts: np.ndarray) -> np.ndarray:
+    cdf = np.cumsum(counts)
+    first = cdf[np.nonzero(cdf)[0][0]] if cdf[-1] else 0
+    span = cdf[-1] - first
+    if span == 0:
+        return np.zeros(len(counts), dtype=np.uint8)
+    return np.clip(np.round((cdf - first) * 255.0 / span), 0, 255).astype(np.uint8)
+
+
+class PreviewRenderer:
+    """
+    Converts images to 8 bit with a contrast stretch, reusing the output buffer
+    while the images have the same shape.
+
+    Args:
+        method (str, optional): One of ``METHODS``. Defaults to 'percentile'.
+        low (float, optional): Lower percentile. Defaults to 2.
+        high (float, optional): Upper percentile. Defaults to 98.
+        bins (int, optional): Histogram bins for the non 8/16 bit images.
+            Defaults to 4096.
+        chunk_size (int, optional): Pixels processed at a time. Defaults to 1 Mi.
+
+    Raises:
+        ValueError: If the method is unknown.
+    """
+
+    def __init__(
+        self,
+        method: str = "percentile",
+        low: float = 2.0,
+        high: float = 98.0,
+        bins: int = 4096,
+        chunk_size: int = 1024**2,
+    ) -> None:
+        if method not in METHODS:
+            raise ValueError(f"Unknown stretch '{method}'. Available: {', '.join(METHODS)}")
+        self.method = method
+        self.low = low
+        self.high = high
+        self.bins = bins
+        self.chunk_size = chunk_size
+        self._out = None
+
+    def __call__(self, img: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
+        """Returns the 8 bit image.
+
+        Args:
+            img (np.ndarray): The image.
+            out (np.ndarray | None, optional): The uint8 array to fill. Defaults to
+                the buffer of the renderer, which is overwritten by the next call.
+
+        Returns:
+            np.ndarray: The uint8 image, with the shape of ``img``.
+        """
+        if out is None:
+            if self._out is None or self._out.shape != img.shape:
+                self._out = np.empty(img.shape, dtype=np.uint8)
+            out = self._out
+        codes = _codes(img)
+        if codes is not None:
+            self._render_codes(img, codes, out)
+        else:
+            self._render_bins(img, out)
+        return out
+
+    def _chunks(self, size: int):
+        for start in range(0, size, self.chunk_size):
+            yield slice(start, start + self.chunk_size)
+
+    def _render_codes(self, img: np.ndarray, codes, out: np.ndarray) -> None:
+        index, values = codes
+        flat = index.reshape(-1)
+        counts = np.zeros(len(values), dtype=np.int64)
+        for chunk in self._chunks(flat.size):
+            counts += np.bincount(flat[chunk], minlength=len(values))
+        order = np.argsort(values, kind="stable")
+        if self.method == "equalize":
+            lut = np.empty(len(values), dtype=np.uint8)
+            lut[order] = _equalize_lut(counts[order])
+        else:
+            if self.method == "linear":
+                present = np.nonzero(counts[order])[0]
+                lo, hi = values[order][present[0]], values[order][present[-1]]
+            else:
+                lo, hi = _limits(values[order], counts[order], self.low, self.high)
+            lut = _linear_lut(values, lo, hi)
+        np.take(lut, index, out=out)
+
+    def _render_bins(self, img: np.ndarray, out: np.ndarray) -> None:
+        flat = img.reshape(-1)
+        dst = out.reshape(-1)
+        mn, mx = np.inf, -np.inf
+        for chunk in self._chunks(flat.size):
+            block = flat[chunk]
+            if block.dtype.kind == "f":
+                block = block[np.isfinite(block)]
+            if block.size:
+                mn, mx = min(mn, float(block.min())), max(mx, float(block.max()))
+        if mn > mx:
+            dst[:] = 0
+            return
+        if self.method == "linear":
+            lo, hi = mn, mx
+        else:
+            counts = np.zeros(self.bins, dtype=np.int64)
+            for chunk in self._chunks(flat.size):
+                counts += np.histogram(flat[chunk], bins=self.bins, range=(mn, mx))[0]
+            edges = np.linspace(mn, mx, self.bins + 1)
+            if self.method == "percentile":
+                lo = _limits(edges[:-1], counts, self.low, self.high)[0]
+                hi = _limits(edges[1:], counts, self.low, self.high)[1]
+            else:
+                lut = _equalize_lut(counts)
+        scratch = np.empty(min(self.chunk_size, flat.size), dtype=np.float32)
+        for chunk in self._chunks(flat.size):
+            block = flat[chunk]
+            buf = scratch[: block.size]
+            if self.method == "equalize":
+                scale = self.bins / (mx - mn) if mx > mn else 0.0
+                np.subtract(block, mn, out=buf, casting="unsafe")
+                np.multiply(buf, scale, out=buf)
+                np.clip(buf, 0, self.bins - 1, out=buf)
+                np.nan_to_num(buf, copy=False, nan=0.0)
+                np.take(lut, buf.astype(np.intp), out=dst[chunk])
+            else:
+                scale = 255.0 / (hi - lo) if hi > lo else 0.0
+                np.subtract(block, lo, out=buf, casting="unsafe")
+                np.multiply(buf, scale, out=buf)
+                np.rint(buf, out=buf)
+                np.clip(buf, 0, 255, out=buf)
+                np.nan_to_num(buf, copy=False, nan=0.0)
+                dst[chunk] = buf
+
+
+def stretch(
+    img: np.ndarray,
+    method: str = "percentile",
+    low: float = 2.0,
+    high: float = 98.0,
+    out: np.ndarray | None = None,
+) -> np.ndarray:
+    """Converts an image to 8 bit with a contrast stretch.
+
+    Args:
+        img (np.ndarray): The image.
+        method (str, optional): One of ``METHODS``. Defaults to 'percentile'.
+        low (float, optional): Lower percentile. Defaults to 2.
+        high (float, optional): Upper percentile. Defaults to 98.
+        out (np.ndarray | None, optional): The uint8 array to fill. Defaults to None.
+
+    Returns:
+        np.ndarray: The uint8 image.
+    """
+    return PreviewRenderer(method, low=low, high=high)(img, out=out)
@@ -0,0 +1,183 @@
+"""Sorted index of the mission phases, subphases and tests.
+
+The tables of ``phases.py``, ``subphases.py`` and ``tests.py`` are compiled
+once, at import, into arrays of ``datetime64`` start and end times sorted by
+start. A point or range query is two ``np.searchsorted`` calls: the intervals
+starting before the end of the query are a prefix of the arrays, and the
+running maximum of the end times gives the first one that can still be open at
+its start, so only the intervals between the two bounds are checked. The
+parent of each entry (phase of a subphase, subphase of a test) and the
+children of each parent are kept in dictionaries.
+
+Intervals are closed: an instant equal to the end time belongs to the interval.
+
+For bulk tagging the timeline is also cut in elementary segments, between
+consecutive start and end times, each with the entry it belongs to; an array
+of times is then tagged with a single ``np.searchsorted`` over the segment
+bounds.
+"""
+from datetime import datetime, timezone
+
+import numpy as np
+
+from SimbioReader.phases import phases
+from SimbioReader.subphases import subphases
+from SimbioReader.tests import tests
+
+UNIT = "us"
+
+
+def to_datetime64(value) -> np.datetime64:
+    """Converts a time to a naive UTC ``datetime64``.
+
+    Args:
+        value (datetime | np.datetime64 | str): The time. The strings are ISO
+            8601 (a trailing ``Z`` is accepted); time-zone aware datetimes are
+            converted to UTC.
+
+    Returns:
+        np.datetime64: The time in microseconds.
+    """
+    if isinstance(value, str):
+        return np.datetime64(value.strip().rstrip("Z"), UNIT)
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return np.datetime64(value, UNIT)
+
+
+def to_datetime(value) -> datetime:
+    """Converts a time to a naive UTC ``datetime`` (see ``to_datetime64``)."""
+    return to_datetime64(value).item()
+
+
+class Timeline:
+    """
+    A table of time intervals indexed by start time.
+
+    Args:
+        table (dict): The entries, each with ``start`` and ``end`` strings.
+        parent (str | None, optional): The key of the parent name in the
+            entries (e.g. ``'phase'`` for the subphases). Defaults to None.
+
+    Attributes:
+        keys (list): The keys of the entries, in table order.
+        names (np.ndarray): The keys of the entries, sorted by start time.
+        starts (np.ndarray): The start times, sorted.
+        ends (np.ndarray): The end times, in the order of ``starts``.
+        parent (dict): The parent of each entry.
+        children (dict): The entries of each parent (lower case), in table
+            order.
+    """
+
+    def __init__(self, table: dict, parent: str | None = None) -> None:
+        keys = list(table)
+        starts = np.array([to_datetime64(table[key]["start"]) for key in keys])
+        ends = np.array([to_datetime64(table[key]["end"]) for key in keys])
+        order = np.argsort(starts, kind="stable")
+        self.names = np.array(keys, dtype=object)[order]
+        self.starts = starts[order]
+        self.ends = ends[order]
+        # position in the table, the first entry of the table wins on overlaps
+        self.rank = order
+        self._max_end = np.maximum.accumulate(self.ends)
+        self._index = {name: i for i, name in enumerate(self.names)}
+        self.keys = keys
+        self._segments = None
+        self.parent = {}
+        self.children = {}
+        if parent is not None:
+            for name in keys:
+                self.parent[name] = table[name][parent]
+                self.children.setdefault(table[name][parent].lower(), []).append(name)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._index
+
+    def _overlapping(self, t0: np.datetime64, t1: np.datetime64) -> np.ndarray:
+        """Positions of the intervals overlapping ``[t0, t1]``."""
+        first = np.searchsorted(self._max_end, t0, side="left")
+        last = np.searchsorted(self.starts, t1, side="right")
+        idx = np.arange(first, last)
+        return idx[self.ends[idx] >= t0]
+
+    def at(self, dt) -> list[str]:
+        """Returns the entries containing an instant, in table order.
+
+        Args:
+            dt (datetime | np.datetime64 | str): The instant.
+
+        Returns:
+            list[str]: The entry keys.
+        """
+        t = to_datetime64(dt)
+        idx = self._overlapping(t, t)
+        return list(self.names[idx[np.argsort(self.rank[idx], kind="stable")]])
+
+    def find(self, dt) -> str | None:
+        """Returns the first entry of the table containing an instant.
+
+        Args:
+            dt (datetime | np.datetime64 | str): The instant.
+
+        Returns:
+            str | None: The entry key, or None.
+        """
+        t = to_datetime64(dt)
+        idx = self._overlapping(t, t)
+        if len(idx) == 0:
+            return None
+        return self.names[idx[np.argmin(self.rank[idx])]]
+
+    def between(self, t0, t1) -> list[str]:
+        """Returns the entries overlapping a time range, sorted by start time.
+
+        Args:
+            t0 (datetime | np.datetime64 | str): The start of the range.
+            t1 (datetime | np.datetime64 | str): The end of the range.
+
+        Returns:
+            list[str]: The entry keys.
+        """
+        return list(self.names[self._overlapping(to_datetime64(t0), to_datetime64(t1))])
+
+    def codes(self, times: np.ndarray) -> np.ndarray:
+        """Tags an array of times with the entry containing them.
+
+        Args:
+            times (np.ndarray): The ``datetime64`` times (naive UTC). ``NaT``
+                is not tagged.
+
+        Returns:
+            np.ndarray: For each time the position in ``keys`` of the first
+            entry of the table containing it, or -1.
+        """
+        if self._segments is None:
+            # the entry containing an instant only changes at a start or just after an end
+            bounds = np.unique(np.concatenate([self.starts, self.ends + np.timedelta64(1, UNIT)]))
+            position = {name: i for i, name in enumerate(self.keys)}
+            labels = [self.find(bound) for bound in bounds]
+            codes = np.array([position[label] if label else -1 for label in labels], dtype=np.int32)
+            # before the first bound nothing is tagged
+            self._segments = bounds, np.concatenate([[-1], codes]).astype(np.int32)
+        bounds, codes = self._segments
+        times = np.asarray(times).astype(f"datetime64[{UNIT}]")
+        result = codes[np.searchsorted(bounds, times, side="right")]
+        result[np.isnat(times)] = -1
+        return result
+
+    def bounds(self, name: str) -> tuple[datetime, datetime]:
+        """Returns start and end time of an entry.
+
+        Raises:
+            KeyError: If the entry does not exist.
+        """
+        i = self._index[name]
+        return self.starts[i].item(), self.ends[i].item()
+
+
+PHASES = Timeline(phases)
+SUBPHASES = Timeline(subphases, parent="phase")
+TESTS = Timeline(tests, parent="subphase")
@@ -1,15 +1,136 @@
+import hashlib
+import io
 import xml.dom.minidom as md
+from bisect import bisect_right
 from re import sub
 from pathlib import Path
 import copy
 
-def getValue(nodeList: md.Document | md.Element, label: str) -> str:
+
+def _find_all(node: dict, label: str) -> list:
+    """Returns, in document order, every item of a label model with the given tag."""
+    found = []
+    for key, value in node.items():
+        items = value if isinstance(value, list) else [value]
+        if key == label:
+            found.extend(items)
+        for item in items:
+            if isinstance(item, dict):
+                found.extend(_find_all(item, label))
+    return found
+
+
+class LabelIndex:
+    """Tag index of a label, built with a single traversal.
+
+    The index maps every tag name, namespace prefix included (e.g.
+    ``img:first_line``), to its elements in document order, together with the
+    position range covered by each block. A lookup inside a block is then a
+    binary search instead of a walk of the whole tree. Both DOM nodes and label
+    models (see ``SimbioReader.label``) can be indexed.
+
+    ``getValue``, ``getElement`` and ``getElements`` accept a ``LabelIndex`` in
+    place of the node; ``getElement`` then returns the index scoped to the
+    found block, so chained lookups stay indexed.
+
+    Args:
+        root (md.Document | md.Element | dict): The node to index.
+    """
+
+    def __init__(self, root: md.Document | md.Element | dict) -> None:
+        self.root = root
+        self._tags: dict[str, tuple[list[int], list]] = {}
+        self._ranges: dict[int, tuple[int, int]] = {}
+        self._first, self._last = -1, float("inf")
+        self._pos = 0
+        if isinstance(root, dict):
+            self._index_model(root)
+        else:
+            self._index_dom(root)
+
+    def _add(self, tag: str, node) -> int:
+        pos = self._pos
+        self._pos += 1
+        positions, nodes = self._tags.setdefault(tag, ([], []))
+        positions.append(pos)
+        nodes.append(node)
+        return pos
+
+    def _index_dom(self, node: md.Node) -> None:
+        for child in node.childNodes:
+            if child.nodeType != child.ELEMENT_NODE:
+                continue
+            pos = self._add(child.tagName, child)
+            self._index_dom(child)
+            self._ranges[id(child)] = (pos, self._pos - 1)
+
+    def _index_model(self, node: dict) -> None:
+        for key, value in node.items():
+            for item in value if isinstance(value, list) else [value]:
+                pos = self._add(key, item)
+                if isinstance(item, dict):
+                    self._index_model(item)
+                    self._ranges[id(item)] = (pos, self._pos - 1)
+
+    def scope(self, node: md.Element | dict) -> "LabelIndex":
+        """Returns the index restricted to the descendants of an indexed block.
+
+        Args:
+            node (md.Element | dict): A block found through this index.
+
+        Returns:
+            LabelIndex: The scoped index, sharing the tables of this one.
+        """
+        scoped = object.__new__(LabelIndex)
+        scoped.root = node
+        scoped._tags = self._tags
+        scoped._ranges = self._ranges
+        scoped._first, scoped._last = self._ranges[id(node)]
+        return scoped
+
+    def is_block(self, node) -> bool:
+        """Tells if a node is an indexed block that can be scoped."""
+        return id(node) in self._ranges and not isinstance(node, str)
+
+    def getElementsByTagName(self, label: str) -> list:
+        """Returns the nodes with the given tag inside the indexed range."""
+        if label not in self._tags:
+            return []
+        positions, nodes = self._tags[label]
+        lo = bisect_right(positions, self._first)
+        hi = bisect_right(positions, self._last)
+        return nodes[lo:hi]
+
+    def __repr__(self) -> str:
+        return f"LabelIndex(tags={len(self._tags)})"
+
+
+def _text(node, label: str) -> str:
+    """Returns the text of a DOM element or label model leaf."""
+    if node is None:
+        raise AttributeError(f"Tag '{label}' has no child nodes")
+    if isinstance(node, str):
+        return node
+    if isinstance(node, dict):
+        raise AttributeError(f"Tag '{label}' has no text value")
+    if node.firstChild is None:
+        raise AttributeError(f"Tag '{label}' has no child nodes")
+
+    value = node.firstChild.nodeValue
+    if value is None:
+        raise AttributeError(f"Tag '{label}' has no text value")
+
+    return value
+
+
+def getValue(nodeList: md.Document | md.Element | dict | LabelIndex, label: str) -> str:
     """Extracts and returns the text content of the first matching XML element.
     This function searches for an XML element with the specified tag name within
     a given node list and returns the text data of the first matching element's
-    first child node.
+    first child node. A label model produced by ``SimbioReader.label``, or a
+    ``LabelIndex``, can be used in place of the DOM node.
     Args:
-        nodeList (md.Document): The parent XML element to search within.
+        nodeList (md.Document | dict | LabelIndex): The parent XML element to search within.
         label (str): The tag name of the XML element to retrieve.
     Returns:
         str: The text content of the first matching element's first child node.
@@ -27,28 +148,24 @@ def getValue(nodeList: md.Document | md.Element, label: str) -> str:
         >>> getValue(root, 'age')
         '30'
     """
-    
-    elem = nodeList.getElementsByTagName(label)
+    if isinstance(nodeList, dict):
+        elem = _find_all(nodeList, label)
+    else:
+        elem = nodeList.getElementsByTagName(label)
     if not elem:
         raise IndexError(f"Tag '{label}' not found")
 
-    node = elem[0]
-    if node.firstChild is None:
-        raise AttributeError(f"Tag '{label}' has no child nodes")
+    return _text(elem[0], label)
 
-    value = node.firstChild.nodeValue
-    if value is None:
-        raise AttributeError(f"Tag '{label}' has no text value")
-
-    return value
-    
 
 
-def getElement(doc: md.Document | md.Element, label: str, el: int = 0) -> md.Element:
+def getElement(doc: md.Document | md.Element | dict | LabelIndex, label: str, el: int = 0) -> md.Element | dict | LabelIndex:
     """Get a Block of a dom
     
     Args:
-        doc (xml.dom): The full Object
+        doc (xml.dom | dict | LabelIndex): The full Object, a label model or
+            their ``LabelIndex``. With an index, the block is returned as the
+            index scoped to it
         
         label (str): The name of the tag to extract
             
@@ -61,7 +178,10 @@ def getElement(doc: md.Document | md.Element, label: str, el: int = 0) -> md.Ele
     if el < 0:
         raise IndexError("Element index cannot be negative")
 
-    elem = doc.getElementsByTagName(label)
+    if isinstance(doc, dict):
+        elem = _find_all(doc, label)
+    else:
+        elem = doc.getElementsByTagName(label)
     if not elem:
         raise IndexError(f"Tag '{label}' not found")
     if el >= len(elem):
@@ -69,9 +189,33 @@ def getElement(doc: md.Document | md.Element, label: str, el: int = 0) -> md.Ele
             f"Tag '{label}' has {len(elem)} element(s), index {el} is out of range"
         )
 
+    if isinstance(doc, LabelIndex) and doc.is_block(elem[el]):
+        return doc.scope(elem[el])
     return elem[el]
 
 
+def getElements(doc: md.Document | md.Element | dict | LabelIndex, label: str) -> list:
+    """Get all the blocks of a dom with the given tag, in document order.
+
+    Args:
+        doc (xml.dom | dict | LabelIndex): The full Object, a label model or
+            their ``LabelIndex``
+
+        label (str): The name of the tag to extract
+
+    Returns:
+        (list) The node trees extracted, empty if the tag is not found
+    """
+    if isinstance(doc, dict):
+        return _find_all(doc, label)
+    if isinstance(doc, LabelIndex):
+        return [
+            doc.scope(item) if doc.is_block(item) else item
+            for item in doc.getElementsByTagName(label)
+        ]
+    return list(doc.getElementsByTagName(label))
+
+
 def gen_filename(old_filename:Path)->Path:
     new_filename=copy.copy(old_filename.stem)
     # new_filename=new_filename.split('__')[0]
@@ -143,3 +287,69 @@ def lvidUpdate(
 
 def pretty_print(dom):
     return '\n'.join([line for line in dom.toprettyxml(indent=' '*4).split('\n') if line.strip()])
+
+
+class HashingWriter(io.RawIOBase):
+    """Write-only binary stream that computes size and MD5 of the data written
+    to the wrapped file, so that the file has not to be read again.
+
+    The stream is not seekable and has no ``fileno``: encoders write through
+    ``write``.
+
+    Args:
+        fp: The binary file object to write to.
+    """
+
+    def __init__(self, fp) -> None:
+        self.fp = fp
+        self.size = 0
+        self._md5 = hashlib.md5()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._md5.update(data)
+        self.size += len(data)
+        return self.fp.write(data)
+
+    def tell(self) -> int:
+        return self.size
+
+    @property
+    def md5(self) -> str:
+        """The hexadecimal digest of the data written so far."""
+        return self._md5.hexdigest()
+
+
+# formats whose encoder needs to seek in the output file
+SEEKING_FORMATS = ("TIFF",)
+
+
+def save_image(image, file_name: Path | str, **params) -> tuple[int, str]:
+    """Saves a PIL image computing size and MD5 checksum of the file while
+    writing it.
+
+    Args:
+        image (PIL.Image.Image): The image.
+        file_name (Path | str): The output file; the format is taken from the
+            extension.
+        **params: Options of the encoder (e.g. ``quality``).
+
+    Returns:
+        tuple[int, str]: The file size in bytes and the MD5 checksum.
+    """
+    from PIL import Image
+
+    file_name = Path(file_name)
+    image_format = Image.registered_extensions()[file_name.suffix.lower()]
+    with open(file_name, "wb") as fl:
+        writer = HashingWriter(fl)
+        if image_format in SEEKING_FORMATS:
+            # encoded in memory, then written (and hashed) at once
+            buffer = io.BytesIO()
+            image.save(buffer, format=image_format, **params)
+            writer.write(buffer.getbuffer())
+        else:
+            image.save(writer, format=image_format, **params)
+    return writer.size, writer.md5
@@ -0,0 +1,109 @@
+"""Non-blocking check for new releases of SimbioReader.
+
+The check runs at most once per process, in a daemon thread, so neither the
+creation of a reader nor the exit of the interpreter waits for the network.
+The answer is stored in ``update.json`` in the cache folder (see
+``SimbioReader.cache``) and reused for ``ttl`` seconds, so batch jobs and
+offline nodes do not repeat the request.
+"""
+import json
+import threading
+import time
+from pathlib import Path
+
+from SimbioReader.cache import DEFAULT_CACHE_DIR
+
+DEFAULT_TTL = 24 * 3600
+
+_lock = threading.Lock()
+_thread: threading.Thread | None = None
+
+
+def _cache_file(directory: Path | None) -> Path:
+    return Path(directory if directory else DEFAULT_CACHE_DIR) / "update.json"
+
+
+def read_cached(current: str, ttl: float = DEFAULT_TTL, directory: Path | None = None) -> dict | None:
+    """Returns the stored answer if it is younger than ``ttl`` and refers to
+    the installed version.
+
+    Args:
+        current (str): The installed version.
+        ttl (float, optional): Validity in seconds. Defaults to one day.
+        directory (Path | None, optional): The cache folder. Defaults to the
+            label cache folder.
+
+    Returns:
+        dict | None: ``{"version", "checked", "message"}``, or None.
+    """
+    try:
+        entry = json.loads(_cache_file(directory).read_text())
+    except (OSError, ValueError):
+        return None
+    if entry.get("version") != current or time.time() - entry.get("checked", 0) > ttl:
+        return None
+    return entry
+
+
+def check(current: str, ttl: float = DEFAULT_TTL, directory: Path | None = None) -> str | None:
+    """Checks for a newer release, using the stored answer while it is valid.
+
+    Args:
+        current (str): The installed version.
+        ttl (float, optional): Validity in seconds of the stored answer.
+            Defaults to one day.
+        directory (Path | None, optional): The cache folder. Defaults to the
+            label cache folder.
+
+    Returns:
+        str | None: The message announcing the new release, or None.
+    """
+    entry = read_cached(current, ttl, directory)
+    if entry is None:
+        from update_checker import UpdateChecker
+
+        result = UpdateChecker().check("SimbioReader", current)
+        entry = {"version": current, "checked": time.time(), "message": str(result) if result else None}
+        try:
+            file_name = _cache_file(directory)
+            file_name.parent.mkdir(parents=True, exist_ok=True)
+            file_name.write_text(json.dumps(entry))
+        except OSError:
+            pass
+    return entry["message"]
+
+
+def check_in_background(console, current: str, ttl: float = DEFAULT_TTL, directory: Path | None = None) -> threading.Thread | None:
+    """Starts the update check in a daemon thread, once per process.
+
+    The message, if any, is printed on ``console``. Errors (e.g. no network)
+    are ignored.
+
+    Args:
+        console: The rich console.
+        current (str): The installed version.
+        ttl (float, optional): Validity in seconds of the stored answer.
+            Defaults to one day.
+        directory (Path | None, optional): The cache folder. Defaults to the
+            label cache folder.
+
+    Returns:
+        threading.Thread | None: The thread, or None if the check was
+        already started.
+    """
+    global _thread
+
+    def run():
+        try:
+            message = check(current, ttl, directory)
+        except Exception:
+            return
+        if message:
+            console.print(message)
+
+    with _lock:
+        if _thread is not None:
+            return None
+        _thread = threading.Thread(target=run, name="SimbioReader-update", daemon=True)
+        _thread.start()
+        return _thread
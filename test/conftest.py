@@ -0,0 +1,114 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+from rich.console import Console
+
+from SimbioReader.constants import data_types
+from SimbioReader.sr import Data, SimbioObject
+
+TRANSPOSE = {"line": 0, "sample": 1, "band": 2}
+
+
+def write_vihi_segment(folder: Path, name: str, axis_names, lines, samples, bands, first_line=1, start=0,
+                       data_type="IEEE754LSBSingle"):
+    """Writes a synthetic VIHI segment and returns its label models and cube.
+
+    The cube, in ``(line, sample, band)`` order, holds consecutive values
+    starting at ``start`` and is stored with the given axis order.
+    """
+    cube = (start + np.arange(lines * samples * bands, dtype=np.float32)).reshape(lines, samples, bands)
+    file_name = folder / f"{name}.dat"
+    stored = cube.transpose([TRANSPOSE[axis] for axis in axis_names])
+    stored.astype(data_types.get(data_type, {"dtype": "<f4"})["dtype"]).tofile(file_name)
+    elements = {"line": lines, "sample": samples, "band": bands}
+    file_obs = {
+        "File": {
+            "file_name": file_name.name,
+            "creation_date_time": "2024-04-08T00:00:00Z",
+            "file_size": str(file_name.stat().st_size),
+            "md5_checksum": "0",
+        },
+        "Array_3D_Spectrum": {
+            "offset": "0",
+            "axes": "3",
+            "data_type": data_type,
+            "Axis_Array": [
+                {"axis_name": axis.title(), "elements": str(elements[axis]), "sequence_number": str(i + 1)}
+                for i, axis in enumerate(axis_names)
+            ],
+        },
+    }
+    imaging = {
+        "img:exposure_duration": "0.1",
+        "img:Subframe": {
+            "img:first_line": str(first_line),
+            "img:first_sample": "1",
+            "img:lines": str(lines),
+            "img:samples": str(samples),
+            "img:line_fov": "0.1",
+            "img:sample_fov": "0.1",
+        },
+    }
+    return file_obs, imaging, cube
+
+
+@pytest.fixture
+def vihi_object(tmp_path: Path):
+    """Factory of synthetic VIHI segments stored with the given axis order.
+
+    Returns the SimbioObject and the cube in ``(line, sample, band)`` order.
+    """
+
+    def make(axis_names=("band", "line", "sample"), lines=4, samples=6, bands=5,
+             data_type="IEEE754LSBSingle", **kwargs):
+        name = f"vihi_{''.join(axis[0] for axis in axis_names)}_{data_type}"
+        file_obs, imaging, cube = write_vihi_segment(
+            tmp_path, name, axis_names, lines, samples, bands, data_type=data_type
+        )
+        obj = SimbioObject(
+            file_name=tmp_path / f"{name}.dat",
+            channel="vihi",
+            imaging=imaging,
+            geometry={},
+            file_obs=file_obs,
+            console=Console(quiet=True),
+            **{"load_pixels": False, **kwargs},
+        )
+        return obj, cube
+
+    return make
+
+
+@pytest.fixture
+def vihi_data(tmp_path: Path):
+    """Factory of synthetic VIHI products made of several segments.
+
+    Args of the factory: ``first_lines`` and ``lines`` of each segment.
+    Returns the Data object and the cube of each segment.
+    """
+
+    def make(first_lines, lines, samples=3, bands=4, axis_names=("line", "sample", "band")):
+        file_obs, imaging, cubes = [], [], []
+        start = 0
+        for i, (first_line, n_lines) in enumerate(zip(first_lines, lines)):
+            fo, img, cube = write_vihi_segment(
+                tmp_path, f"segment_{i}", axis_names, n_lines, samples, bands, first_line, start
+            )
+            start += cube.size
+            file_obs.append(fo)
+            imaging.append(img)
+            cubes.append(cube)
+        data = Data(
+            channel="vihi",
+            level="cal",
+            source_path=tmp_path,
+            file_obs=file_obs,
+            imaging=imaging,
+            geometry=[{}] * len(file_obs),
+            console=Console(quiet=True),
+            load_pixels=False,
+        )
+        return data, cubes
+
+    return make
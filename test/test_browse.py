@@ -0,0 +1,116 @@
+import io
+from datetime import datetime
+from pathlib import Path
+from xml.dom.minidom import Document, parse, parseString
+
+import pytest
+
+from SimbioReader.browse import BrowseTemplate, load_template
+from SimbioReader.sr import SimbioReader
+from SimbioReader.tools import getElement, getValue, lidUpdate, lvidUpdate, pretty_print, updateXML
+
+PRODUCT = Path("test/data/sim_cal_stc_cruise_ico11_2024-04-08_001")
+
+TEMPLATE = """<?xml version="1.0" encoding="utf-8"?>
+<?xml-model href="https://pds.nasa.gov/pds4/pds/v1/PDS4_PDS_1K00.sch" schematypens="http://purl.oclc.org/dsdl/schematron"?>
+<Product_Browse xmlns="http://pds.nasa.gov/pds4/pds/v1">
+    <Identification_Area>
+        <logical_identifier>urn:esa:psa:bc_mpo_sim:browse_raw:sim_browse_raw_sc_stc_template</logical_identifier>
+        <version_id>0.1</version_id>
+        <title>SIMBIO-SYS browse &amp; preview</title>
+        <Modification_History>
+            <Modification_Detail>
+                <modification_date>2020-01-01</modification_date>
+                <version_id>0.1</version_id>
+                <description>Template</description>
+            </Modification_Detail>
+        </Modification_History>
+    </Identification_Area>
+    <Reference_List>
+        <Internal_Reference>
+            <lidvid_reference>urn:esa:psa:bc_mpo_sim:data_raw:sim_raw_sc_stc_template::0.1</lidvid_reference>
+            <reference_type>browse_to_data</reference_type>
+        </Internal_Reference>
+    </Reference_List>
+    <File_Area_Browse>
+        <File>
+            <file_name>template.png</file_name>
+        </File>
+    </File_Area_Browse>
+</Product_Browse>
+"""
+
+
+@pytest.fixture
+def template(tmp_path: Path) -> Path:
+    path = tmp_path / "template.lblx"
+    path.write_text(TEMPLATE, encoding="utf-8")
+    return path
+
+
+def file_area(tree: Document, name: str):
+    fab = tree.createElement("File_Area_Browse")
+    fl = tree.createElement("File")
+    fln = tree.createElement("file_name")
+    fln.appendChild(tree.createTextNode(name))
+    fl.appendChild(fln)
+    fab.appendChild(fl)
+    return fab
+
+
+def legacy_label(template: Path, new_label: Path, file_areas, description: str, date: datetime) -> str:
+    tree = parse(template.as_posix())
+    for item in tree.getElementsByTagName("File_Area_Browse"):
+        item.parentNode.removeChild(item)
+    lidUpdate(tree, new_label, calib="cal" in new_label.stem)
+    updateXML(tree, "modification_date", date.strftime("%Y-%m-%d"), idx=0)
+    file_version = new_label.stem.split("__")[1].replace("_", ".")
+    updateXML(tree, "version_id", file_version, idx=0)
+    updateXML(tree, "version_id", file_version, idx=1)
+    updateXML(tree, "description", description, idx=0)
+    lvidUpdate(tree, new_label, file_version)
+    br = getElement(tree, "Product_Browse")
+    for item in file_areas:
+        br.appendChild(item)
+    return pretty_print(tree)
+
+
+def test_render_matches_minidom(template: Path):
+    new_label = Path("sim_browse_cal_sc_stc_cruise_ico11_2024-04-08_001__1_2.lblx")
+    date = datetime(2024, 5, 6)
+    tree = Document()
+    areas = [file_area(tree, "a.png"), file_area(tree, "b & c.png")]
+    compiled = BrowseTemplate(template)
+    stream = io.StringIO()
+    compiled.render(stream, compiled.values(new_label, "A <new> version", modified=date), areas)
+    expected = legacy_label(template, new_label, areas, "A <new> version", date)
+    # same document as the minidom pipeline, apart from the XML declaration
+    assert stream.getvalue().split("\n")[1:] == expected.split("\n")[1:] + [""]
+    assert stream.getvalue().startswith('<?xml version="1.0" encoding="utf-8"?>\n')
+
+
+def test_render_without_file_areas(template: Path):
+    compiled = BrowseTemplate(template)
+    stream = io.StringIO()
+    compiled.render(stream, compiled.values(Path("sim_browse_raw_x__0_1.lblx"), "d"))
+    dom = parseString(stream.getvalue())
+    assert dom.getElementsByTagName("File_Area_Browse") == []
+    assert getValue(dom, "version_id") == "0.1"
+
+
+def test_load_template_is_cached(template: Path):
+    assert load_template(template) is load_template(template)
+    with pytest.raises(FileNotFoundError):
+        load_template(template.with_name("missing.lblx"))
+
+
+def test_save_preview_with_template(tmp_path: Path, template: Path):
+    reader = SimbioReader.open_header(PRODUCT)
+    lidvid = reader.savePreview(outFolder=tmp_path / "out", template=template)
+    labels = list((tmp_path / "out").glob("*.lblx"))
+    assert len(labels) == 1
+    dom = parse(labels[0].as_posix())
+    assert len(dom.getElementsByTagName("File_Area_Browse")) == 3
+    assert lidvid == f"{getValue(dom, 'logical_identifier')}::{getValue(dom, 'version_id')}"
+    for name in dom.getElementsByTagName("file_name"):
+        assert (tmp_path / "out" / name.firstChild.data).exists()
@@ -0,0 +1,66 @@
+import os
+import shutil
+from pathlib import Path
+
+from click.testing import CliRunner
+
+from SimbioReader.cache import LabelCache
+from SimbioReader.cli import cli
+from SimbioReader.label import read_label
+from SimbioReader.sr import SimbioReader
+
+LABEL = Path("test/data/sim_cal_stc_cruise_ico11_2024-04-08_001/sim_cal_sc_stc_cruise_ico11_2024-04-08_001__0_1.lblx")
+
+
+def test_cache_miss_then_hit(tmp_path: Path):
+    cache = LabelCache(tmp_path)
+    assert cache.get(LABEL) is None
+    model = read_label(LABEL)
+    cache.put(LABEL, model)
+    assert cache.get(LABEL) == model
+    assert cache.stats()["entries"] == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_cache_invalidated_by_mtime(tmp_path: Path):
+    label = tmp_path / LABEL.name
+    shutil.copy(LABEL, label)
+    cache = LabelCache(tmp_path / "cache", checksum=True)
+    cache.put(label, read_label(label))
+    st = label.stat()
+    os.utime(label, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert cache.get(label) is None
+
+
+def test_cache_lru_eviction(tmp_path: Path):
+    cache = LabelCache(tmp_path / "cache", max_size=1)
+    labels = []
+    for i in range(3):
+        label = tmp_path / f"label_{i}.lblx"
+        shutil.copy(LABEL, label)
+        cache.put(label, {"title": str(i)})
+        labels.append(label)
+    assert cache.stats()["entries"] == 1
+    assert cache.get(labels[-1]) == {"title": "2"}
+    assert cache.clear() == 1
+
+
+def test_reader_uses_cache(tmp_path: Path):
+    cache = LabelCache(tmp_path)
+    first = SimbioReader.open_header(LABEL, cache=cache)
+    second = SimbioReader.open_header(LABEL, cache=cache)
+    assert cache.hits == 1
+    assert first.lvid == second.lvid
+    assert second.data.filters == first.data.filters
+
+
+def test_cli_cache_stats_and_clear(tmp_path: Path):
+    cache = LabelCache(tmp_path)
+    cache.put(LABEL, read_label(LABEL))
+    runner = CliRunner()
+    result = runner.invoke(cli, ["cache", "--dir", str(tmp_path), "stats"])
+    assert result.exit_code == 0
+    assert "Entries: 1" in result.output
+    result = runner.invoke(cli, ["cache", "--dir", str(tmp_path), "clear"])
+    assert result.exit_code == 0
+    assert cache.stats()["entries"] == 0
@@ -0,0 +1,46 @@
+from pathlib import Path
+
+from click.testing import CliRunner
+
+from SimbioReader.catalog import build_catalog, find_labels
+from SimbioReader.cli import cli
+from SimbioReader.sr import SimbioReader
+
+ROOT = Path("test/data")
+
+
+def test_find_labels():
+    assert len(find_labels(ROOT)) == 3
+
+
+def test_catalog_rows_and_errors():
+    cat = SimbioReader.catalog(ROOT)
+    good = cat[cat["error"].isna()]
+    assert list(good["item"]) == ["WIN-X", "PAN-H", "PAN-L"]
+    assert set(good["channel"]) == {"stc"}
+    assert good.iloc[1]["md5"] == "6bd59cfd691b48e134dfecb2f74d6997"
+    assert (good["lines"] * good["samples"]).tolist() == [8192, 344064, 344064]
+    assert cat["error"].notna().sum() == 2
+
+
+def test_catalog_integer_columns_nullable():
+    with_errors = build_catalog(ROOT)
+    clean = build_catalog(ROOT / "sim_cal_stc_cruise_ico11_2024-04-08_001")
+    assert clean["error"].isna().all()
+    for name in ["lines", "samples", "bands", "file_size"]:
+        assert with_errors[name].dtype == clean[name].dtype == "Int64"
+    assert with_errors["lines"].isna().sum() == 2
+
+
+def test_catalog_process_pool_matches_serial():
+    serial = build_catalog(ROOT)
+    parallel = build_catalog(ROOT, workers=2)
+    assert serial.equals(parallel)
+
+
+def test_cli_catalog_csv(tmp_path: Path):
+    output = tmp_path / "catalog.csv"
+    result = CliRunner().invoke(cli, ["catalog", str(ROOT), "-o", str(output)])
+    assert result.exit_code == 0
+    assert output.exists()
+    assert len(output.read_text().splitlines()) == 6
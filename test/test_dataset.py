@@ -0,0 +1,42 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from SimbioReader.sr import SimbioReader
+
+FILE_PATH = Path("test/data/sim_cal_stc_cruise_ico11_2024-04-08_001/sim_cal_sc_stc_cruise_ico11_2024-04-08_001__0_1.lblx")
+
+
+def test_simbio_object_array_protocol():
+    reader = SimbioReader(FILE_PATH, updateCheck=False)
+    pan = getattr(reader.data, "filter_pan-h")
+    assert np.asarray(pan) is pan.img
+    assert not np.shares_memory(np.array(pan), pan.img)
+    assert np.asarray(pan, dtype=np.float64).dtype == np.float64
+    with pytest.raises(ValueError):
+        np.asarray(pan, dtype=np.float64, copy=False)
+
+
+def test_to_xarray():
+    xr = pytest.importorskip("xarray")
+    reader = SimbioReader.open_header(FILE_PATH)
+    ds = reader.to_xarray(lines_per_chunk=64)
+    assert isinstance(ds, xr.Dataset)
+    assert list(ds.data_vars) == ["win-x", "pan-h", "pan-l"]
+    pan = getattr(reader.data, "filter_pan-h")
+    assert ds["pan-h"].dims == ("pan-h_line", "pan-h_sample")
+    assert ds["pan-h"].attrs["md5"] == pan.data_structure.md5
+    assert ds["pan-h_line"].values[0] == pan.detector.first_line
+    assert ds.attrs["channel"] == "stc"
+    assert np.array_equal(ds["pan-h"].values, pan.read_window())
+    eager = reader.to_xarray(lazy=False)
+    assert np.array_equal(eager["win-x"].values, ds["win-x"].values)
+
+
+def test_to_xarray_vihi(vihi_object):
+    pytest.importorskip("xarray")
+    from SimbioReader.dataset import _pixels
+
+    obj, cube = vihi_object(("band", "line", "sample"))
+    assert np.array_equal(np.asarray(_pixels(obj, True, 2)), cube)
@@ -0,0 +1,74 @@
+import os
+import shutil
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from click.testing import CliRunner
+
+from SimbioReader.cli import cli
+from SimbioReader.sr import SimbioReader
+
+pytest.importorskip("pyarrow")
+
+PRODUCT = Path("test/data/sim_cal_stc_cruise_ico11_2024-04-08_001")
+
+
+def test_hk_export(tmp_path: Path):
+    output = tmp_path / "hk.parquet"
+    result = SimbioReader.hk_export("test/data", output)
+    assert result["added"] == 1
+    assert len(result["errors"]) == 2
+    files = list(output.rglob("*.parquet"))
+    assert len(files) == 1
+    assert files[0].parent.relative_to(output).as_posix() == "channel=stc/phase=cruise/month=2024-04"
+    hk = pd.read_parquet(output)
+    assert len(hk) == 1
+    assert hk["channel"].iloc[0] == "stc"
+    assert hk["TEMPERATURE_PE"].iloc[0] == pytest.approx(284.38636)
+    assert hk["DEVICE_TEMPERATUREPE"].iloc[0] == pytest.approx(284.38636)
+    assert str(hk["ACQUISITION_TIME_UTC"].dt.tz) == "UTC"
+
+
+def test_hk_export_incremental(tmp_path: Path):
+    root = tmp_path / "archive"
+    shutil.copytree(PRODUCT, root / PRODUCT.name)
+    output = tmp_path / "hk.parquet"
+    assert SimbioReader.hk_export(root, output)["added"] == 1
+    again = SimbioReader.hk_export(root, output)
+    assert again["added"] == 0 and again["skipped"] == 1
+    label = next(root.rglob("*.lblx"))
+    stat = label.stat()
+    os.utime(label, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert SimbioReader.hk_export(root, output)["added"] == 1
+    assert len(pd.read_parquet(output)) == 1
+
+
+def test_hk_export_replaces_changed_product(tmp_path: Path):
+    root = tmp_path / "archive"
+    shutil.copytree(PRODUCT, root / PRODUCT.name)
+    output = tmp_path / "hk.parquet"
+    assert SimbioReader.hk_export(root, output)["added"] == 1
+    label = next(root.rglob("*.lblx"))
+    text = label.read_text(encoding="utf-8")
+    text = text.replace("<version_id>0.1</version_id>", "<version_id>0.2</version_id>", 1)
+    label.write_text(text.replace("<psa:name>Cruise</psa:name>", "<psa:name>Commissioning</psa:name>"), encoding="utf-8")
+    stat = label.stat()
+    os.utime(label, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert SimbioReader.hk_export(root, output)["added"] == 1
+    files = list(output.rglob("*.parquet"))
+    assert len(files) == 1
+    assert files[0].parent.parent.name == "phase=commissioning"
+    hk = pd.read_parquet(output)
+    assert len(hk) == 1
+    assert hk["LIDVID"].iloc[0].endswith("::0.2")
+    shutil.rmtree(root / PRODUCT.name)
+    assert SimbioReader.hk_export(root, output)["removed"] == 1
+    assert not list(output.rglob("*.parquet"))
+
+
+def test_cli_hk_export(tmp_path: Path):
+    output = tmp_path / "hk.parquet"
+    result = CliRunner().invoke(cli, ["hk-export", str(PRODUCT), "-o", str(output)])
+    assert result.exit_code == 0
+    assert "1 product(s) added" in result.output
@@ -0,0 +1,62 @@
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from SimbioReader import update
+
+HEAVY = {"pandas", "PIL", "rich", "dateutil", "update_checker", "semantic_version_tools"}
+
+
+def imported_modules(statement: str) -> set[str]:
+    """Modules imported by a statement, from the ``-X importtime`` report."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return {
+        line.split("|")[-1].strip()
+        for line in result.stderr.splitlines()
+        if line.startswith("import time:") and not line.endswith("package")
+    }
+
+
+def test_import_reader_is_light():
+    modules = imported_modules("import SimbioReader.sr")
+    assert not HEAVY & {name.split(".")[0] for name in modules}
+
+
+def test_import_package_does_not_load_the_reader():
+    modules = imported_modules("import SimbioReader")
+    assert "SimbioReader.sr" not in modules
+    assert not HEAVY & {name.split(".")[0] for name in modules}
+
+
+def test_update_check_uses_the_cache(tmp_path: Path):
+    entry = {"version": "1.0.0", "checked": time.time(), "message": "new release"}
+    (tmp_path / "update.json").write_text(json.dumps(entry))
+    assert update.check("1.0.0", directory=tmp_path) == "new release"
+    assert update.read_cached("1.1.0", directory=tmp_path) is None
+    assert update.read_cached("1.0.0", ttl=-1, directory=tmp_path) is None
+
+
+class Recorder:
+    def __init__(self):
+        self.printed = []
+
+    def print(self, message):
+        self.printed.append(message)
+
+
+def test_update_check_once_per_process(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(update, "_thread", None)
+    entry = {"version": "1.0.0", "checked": time.time(), "message": "new release"}
+    (tmp_path / "update.json").write_text(json.dumps(entry))
+    console = Recorder()
+    thread = update.check_in_background(console, "1.0.0", directory=tmp_path)
+    assert update.check_in_background(console, "1.0.0", directory=tmp_path) is None
+    thread.join(timeout=5)
+    assert console.printed == ["new release"]
@@ -0,0 +1,67 @@
+import shutil
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from SimbioReader.cli import cli
+from SimbioReader.integrity import VerifiedCache, label_files, verify_tree
+from SimbioReader.sr import SimbioReader
+
+PRODUCT = Path("test/data/sim_cal_stc_cruise_ico11_2024-04-08_001")
+LABEL = "sim_cal_sc_stc_cruise_ico11_2024-04-08_001__0_1.lblx"
+
+
+@pytest.fixture
+def product(tmp_path: Path) -> Path:
+    return Path(shutil.copytree(PRODUCT, tmp_path / PRODUCT.name))
+
+
+def test_label_files():
+    entries = label_files(PRODUCT / LABEL)
+    assert len(entries) == 4
+    assert entries[1]["expected_size"] == 1376256
+    assert entries[1]["expected_md5"] == "6bd59cfd691b48e134dfecb2f74d6997"
+
+
+def test_verify_reader(product: Path):
+    reader = SimbioReader.open_header(product / LABEL)
+    result = reader.verify()
+    assert list(result["status"]) == ["ok"] * 4
+    assert not result["cached"].any()
+
+
+def test_verify_failures(product: Path):
+    files = sorted(product.glob("*.dat"))
+    with open(files[0], "r+b") as fl:
+        fl.write(b"\xff\xff")
+    with open(files[1], "ab") as fl:
+        fl.write(b"\x00")
+    files[2].unlink()
+    result = verify_tree(product, workers=2).set_index("file_name")
+    assert result.loc[str(files[0]), "status"] == "md5 mismatch"
+    assert result.loc[str(files[1]), "status"] == "size mismatch"
+    assert result.loc[str(files[2]), "status"] == "missing"
+
+
+def test_verify_cache(product: Path, tmp_path: Path):
+    cache = VerifiedCache(tmp_path / "cache")
+    first = verify_tree(product, cache=cache)
+    second = verify_tree(product, cache=cache)
+    assert second["cached"].all()
+    assert list(second["status"]) == list(first["status"])
+    data_file = sorted(product.glob("*.dat"))[0]
+    with open(data_file, "r+b") as fl:
+        fl.write(b"\xff\xff")
+    third = verify_tree(product, cache=cache).set_index("file_name")
+    assert third.loc[str(data_file), "status"] == "md5 mismatch"
+    assert not third.loc[str(data_file), "cached"]
+
+
+def test_cli_verify(product: Path, tmp_path: Path):
+    runner = CliRunner()
+    result = runner.invoke(cli, ["verify", str(product), "--cache-dir", str(tmp_path / "cache")])
+    assert result.exit_code == 0
+    result = runner.invoke(cli, ["verify", "test/data", "--no-cache"])
+    assert result.exit_code == 1
+    assert "label error" in result.output
@@ -0,0 +1,54 @@
+import xml.dom.minidom as md
+from pathlib import Path
+
+import pytest
+
+from SimbioReader.label import element_to_model, read_label
+from SimbioReader.sr import SimbioReader
+from SimbioReader.tools import getElement, getElements, getValue
+
+LABEL = Path("test/data/sim_cal_stc_cruise_ico11_2024-04-08_001/sim_cal_sc_stc_cruise_ico11_2024-04-08_001__0_1.lblx")
+
+
+def test_backends_build_the_same_model():
+    assert read_label(LABEL, backend="etree") == read_label(LABEL, backend="minidom")
+
+
+def test_model_matches_dom_values():
+    model = read_label(LABEL)
+    dom = md.parse(LABEL.as_posix())
+    for tag in ["psa:identifier", "logical_identifier", "version_id", "title",
+                "processing_level", "start_date_time", "psa:spacecraft_clock_start_count"]:
+        assert getValue(model, tag) == getValue(dom, tag)
+    for i in range(3):
+        assert getValue(getElement(model, "Axis_Array", i), "elements") == \
+            getValue(getElement(dom, "Axis_Array", i), "elements")
+
+
+def test_model_keeps_repeated_blocks():
+    model = read_label(LABEL)
+    assert len(model["File_Area_Observational"]) == 4
+    assert len(getElements(model, "img:Imaging")) == 3
+    imaging = getElement(model, "img:Imaging", 1)
+    assert imaging["img:Optical_Filter"]["img:filter_name"] == "PAN-H"
+    assert getElement(model, "img:Subframe")["img:first_line"] == "100"
+
+
+def test_element_to_model():
+    doc = md.parseString("<root><File><file_name>a.dat</file_name></File></root>")
+    assert element_to_model(doc) == {"File": {"file_name": "a.dat"}}
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError, match="Unknown label backend"):
+        read_label(LABEL, backend="sax")
+
+
+def test_reader_backends_agree():
+    fast = SimbioReader(LABEL, updateCheck=False, load_pixels=False)
+    dom = SimbioReader(LABEL, updateCheck=False, load_pixels=False, backend="minidom")
+    assert fast.lvid == dom.lvid
+    assert fast.startTime == dom.startTime
+    assert fast.data.filters == dom.data.filters
+    assert getattr(fast.data, "filter_pan-h").data_structure.md5 == \
+        getattr(dom.data, "filter_pan-h").data_structure.md5
@@ -1,5 +1,8 @@
 from SimbioReader.sr import SimbioReader
+import numpy as np
+import pandas as pd
 from pathlib import Path
+from rich.console import Console
 import pytest
 
 def test_simbio_reader_init_file_dat():
@@ -96,4 +99,126 @@ def test_simbio_reader_init_files():
     file_path = Path("test/data/sim_cal_stc_cruise_ico11_2024-04-08_001/sim_cal_sc_stc_cruise_ico11_2024-04-08_001__0_1.lblx")
     reader = SimbioReader(file_path=file_path)
     assert reader.data.items_number == 4 
-    
\ No newline at end of file
+    
+
+def test_simbio_reader_lazy_memmap():
+    file_path = Path("test/data/sim_cal_stc_cruise_ico11_2024-04-08_001/sim_cal_sc_stc_cruise_ico11_2024-04-08_001__0_1.lblx")
+    reader = SimbioReader(file_path=file_path, updateCheck=False, lazy=True)
+    eager = SimbioReader(file_path=file_path, updateCheck=False)
+    lazy_filter = getattr(reader.data, "filter_pan-h")
+    assert lazy_filter._img is None
+    assert isinstance(lazy_filter.img, np.memmap)
+    assert not lazy_filter.img.flags.writeable
+    assert np.array_equal(lazy_filter.img, getattr(eager.data, "filter_pan-h").img)
+
+
+def test_simbio_reader_open_header(monkeypatch):
+    file_path = Path("test/data/sim_cal_stc_cruise_ico11_2024-04-08_001/sim_cal_sc_stc_cruise_ico11_2024-04-08_001__0_1.lblx")
+
+    def no_read(*args, **kwargs):
+        raise AssertionError("pixel data read in header-only mode")
+
+    monkeypatch.setattr(np, "fromfile", no_read)
+    monkeypatch.setattr(np, "memmap", no_read)
+    reader = SimbioReader.open_header(file_path)
+    assert reader.data.filters == ["win-x", "pan-h", "pan-l"]
+    assert getattr(reader.data, "filter_pan-h").filter.name == "PAN-H"
+    assert reader.data.hk.acquisition_time_utc.strftime("%Y-%m-%d") == "2024-04-08"
+
+
+def test_simbio_reader_parallel_loading():
+    file_path = Path("test/data/sim_cal_stc_cruise_ico11_2024-04-08_001/sim_cal_sc_stc_cruise_ico11_2024-04-08_001__0_1.lblx")
+    serial = SimbioReader(file_path=file_path, updateCheck=False)
+    parallel = SimbioReader(file_path=file_path, updateCheck=False, workers=4)
+    assert parallel.data.filters == serial.data.filters
+    for item in serial.data.filters:
+        assert np.array_equal(getattr(parallel.data, f"filter_{item}").img, getattr(serial.data, f"filter_{item}").img)
+    assert getattr(parallel.data, "filter_pan-h").console is parallel.data.console
+
+
+def test_simbio_reader_read_window():
+    file_path = Path("test/data/sim_cal_stc_cruise_ico11_2024-04-08_001/sim_cal_sc_stc_cruise_ico11_2024-04-08_001__0_1.lblx")
+    reader = SimbioReader.open_header(file_path)
+    pan = getattr(reader.data, "filter_pan-h")
+    assert pan.data_structure.axis_names == ["line", "sample"]
+    full = np.fromfile(pan.file_name, dtype=pan.dtype).reshape(384, 896)
+    window = pan.read_window(lines=slice(100, 164), samples=slice(200, 264))
+    assert window.shape == (64, 64)
+    assert np.array_equal(window, full[100:164, 200:264])
+    assert np.array_equal(pan.read_window(lines=5), full[5])
+    with pytest.raises(ValueError):
+        pan.read_window(bands=slice(0, 2))
+
+
+def test_simbio_reader_data_iter_chunks():
+    file_path = Path("test/data/sim_cal_stc_cruise_ico11_2024-04-08_001/sim_cal_sc_stc_cruise_ico11_2024-04-08_001__0_1.lblx")
+    reader = SimbioReader.open_header(file_path)
+    chunks = list(reader.data.iter_chunks(lines_per_chunk=100))
+    assert [item for item, _, _ in chunks[:2]] == ["filter_win-x", "filter_pan-h"]
+    pan = [chunk for item, _, chunk in chunks if item == "filter_pan-h"]
+    assert [start for item, start, _ in chunks if item == "filter_pan-h"] == [0, 100, 200, 300]
+    assert np.array_equal(np.concatenate(pan), getattr(reader.data, "filter_pan-h").read_window())
+
+
+def test_simbio_object_img_physical():
+    file_path = Path("test/data/sim_cal_stc_cruise_ico11_2024-04-08_001/sim_cal_sc_stc_cruise_ico11_2024-04-08_001__0_1.lblx")
+    reader = SimbioReader(file_path=file_path, updateCheck=False)
+    pan = getattr(reader.data, "filter_pan-h")
+    assert pan.data_structure.scaling_factor == 0
+    assert pan.data_structure.value_offset == 0
+    assert np.array_equal(pan.img_physical(), pan.img)
+    pan.data_structure.scaling_factor = 2.0
+    pan.data_structure.value_offset = -1.0
+    expected = pan.img.astype(np.float64) * 2 - 1
+    physical = pan.img_physical(dtype=np.float64, chunk_size=1000)
+    assert np.array_equal(physical, expected)
+    out = np.empty(pan.shape, dtype=np.float32)
+    assert pan.img_physical(out=out) is out
+    assert np.allclose(out, expected)
+    header = getattr(SimbioReader.open_header(file_path).data, "filter_pan-h")
+    header.data_structure.scaling_factor = 2.0
+    assert np.array_equal(header.img_physical(), pan.img * np.float32(2))
+    with pytest.raises(ValueError):
+        pan.img_physical(out=np.empty((3, 3), dtype=np.float32))
+
+
+@pytest.mark.parametrize("engine", [None, "c"])
+def test_hk_from_csv(engine):
+    from SimbioReader.sr import HK
+    file_path = Path("test/data/sim_cal_stc_cruise_ico11_2024-04-08_001/sim_cal_sc_stc_cruise_ico11_2024-04-08_001__0_1.csv")
+    hk = HK.from_csv(file_path, engine=engine)
+    df = hk.df
+    assert isinstance(df.index, pd.DatetimeIndex)
+    assert str(df.index.tz) == "UTC"
+    assert df.index.name == "ACQUISITION_TIME_UTC"
+    assert df["ACQUISITION_TIME_SCET"].dtype == "category"
+    assert hk.acquisition_time_scet == "1/0777258316:00904"
+    assert df["COMMANDED_TEC_TREF"].dtype == np.int16
+    assert df["TEMPERATURE_PE"].dtype == np.float64
+    assert hk.temperature_pe == pytest.approx(284.38636)
+
+
+def test_hk_from_csv_pyarrow_matches_c():
+    pytest.importorskip("pyarrow")
+    from SimbioReader.label import read_label
+    from SimbioReader.sr import HK
+    from SimbioReader.tools import getElements
+    folder = Path("test/data/sim_cal_stc_cruise_ico11_2024-04-08_001")
+    fields = getElements(read_label(folder / "sim_cal_sc_stc_cruise_ico11_2024-04-08_001__0_1.lblx"), "Field_Character")
+    file_path = folder / "sim_cal_sc_stc_cruise_ico11_2024-04-08_001__0_1.csv"
+    # the PDS4 fields are padded with spaces after the commas
+    assert ",    1/0777258316:00904," in file_path.read_text()
+    arrow = HK.from_csv(file_path, fields=fields, engine="pyarrow").df
+    c = HK.from_csv(file_path, fields=fields, engine="c").df
+    pd.testing.assert_frame_equal(arrow, c)
+    assert arrow["ACQUISITION_TIME_SCET"].iloc[0] == "1/0777258316:00904"
+
+
+def test_hk_field_character_types():
+    file_path = Path("test/data/sim_cal_stc_cruise_ico11_2024-04-08_001/sim_cal_sc_stc_cruise_ico11_2024-04-08_001__0_1.lblx")
+    hk = SimbioReader.open_header(file_path).data.hk
+    assert hk.acquisition_time_utc == pd.Timestamp("2024-04-08T01:05:18.055393Z")
+    assert hk.df["LAST_EVENT"].dtype == np.int8
+    console = Console(record=True, width=200)
+    console.print(hk.show())
+    assert "2024-04-08 01:05:18.055393+00:00" in console.export_text()
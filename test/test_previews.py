@@ -0,0 +1,55 @@
+import hashlib
+import os
+import shutil
+import time
+from pathlib import Path
+from xml.dom.minidom import Document
+
+import pytest
+from click.testing import CliRunner
+from PIL import Image
+
+from SimbioReader.cli import cli
+from SimbioReader.previews import build_previews
+from SimbioReader.sr import SimbioReader
+from SimbioReader.tools import getValue, save_image
+
+PRODUCT = Path("test/data/sim_cal_stc_cruise_ico11_2024-04-08_001")
+
+
+@pytest.mark.parametrize("suffix", [".png", ".jpg", ".tif"])
+def test_save_image_checksum(tmp_path: Path, suffix: str):
+    image = Image.new("L", (64, 32), color=128)
+    file_name = tmp_path / f"image{suffix}"
+    size, md5 = save_image(image, file_name, quality=90)
+    assert size == file_name.stat().st_size
+    assert md5 == hashlib.md5(file_name.read_bytes()).hexdigest()
+
+
+def test_save_preview_file_area(tmp_path: Path):
+    reader = SimbioReader.open_header(PRODUCT)
+    fab = getattr(reader.data, "filter_pan-h").savePreview(outFolder=tmp_path, tree=Document())
+    image_file = tmp_path / getValue(fab, "file_name")
+    assert int(getValue(fab, "file_size")) == image_file.stat().st_size
+    assert getValue(fab, "md5_checksum") == hashlib.md5(image_file.read_bytes()).hexdigest()
+
+
+def test_build_previews_skip_if_fresh(tmp_path: Path):
+    root = tmp_path / "archive"
+    product = Path(shutil.copytree(PRODUCT, root / PRODUCT.name))
+    out = tmp_path / "previews"
+    assert [status for _, status, _ in build_previews(root, out)] == ["written"]
+    assert len(list(out.glob("*.png"))) == 3
+    assert [status for _, status, _ in build_previews(root, out, workers=2)] == ["skipped"]
+    data_file = next(product.glob("*panh*.dat"))
+    future = time.time_ns() + 10_000_000_000
+    os.utime(data_file, ns=(future, future))
+    assert [status for _, status, _ in build_previews(root, out)] == ["written"]
+    assert [status for _, status, _ in build_previews(root, out, force=True)] == ["written"]
+
+
+def test_cli_previews(tmp_path: Path):
+    result = CliRunner().invoke(cli, ["previews", "test/data", "-o", str(tmp_path), "-w", "2"])
+    assert result.exit_code == 0
+    assert "1 product(s) written" in result.output
+    assert "Unknown channel" in result.output
@@ -0,0 +1,95 @@
+import io
+import sqlite3
+from pathlib import Path
+
+import numpy as np
+from click.testing import CliRunner
+from PIL import Image
+
+from SimbioReader.cli import cli
+from SimbioReader.pyramid import build_pyramids, downsample, pyramid_levels, quantize, write_pyramid
+from SimbioReader.sr import SimbioReader
+
+PRODUCT = Path("test/data/sim_cal_stc_cruise_ico11_2024-04-08_001")
+
+
+def test_downsample_block_mean():
+    img = np.array([[0, 2, 10], [4, 6, 20], [8, 8, 30]], dtype=np.uint8)
+    assert downsample(img).tolist() == [[3, 15], [8, 30]]
+
+
+def test_pyramid_levels_each_from_previous():
+    img = np.arange(300 * 520, dtype=np.uint32).reshape(300, 520).astype(np.uint8)
+    levels = pyramid_levels(img, tile=128)
+    assert [level.shape for level in levels] == [(300, 520), (150, 260), (75, 130), (38, 65)]
+    for previous, level in zip(levels, levels[1:]):
+        np.testing.assert_array_equal(level, downsample(previous))
+
+
+def test_pyramid_levels_round_once():
+    img = np.random.default_rng(3).integers(0, 256, (64, 64), dtype=np.uint8)
+    levels = pyramid_levels(img, levels=4, tile=8)
+    assert all(level.dtype == np.float32 for level in levels[1:])
+    expected = img.reshape(8, 8, 8, 8).mean(axis=(1, 3))
+    np.testing.assert_array_equal(quantize(levels[3]), np.rint(expected).astype(np.uint8))
+
+
+def test_write_pyramid_directory(tmp_path: Path):
+    img = np.random.default_rng(1).integers(0, 256, (300, 520), dtype=np.uint8)
+    shapes = write_pyramid(img, tmp_path / "tiles", tile=256)
+    assert shapes == [(300, 520), (150, 260), (75, 130)]
+    assert sorted(p.relative_to(tmp_path / "tiles").as_posix() for p in (tmp_path / "tiles").rglob("*.png")) == [
+        "0/0/0.png",
+        "1/0/0.png",
+        "1/1/0.png",
+        "2/0/0.png",
+        "2/0/1.png",
+        "2/1/0.png",
+        "2/1/1.png",
+        "2/2/0.png",
+        "2/2/1.png",
+    ]
+    tile = np.asarray(Image.open(tmp_path / "tiles" / "2" / "2" / "1.png"))
+    assert tile.shape == (256, 256)
+    np.testing.assert_array_equal(tile[:44, :8], img[256:, 512:])
+    assert not tile[44:].any() and not tile[:, 8:].any()
+
+
+def test_write_pyramid_mbtiles(tmp_path: Path):
+    img = np.random.default_rng(2).integers(0, 256, (300, 520), dtype=np.uint8)
+    write_pyramid(img, tmp_path / "image.mbtiles", tile=256, name="image")
+    with sqlite3.connect(tmp_path / "image.mbtiles") as db:
+        metadata = dict(db.execute("SELECT name, value FROM metadata"))
+        tiles = db.execute("SELECT zoom_level, tile_column, tile_row FROM tiles ORDER BY 1, 2, 3").fetchall()
+        (data,) = db.execute(
+            "SELECT tile_data FROM tiles WHERE zoom_level=2 AND tile_column=0 AND tile_row=1"
+        ).fetchone()
+    assert metadata["maxzoom"] == "2" and metadata["format"] == "png" and metadata["name"] == "image"
+    assert len(tiles) == 9
+    # rows are counted from the bottom: the first row of tiles has the highest tile_row
+    tile = np.asarray(Image.open(io.BytesIO(data)))
+    np.testing.assert_array_equal(tile, img[:256, :256])
+
+
+def test_build_pyramid_object(tmp_path: Path):
+    reader = SimbioReader.open_header(PRODUCT)
+    obj = getattr(reader.data, "filter_pan-h")
+    shapes = obj.build_pyramid(tmp_path / "pan-h", tile=128)
+    assert shapes[0] == obj.read_window().shape
+    assert max(shapes[-1]) <= 128
+    assert (tmp_path / "pan-h" / "0" / "0" / "0.png").exists()
+
+
+def test_build_pyramids_bulk(tmp_path: Path):
+    result = build_pyramids("test/data", tmp_path, mbtiles=True)
+    errors = dict(result)
+    assert errors[str(next(PRODUCT.glob("*.lblx")))] is None
+    assert len(list(tmp_path.glob("*.mbtiles"))) == 3
+    assert any(error for error in errors.values())
+
+
+def test_cli_pyramids(tmp_path: Path):
+    result = CliRunner().invoke(cli, ["pyramids", str(PRODUCT), "-o", str(tmp_path)])
+    assert result.exit_code == 0, result.output
+    assert "1 product(s) written" in result.output
+    assert len([p for p in tmp_path.iterdir() if p.is_dir()]) == 3
@@ -0,0 +1,39 @@
+import pytest
+
+from SimbioReader.search import TokenIndex
+from SimbioReader.simbioInfo import TEST_INDEX, Test, compare_str
+from SimbioReader.tests import tests
+
+QUERIES = ["hric", "Hric performance", "STC  func", "ico", "main me", "t", "vihi cal", "nothing here", ""]
+
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_search_matches_compare_str(query: str):
+    expected = [key for key, item in tests.items() if compare_str(query, item["name"])]
+    assert TEST_INDEX.search(query) == expected
+
+
+def test_search_group():
+    expected = [
+        key for key, item in tests.items()
+        if item["subphase"] == "ico9" and compare_str("hric", item["name"])
+    ]
+    assert TEST_INDEX.search("HRIC", group="ICO9") == expected
+    assert TEST_INDEX.search("hric", group="unknown") == []
+
+
+def test_rank():
+    table = {
+        "a": {"name": "Functional Test with a long name"},
+        "b": {"name": "Dysfunctional Test"},
+        "c": {"name": "Functional Test"},
+    }
+    index = TokenIndex(table)
+    assert index.search("functional") == ["a", "b", "c"]
+    assert index.search("functional", rank=True) == ["c", "a", "b"]
+
+
+def test_test_by_name():
+    assert Test("Hric performance", subphase="ico9").name == tests["hric_perf_ico9"]["name"]
+    with pytest.raises(ValueError):
+        Test("no such test", subphase="ico9")
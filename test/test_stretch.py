@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from SimbioReader.stretch import METHODS, PreviewRenderer, stretch
+
+
+@pytest.mark.parametrize("dtype", ["<u2", ">u2", "<i2", "u1", "<f4", ">f8", "<i4"])
+@pytest.mark.parametrize("method", METHODS)
+def test_stretch_range(dtype, method):
+    rng = np.random.default_rng(0)
+    img = rng.normal(1000, 200, (120, 80)).astype(dtype)
+    out = stretch(img, method)
+    assert out.dtype == np.uint8
+    assert out.shape == img.shape
+    assert out.min() == 0 and out.max() == 255
+    # the stretch is monotonic
+    order = np.argsort(img, axis=None, kind="stable")
+    assert np.all(np.diff(out.reshape(-1)[order].astype(int)) >= 0)
+
+
+def test_stretch_percentile_limits():
+    img = np.arange(10000, dtype=np.uint16).reshape(100, 100)
+    out = stretch(img, "percentile", low=10, high=90)
+    assert (out[img <= 1000] == 0).all()
+    assert (out[img >= 9000] == 255).all()
+    assert 100 < out[50, 0] < 155
+
+
+def test_stretch_signed_and_nan():
+    img = np.array([[-300, -1], [0, 300]], dtype=np.int16)
+    assert stretch(img, "linear").tolist() == [[0, 127], [128, 255]]
+    img = np.array([[np.nan, 0.0], [1.0, 2.0]], dtype=np.float32)
+    assert stretch(img, "linear").tolist() == [[0, 0], [128, 255]]
+
+
+def test_renderer_reuses_buffer():
+    renderer = PreviewRenderer("linear", chunk_size=7)
+    first = renderer(np.arange(100, dtype=np.float32).reshape(10, 10))
+    second = renderer(np.ones((10, 10), dtype=np.uint16))
+    assert first is second
+    with pytest.raises(ValueError):
+        PreviewRenderer("gamma")
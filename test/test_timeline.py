@@ -0,0 +1,108 @@
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+import pytest
+from click.testing import CliRunner
+
+from SimbioReader.infocli import cli as info_cli
+from SimbioReader.simbioInfo import Test, get_subphase, get_test_by_subphase, tag_times
+from SimbioReader.sr import SimbioReader
+from SimbioReader.tests import tests
+from SimbioReader.timeline import PHASES, SUBPHASES, TESTS, Timeline, to_datetime
+
+PRODUCT = "test/data/sim_cal_stc_cruise_ico11_2024-04-08_001"
+
+
+def scan(table: dict, dt: datetime) -> list[str]:
+    return [
+        name for name, item in table.items()
+        if to_datetime(item["start"]) <= dt <= to_datetime(item["end"])
+    ]
+
+
+@pytest.mark.parametrize("offset", [-1, 0, 30, 3600])
+def test_at_matches_linear_scan(offset: int):
+    for item in tests.values():
+        dt = to_datetime(item["start"]) + timedelta(seconds=offset)
+        assert TESTS.at(dt) == scan(tests, dt)
+
+
+def test_find_and_bounds():
+    assert PHASES.find("2018-12-11 00:00:00") == "necp"
+    assert PHASES.find(datetime(1990, 1, 1)) is None
+    start, end = SUBPHASES.bounds("ico1")
+    assert SUBPHASES.find(end) == "ico1"
+    assert SUBPHASES.find(end + timedelta(microseconds=1)) != "ico1"
+
+
+def test_aware_datetime_is_utc():
+    dt = datetime(2019, 6, 7, 12, 0, tzinfo=timezone(timedelta(hours=2)))
+    assert SUBPHASES.find(dt) == SUBPHASES.find(datetime(2019, 6, 7, 10, 0))
+
+
+def test_between():
+    table = {
+        "long": {"start": "2020-01-01T00:00:00", "end": "2020-01-10T00:00:00"},
+        "short": {"start": "2020-01-02T00:00:00", "end": "2020-01-02T01:00:00"},
+        "late": {"start": "2020-01-05T00:00:00", "end": "2020-01-06T00:00:00"},
+    }
+    timeline = Timeline(table)
+    assert timeline.between("2020-01-03", "2020-01-05") == ["long", "late"]
+    assert timeline.between("2020-01-02T00:30", "2020-01-02T00:40") == ["long", "short"]
+    assert timeline.between("2021-01-01", "2021-01-02") == []
+
+
+def test_hierarchy():
+    assert SUBPHASES.parent["ico1"] == "cruise"
+    assert set(TESTS.children["ico9"]) == {
+        name for name, item in tests.items() if item["subphase"] == "ico9"
+    }
+    assert get_test_by_subphase("ICO9") == TESTS.children["ico9"]
+
+
+def test_lookups_by_date():
+    assert get_subphase(dt="2019-06-07 10:30:00").name == "ico1"
+    name = next(iter(tests))
+    assert Test(dt=to_datetime(tests[name]["start"])).name == tests[name]["name"]
+
+
+def test_reader_annotations():
+    reader = SimbioReader.open_header(PRODUCT)
+    assert reader.subphase == "ico11"
+    assert reader.tests == TESTS.between(reader.startTime, reader.stopTime)
+    assert all(tests[name]["subphase"] == "ico11" for name in reader.tests)
+
+
+def test_tag_times_matches_find():
+    starts = [to_datetime(item["start"]) for item in tests.values()]
+    times = pd.Series(pd.to_datetime(starts + [datetime(1990, 1, 1), None]), index=range(10, 12 + len(starts)))
+    tagged = tag_times(times)
+    assert list(tagged.index) == list(times.index)
+    expected = [TESTS.find(dt) for dt in starts] + [None, None]
+    assert [None if pd.isna(item) else item for item in tagged["test"]] == expected
+    assert tagged["subphase"].iloc[0] == SUBPHASES.find(starts[0])
+    assert tagged["phase"].iloc[0] == PHASES.find(starts[0])
+
+
+def test_tag_times_aware_array():
+    naive = tag_times(np.array(["2019-06-07T10:00"], dtype="datetime64[ns]"))
+    aware = tag_times(pd.to_datetime(["2019-06-07T12:00+02:00"]))
+    assert naive.equals(aware)
+    assert naive["subphase"].iloc[0] == "ico1"
+
+
+def test_cli_tag(tmp_path):
+    runner = CliRunner()
+    result = runner.invoke(info_cli, ["tag"], input="2019-06-07T10:00:00Z\nnot a date\n")
+    assert result.exit_code == 0, result.output
+    lines = result.output.splitlines()
+    assert lines[0] == "time,phase,subphase,test"
+    assert lines[1].startswith("2019-06-07T10:00:00Z,cruise,ico1,")
+    assert lines[2] == "not a date,,,"
+    csv = tmp_path / "times.csv"
+    csv.write_text("id,start\n1,2019-06-07T10:00:00\n2,2018-12-11T00:00:00\n")
+    result = runner.invoke(info_cli, ["tag", str(csv), "--column", "start", "--chunk-size", "1"])
+    assert result.exit_code == 0, result.output
+    assert result.output.splitlines()[2] == "2018-12-11T00:00:00,necp,necp,"
+    assert runner.invoke(info_cli, ["tag", str(csv)]).exit_code != 0
@@ -6,6 +6,8 @@ import pytest
 from SimbioReader.tools import (
     gen_filename,
     getElement,
+    getElements,
+    LabelIndex,
     getFromXml,
     getValue,
     lvidUpdate,
@@ -160,3 +162,43 @@ def test_lvid_update_updates_lidvid_reference_and_returns_value():
         == "urn:esa:psa:bc_mpo_sim:data_calibrated:sim_cal_sc_hric_cruise_cruise_2021-04-24_001_cust0_internal::0.2"
     )
     assert getFromXml(root, "lidvid_reference") == new_lvid_value
+
+
+def test_get_elements_dom_and_model():
+    xml_string = "<root><item>a</item><item>b</item></root>"
+    doc = md.parseString(xml_string)
+    assert [e.firstChild.nodeValue for e in getElements(doc, "item")] == ["a", "b"]
+    model = {"Axis_Array": [{"elements": "1"}, {"elements": "2"}]}
+    assert getElements(model, "elements") == ["1", "2"]
+    assert getElements(model, "missing") == []
+
+
+def test_label_index_dom_lookups():
+    xml_string = (
+        '<root xmlns:img="http://pds.nasa.gov/pds4/img/v1">'
+        "<a><img:v>1</img:v></a><a><img:v>2</img:v><w>x</w></a></root>"
+    )
+    doc = md.parseString(xml_string)
+    index = LabelIndex(doc)
+    assert getValue(index, "img:v") == "1"
+    second = getElement(index, "a", 1)
+    assert isinstance(second, LabelIndex)
+    assert getValue(second, "img:v") == "2"
+    with pytest.raises(IndexError, match="Tag 'w' not found"):
+        getValue(getElement(index, "a"), "w")
+
+
+def test_label_index_model_lookups():
+    model = {
+        "title": "T",
+        "File_Area_Observational": [
+            {"File": {"file_name": "a.dat"}, "Axis_Array": [{"elements": "3"}, {"elements": "4"}]},
+            {"File": {"file_name": "b.dat"}},
+        ],
+    }
+    index = LabelIndex(model)
+    areas = getElements(index, "File_Area_Observational")
+    assert [getValue(area, "file_name") for area in areas] == ["a.dat", "b.dat"]
+    assert getValue(getElement(areas[0], "Axis_Array", 1), "elements") == "4"
+    assert getElements(areas[1], "Axis_Array") == []
+    assert getValue(index, "title") == "T"
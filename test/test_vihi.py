@@ -0,0 +1,110 @@
+import numpy as np
+import pytest
+
+
+@pytest.mark.parametrize(
+    "axis_names, interleave",
+    [
+        (("band", "line", "sample"), "BSQ"),
+        (("line", "band", "sample"), "BIL"),
+        (("line", "sample", "band"), "BIP"),
+    ],
+)
+def test_vihi_interleave(vihi_object, axis_names, interleave):
+    obj, _ = vihi_object(axis_names)
+    assert obj.data_structure.interleave == interleave
+
+
+@pytest.mark.parametrize(
+    "axis_names",
+    [("band", "line", "sample"), ("line", "band", "sample"), ("line", "sample", "band")],
+)
+def test_vihi_get_bands(vihi_object, axis_names):
+    obj, cube = vihi_object(axis_names)
+    assert np.array_equal(obj.get_bands([0, 2, 4]), cube[:, :, [0, 2, 4]])
+    assert np.array_equal(obj.get_bands(slice(1, 3)), cube[:, :, 1:3])
+    assert np.array_equal(obj.get_bands(3), cube[:, :, 3])
+    assert np.array_equal(obj.get_spectrum(2, 5), cube[2, 5])
+
+
+def test_vihi_read_window(vihi_object):
+    obj, cube = vihi_object(("band", "line", "sample"))
+    window = obj.read_window(lines=slice(1, 3), samples=slice(0, 2), bands=slice(0, 4))
+    assert np.array_equal(window, cube[1:3, 0:2, 0:4].transpose(2, 0, 1))
+
+
+@pytest.mark.parametrize("prefetch", [True, False])
+def test_vihi_iter_chunks(vihi_object, prefetch):
+    obj, cube = vihi_object(("line", "band", "sample"), lines=7)
+    chunks = list(obj.iter_chunks(lines_per_chunk=3, prefetch=prefetch))
+    assert [start for start, _ in chunks] == [0, 3, 6]
+    assert [chunk.shape[0] for _, chunk in chunks] == [3, 3, 1]
+    assert np.array_equal(np.concatenate([chunk for _, chunk in chunks]), cube)
+    with pytest.raises(ValueError):
+        next(obj.iter_chunks(lines_per_chunk=0))
+
+
+def test_vihi_assemble_cube(vihi_data):
+    data, cubes = vihi_data(first_lines=[1, 6, 9], lines=[5, 3, 4])
+    cube = data.assemble_cube(lines_per_chunk=2)
+    assert cube.shape == (12, 3, 4)
+    assert np.array_equal(cube, np.concatenate(cubes))
+
+
+def test_vihi_assemble_cube_gap_and_out(vihi_data, tmp_path):
+    data, cubes = vihi_data(first_lines=[11, 20], lines=[4, 2], axis_names=("band", "line", "sample"))
+    cube = data.assemble_cube(memmap_path=tmp_path / "cube.npy")
+    assert isinstance(cube, np.memmap)
+    assert np.array_equal(cube[:4], cubes[0])
+    assert not cube[4:9].any()
+    assert np.array_equal(np.load(tmp_path / "cube.npy")[9:], cubes[1])
+    for _, start, chunk in data.iter_chunks(lines_per_chunk=3):
+        assert np.array_equal(cube[start : start + chunk.shape[0]], chunk)
+    out = np.empty((11, 3, 4), dtype=np.float32)
+    assert data.assemble_cube(out=out) is out
+    with pytest.raises(ValueError):
+        data.assemble_cube(out=np.empty((2, 3, 4)))
+
+
+def test_vihi_no_segments(vihi_data):
+    data, _ = vihi_data(first_lines=[], lines=[])
+    with pytest.raises(ValueError, match="has no image segments"):
+        data.assemble_cube()
+    with pytest.raises(ValueError, match="has no image segments"):
+        next(data.iter_chunks())
+
+
+@pytest.mark.parametrize(
+    "data_type, dtype",
+    [
+        ("UnsignedLSB2", "<u2"),
+        ("UnsignedMSB2", ">u2"),
+        ("SignedMSB4", ">i4"),
+        ("IEEE754MSBSingle", ">f4"),
+        ("IEEE754LSBDouble", "<f8"),
+    ],
+)
+def test_vihi_data_types(vihi_object, data_type, dtype):
+    obj, cube = vihi_object(data_type=data_type)
+    assert obj.dtype == np.dtype(dtype)
+    assert obj.get_bands([1, 3]).dtype == np.dtype(dtype)
+    assert np.array_equal(obj.get_bands([1, 3]), cube[:, :, [1, 3]])
+    assert np.array_equal(obj.get_spectrum(1, 2), cube[1, 2])
+
+
+def test_vihi_unsigned_full_range(vihi_object):
+    obj, _ = vihi_object(data_type="UnsignedLSB2", lines=30, samples=40, bands=50)
+    assert obj.get_bands(slice(None)).max() == 30 * 40 * 50 - 1 > 32767
+
+
+def test_vihi_native_byteorder(vihi_object):
+    obj, cube = vihi_object(data_type="IEEE754MSBSingle", native_byteorder=True, load_pixels=True)
+    assert obj.img.dtype.isnative
+    raw, _ = vihi_object(data_type="IEEE754MSBSingle", load_pixels=True)
+    assert raw.img.dtype == np.dtype(">f4")
+    assert np.array_equal(obj.img, raw.img)
+
+
+def test_vihi_unknown_data_type(vihi_object):
+    with pytest.raises(ValueError):
+        vihi_object(data_type="UnknownType")